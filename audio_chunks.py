@@ -0,0 +1,56 @@
+# audio_chunks.py
+"""긴 오디오 구간을 겹치는 조각으로 나누고, 조각별 전사 결과를 하나로 이어붙이는 도구"""
+import re
+from difflib import SequenceMatcher
+
+# 이어붙일 때 겹침으로 인정할 최소 연속 단어 수
+MIN_OVERLAP_WORDS = 3
+
+
+def chunk_ranges(clip_range, chunk_seconds, overlap_seconds=0):
+    """(start, end) 구간을 chunk_seconds 길이, overlap_seconds 만큼 겹치는 조각 목록으로 분할
+
+    >>> chunk_ranges((0, 300), 120, 5)
+    [(0, 120), (115, 235), (230, 300)]
+    """
+    start, end = clip_range
+    if chunk_seconds <= overlap_seconds:
+        raise ValueError("chunk_seconds는 overlap_seconds보다 커야 합니다")
+    ranges = []
+    s = start
+    while True:
+        e = min(s + chunk_seconds, end)
+        ranges.append((s, e))
+        if e >= end:
+            return ranges
+        s = e - overlap_seconds
+
+
+def _norm(word):
+    return re.sub(r"[^\w]", "", word).lower()
+
+
+def stitch_transcripts(parts, window_words=40):
+    """조각 전사문을 순서대로 이어붙이되, 앞 조각 끝과 뒷 조각 시작의 중복 구간은 한 번만 남김.
+
+    겹침 구간은 조각마다 Whisper 결과가 조금씩 다를 수 있어, 앞 조각의 마지막
+    window_words 단어와 뒷 조각의 처음 window_words 단어에서 가장 긴 공통 연속 구간을
+    찾아 그 지점에서 잇는다. 충분히 긴 공통 구간이 없으면 그냥 이어붙인다.
+    """
+    parts = [p for p in parts if p and p.strip()]
+    if not parts:
+        return ""
+
+    words = parts[0].split()
+    for part in parts[1:]:
+        nxt = part.split()
+        tail = words[-window_words:]
+        head = nxt[:window_words]
+        match = SequenceMatcher(
+            None, [_norm(w) for w in tail], [_norm(w) for w in head], autojunk=False
+        ).find_longest_match(0, len(tail), 0, len(head))
+        if match.size >= MIN_OVERLAP_WORDS:
+            words = words[:len(words) - len(tail) + match.a + match.size]
+            nxt = nxt[match.b + match.size:]
+        words.extend(nxt)
+    return " ".join(words)
@@ -0,0 +1,179 @@
+# audio_downloader.py
+"""yt_dlp Python API 기반 구간 오디오 다운로더.
+
+yt-dlp CLI를 영상(조각)마다 실행하면 매번 인터프리터 시작과 extractor 초기화 비용을 낸다.
+여기서는 스레드마다 YoutubeDL 인스턴스 하나를 만들어 재사용하고, 영상의 오디오 스트림 URL은
+한 번만 추출해(조각이 여러 개여도) ffmpeg가 필요한 구간만 HTTP range로 읽어 mp3로 변환한다.
+
+AudioPrefetcher는 다음 주제들의 오디오를 정해진 개수(depth)만큼 미리 받아 두어,
+현재 주제의 STT/요약과 다음 주제의 다운로드가 겹치도록 한다.
+"""
+import os
+import shutil
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+STREAM_URL_TTL = int(os.getenv("STREAM_URL_TTL", "1800"))  # 추출한 스트림 URL 재사용 시간(초)
+PREFETCH_DEPTH = int(os.getenv("PREFETCH_DEPTH", "2"))      # 미리 받아 둘 최대 구간 수
+
+
+def available():
+    """yt_dlp 패키지와 ffmpeg가 모두 있어야 사용 가능"""
+    if not shutil.which("ffmpeg"):
+        return False
+    try:
+        import yt_dlp  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class AudioDownloader:
+    def __init__(self, cookiefile=None):
+        self.cookiefile = cookiefile
+        self._local = threading.local()
+        self._streams = {}   # video_url → (stream_url, headers, resolved_at)
+        self._lock = threading.Lock()
+
+    def _ydl(self):
+        """스레드별 YoutubeDL (extractor 초기화/쿠키 로드를 한 번만)"""
+        ydl = getattr(self._local, "ydl", None)
+        if ydl is None:
+            import yt_dlp
+            params = {"format": "bestaudio/best", "quiet": True, "no_warnings": True, "noprogress": True}
+            if self.cookiefile:
+                params["cookiefile"] = self.cookiefile
+            ydl = self._local.ydl = yt_dlp.YoutubeDL(params)
+        return ydl
+
+    def stream_info(self, video_url):
+        """(오디오 스트림 URL, 요청 헤더). 같은 영상은 STREAM_URL_TTL 동안 재사용"""
+        with self._lock:
+            cached = self._streams.get(video_url)
+        if cached and time.monotonic() - cached[2] < STREAM_URL_TTL:
+            return cached[0], cached[1]
+        info = self._ydl().extract_info(video_url, download=False)
+        fmt = info if info.get("url") else (info.get("requested_formats") or [{}])[0]
+        if not fmt.get("url"):
+            raise RuntimeError(f"오디오 스트림 URL을 찾지 못했습니다: {video_url}")
+        headers = fmt.get("http_headers") or info.get("http_headers") or {}
+        with self._lock:
+            self._streams[video_url] = (fmt["url"], headers, time.monotonic())
+        return fmt["url"], headers
+
+    def fetch(self, video_url, clip_range):
+        """clip_range 구간을 mp3 bytes로 반환 (ffmpeg가 필요한 구간만 읽음)"""
+        start, end = clip_range
+        stream_url, headers = self.stream_info(video_url)
+        command = ["ffmpeg", "-loglevel", "error"]
+        if headers:
+            command += ["-headers", "".join(f"{k}: {v}\r\n" for k, v in headers.items())]
+        command += [
+            "-ss", str(start), "-t", str(end - start),
+            "-i", stream_url,
+            "-vn", "-ac", "1", "-b:a", "64k", "-f", "mp3", "pipe:1",
+        ]
+        proc = subprocess.run(command, capture_output=True)
+        if proc.returncode != 0 or not proc.stdout:
+            # 만료된 스트림 URL일 수 있으므로 다음 시도에서는 다시 추출
+            with self._lock:
+                self._streams.pop(video_url, None)
+            raise subprocess.CalledProcessError(proc.returncode or 1, command[:1], stderr=proc.stderr)
+        return proc.stdout
+
+
+_downloader = None
+
+
+def get_downloader():
+    global _downloader
+    if _downloader is None:
+        # ✅ 로컬에서만 cookies.txt 사용 (youtube_search._cookies_args와 같은 규칙)
+        cookiefile = "cookies.txt" if not os.getenv("GITHUB_ACTIONS") and os.path.exists("cookies.txt") else None
+        _downloader = AudioDownloader(cookiefile=cookiefile)
+    return _downloader
+
+
+class AudioPrefetcher:
+    """계획한 (video_id, clip_range) 순서대로 최대 depth개까지 미리 받아 두는 큐.
+
+    take()로 가져가야 자리가 비어 다음 항목을 받는다. 처리하다 실패해 가져가지 않을 항목은
+    discard()로 버려야 한다. 아직 받기 시작하지 않은 항목을 take()하면 None을 반환하고
+    그 항목은 미리 받지 않는다 (호출 측이 직접 받음).
+    """
+
+    def __init__(self, fetch, depth=PREFETCH_DEPTH):
+        self.fetch = fetch              # fetch(video, clip_range) → bytes
+        self.depth = max(1, depth)
+        self._slots = threading.BoundedSemaphore(self.depth)
+        self._executor = ThreadPoolExecutor(max_workers=self.depth, thread_name_prefix="prefetch")
+        self._futures = {}
+        self._claimed = set()
+        self._dropped = set()           # discard()한 video_id
+        self._lock = threading.Lock()
+        self._closed = threading.Event()
+        self._feeder = None
+        self.hits = 0
+
+    @staticmethod
+    def _key(video, clip_range):
+        return video["video_id"], tuple(clip_range)
+
+    def start(self, items):
+        """items: [(video, clip_range), ...] 처리할 순서대로"""
+        self._feeder = threading.Thread(target=self._feed, args=(list(items),), daemon=True)
+        self._feeder.start()
+        return self
+
+    def _feed(self, items):
+        for video, clip_range in items:
+            self._slots.acquire()
+            if self._closed.is_set():
+                self._slots.release()
+                return
+            key = self._key(video, clip_range)
+            with self._lock:
+                if key in self._claimed or key in self._futures or key[0] in self._dropped:
+                    self._slots.release()
+                    continue
+                self._futures[key] = self._executor.submit(self.fetch, video, clip_range)
+
+    def take(self, video, clip_range):
+        """미리 받은(또는 받는 중인) 오디오. 없거나 실패했으면 None"""
+        key = self._key(video, clip_range)
+        with self._lock:
+            future = self._futures.pop(key, None)
+            if future is None:
+                self._claimed.add(key)
+                return None
+        try:
+            audio = future.result()
+            self.hits += 1
+            return audio
+        except Exception as e:
+            print(f"⚠️ 미리 받기 실패, 다시 다운로드합니다: {e}")
+            return None
+        finally:
+            self._slots.release()
+
+    def discard(self, video):
+        """video의 남은 항목을 버리고 자리 반환 (실패/건너뛴 주제)"""
+        with self._lock:
+            keys = [k for k in self._futures if k[0] == video["video_id"]]
+            futures = [self._futures.pop(k) for k in keys]
+            self._dropped.add(video["video_id"])
+        for future in futures:
+            future.cancel()
+            self._slots.release()
+
+    def close(self):
+        self._closed.set()
+        with self._lock:
+            futures = list(self._futures.values())
+            self._futures.clear()
+        for future in futures:
+            future.cancel()
+            self._slots.release()
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,163 @@
+# batch_summarizer.py
+"""여러 chat completion 요청을 한 번에 제출하는 배치 인터페이스.
+
+요청은 {custom_id: chat.completions.create 인자} 형태로 넘기고, 결과는
+{custom_id: BatchResult} 로 돌려받는다. 항목별로 성공/실패가 따로 기록되므로
+일부가 실패해도 나머지 결과는 그대로 쓸 수 있다.
+
+백엔드
+- OpenAIBatchBackend: OpenAI Batch API (JSONL 업로드 → 배치 생성 → 완료까지 폴링). 단가가 절반
+- ChatBackend: 일반 chat.completions를 스레드 풀로 동시 호출 (배치가 늦거나 실패한 항목의 대체 경로)
+- LocalBackend: 네트워크 없이 동작하는 테스트용 대역
+"""
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Optional
+
+import metrics
+import rate_limit
+
+BATCH_POLL_INTERVAL = float(os.getenv("BATCH_POLL_INTERVAL", "10"))
+BATCH_TIMEOUT = float(os.getenv("BATCH_TIMEOUT", "900"))
+# 취소 요청 후 cancelled가 될 때까지 기다리는 시간. 취소 전에 끝난 항목은 output 파일로 받을 수 있음
+BATCH_CANCEL_TIMEOUT = float(os.getenv("BATCH_CANCEL_TIMEOUT", "600"))
+BATCH_ENDPOINT = "/v1/chat/completions"
+
+
+@dataclass
+class BatchResult:
+    text: Optional[str] = None
+    error: Optional[str] = None
+
+    @property
+    def ok(self):
+        return self.error is None and self.text is not None
+
+
+class LocalBackend:
+    """테스트용 대역. fn(request) → 문자열, 예외를 던지면 해당 항목만 실패 처리"""
+
+    def __init__(self, fn=None):
+        self.fn = fn or (lambda req: req["messages"][-1]["content"].strip()[:400])
+        self.submitted = []
+
+    def run(self, requests):
+        self.submitted.append(dict(requests))
+        results = {}
+        for custom_id, req in requests.items():
+            try:
+                results[custom_id] = BatchResult(text=self.fn(req))
+            except Exception as e:
+                results[custom_id] = BatchResult(error=str(e))
+        return results
+
+
+class ChatBackend:
+    """chat.completions를 항목별로 동시 호출"""
+
+    def __init__(self, client, max_workers=4):
+        self.client = client
+        self.max_workers = max_workers
+
+    def _one(self, req):
+        try:
+            with rate_limit.slot("openai"):
+                response = self.client.chat.completions.create(**req)
+            metrics.record_usage(getattr(response, "usage", None))
+            return BatchResult(text=response.choices[0].message.content.strip())
+        except Exception as e:
+            return BatchResult(error=str(e))
+
+    def run(self, requests):
+        ids = list(requests)
+        with ThreadPoolExecutor(max_workers=max(1, self.max_workers)) as executor:
+            outputs = list(executor.map(lambda i: self._one(requests[i]), ids))
+        return dict(zip(ids, outputs))
+
+
+class OpenAIBatchBackend:
+    """OpenAI Batch API로 제출하고 timeout 안에 끝난 항목만 결과로 반환 (나머지는 error)"""
+
+    def __init__(self, client, poll_interval=BATCH_POLL_INTERVAL, timeout=BATCH_TIMEOUT,
+                 cancel_timeout=BATCH_CANCEL_TIMEOUT):
+        self.client = client
+        self.poll_interval = poll_interval
+        self.timeout = timeout
+        self.cancel_timeout = cancel_timeout
+
+    def _to_jsonl(self, requests):
+        lines = [
+            json.dumps({"custom_id": custom_id, "method": "POST", "url": BATCH_ENDPOINT, "body": body},
+                       ensure_ascii=False)
+            for custom_id, body in requests.items()
+        ]
+        return "\n".join(lines).encode("utf-8")
+
+    def run(self, requests):
+        upload = self.client.files.create(file=("summaries.jsonl", self._to_jsonl(requests)), purpose="batch")
+        batch = self.client.batches.create(
+            input_file_id=upload.id, endpoint=BATCH_ENDPOINT, completion_window="24h"
+        )
+        print(f"📦 배치 제출: {batch.id} ({len(requests)}건)")
+
+        deadline = time.monotonic() + self.timeout
+        cancelled = False
+        while batch.status not in ("completed", "failed", "expired", "cancelled"):
+            if not cancelled and time.monotonic() > deadline:
+                # 취소해도 이미 끝난(과금된) 항목은 cancelled 이후 output 파일로 받을 수 있으므로 계속 폴링
+                print(f"⏱️ 배치 {batch.id} 시간 초과, 취소 후 끝난 항목만 가져옵니다")
+                batch = self.client.batches.cancel(batch.id)
+                cancelled = True
+                deadline = time.monotonic() + self.cancel_timeout
+                continue
+            if cancelled and time.monotonic() > deadline:
+                print(f"⚠️ 배치 {batch.id} 취소 대기 시간 초과 (상태: {batch.status})")
+                break
+            time.sleep(self.poll_interval)
+            batch = self.client.batches.retrieve(batch.id)
+
+        results = {}
+        for file_id in (batch.output_file_id, batch.error_file_id):
+            if file_id:
+                results.update(self._parse_output(self.client.files.content(file_id).text))
+
+        for custom_id in requests:
+            results.setdefault(custom_id, BatchResult(error=f"batch {batch.status}: no result"))
+        return results
+
+    @staticmethod
+    def _parse_output(text):
+        results = {}
+        for line in text.splitlines():
+            if not line.strip():
+                continue
+            row = json.loads(line)
+            response = row.get("response") or {}
+            if row.get("error") or response.get("status_code", 200) != 200:
+                error = row.get("error") or response.get("body", {}).get("error")
+                results[row["custom_id"]] = BatchResult(error=json.dumps(error, ensure_ascii=False))
+                continue
+            metrics.record_usage(response["body"].get("usage"), prefix="openai.batch")
+            content = response["body"]["choices"][0]["message"]["content"]
+            results[row["custom_id"]] = BatchResult(text=content.strip())
+        return results
+
+
+def run_batch(requests, backend, fallback=None):
+    """backend로 일괄 처리 후, 실패한 항목만 fallback 백엔드로 한 번 더 시도"""
+    if not requests:
+        return {}
+    try:
+        results = backend.run(requests)
+    except Exception as e:
+        print(f"❌ 배치 요청 실패: {e}")
+        results = {custom_id: BatchResult(error=str(e)) for custom_id in requests}
+
+    failed = {custom_id: requests[custom_id] for custom_id, r in results.items() if not r.ok}
+    if failed and fallback is not None:
+        print(f"🔁 배치 실패 {len(failed)}건 개별 재시도")
+        results.update(fallback.run(failed))
+    return results
@@ -0,0 +1,343 @@
+# benchmarks/fake_services.py
+"""벤치마크용 로컬 대역 서버: YouTube Data API / OpenAI / Supabase PostgREST.
+
+실제 API와 같은 경로·응답 형태만 흉내 내고, 서비스별 지연(latency)과 오류 주입(error_rate)을
+설정할 수 있다. throttle_rate 확률로 429(rate limit) 응답도 섞을 수 있다. 요청 수는 서비스/경로별로 집계해 counts()로 돌려준다.
+
+    services = FakeServices(latency={"openai": 0.3}, error_rate=0.05).start()
+    env = services.env()  # YOUTUBE_API_BASE, OPENAI_BASE_URL, SUPABASE_URL ...
+    ...
+    services.stop()
+"""
+import json
+import random
+import re
+import sys
+import threading
+import time
+import uuid
+import zlib
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+DEFAULT_LATENCY = {"youtube": 0.05, "openai": 0.3, "supabase": 0.03}
+
+EVENT_CATEGORIES = ["event", "outdoor", "museum", "market", "food", "family", "music", "sports", "seasonal"]
+_REGIONS_RE = re.compile(r"^REGIONS:\s*(.+)$", re.MULTILINE)
+_REGION_SPLIT_RE = re.compile(r"[^,]+,\s*[A-Z]{2}\b|[^,]+")
+_DATE_RE = re.compile(r"(\d{4}-\d{2}-\d{2}) ~ (\d{4}-\d{2}-\d{2})")
+
+
+class _Handler(BaseHTTPRequestHandler):
+    service = None      # 하위 클래스에서 지정
+    owner = None        # FakeServices
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _body(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        return self.rfile.read(length) if length else b""
+
+    def _send_json(self, status, payload, headers=None):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _inject(self):
+        """지연 후 throttle_rate 확률로 429, error_rate 확률로 503 응답. 응답을 보냈으면 True"""
+        self.owner.record(self.service, urlparse(self.path).path)
+        time.sleep(self.owner.latency.get(self.service, 0))
+        roll = random.random()
+        if roll < self.owner.throttle_rate:
+            self._body()
+            self._send_json(429, {"error": {"code": 429, "message": "injected rate limit"}},
+                            headers={"Retry-After": "0.2"})
+            return True
+        if roll < self.owner.throttle_rate + self.owner.error_rate:
+            self._body()
+            self._send_json(503, {"error": {"code": 503, "message": "injected failure"}})
+            return True
+        return False
+
+    def do_GET(self):
+        if not self._inject():
+            self.handle_get(urlparse(self.path))
+
+    def do_POST(self):
+        if not self._inject():
+            self.handle_post(urlparse(self.path))
+
+    def handle_get(self, url):
+        self._send_json(404, {"error": "not found"})
+
+    def handle_post(self, url):
+        self._send_json(404, {"error": "not found"})
+
+
+# ---------- YouTube Data API ----------
+class YouTubeHandler(_Handler):
+    service = "youtube"
+
+    def handle_get(self, url):
+        query = parse_qs(url.query)
+        if url.path.endswith("/search"):
+            q = query.get("q", [""])[0]
+            n = int(query.get("maxResults", ["10"])[0])
+            seed = zlib.crc32(q.encode("utf-8")) % 10 ** 6
+            items = [{"id": {"kind": "youtube#video", "videoId": f"v{seed:06d}{i:04d}"[:11]},
+                      "snippet": self.owner.snippet(f"v{seed:06d}{i:04d}"[:11], q)} for i in range(n)]
+            self._send_json(200, {"kind": "youtube#searchListResponse", "items": items})
+        elif url.path.endswith("/videos"):
+            ids = [v for v in query.get("id", [""])[0].split(",") if v]
+            items = []
+            for video_id in ids:
+                rng = random.Random(video_id)
+                items.append({
+                    "id": video_id,
+                    "snippet": self.owner.snippet(video_id, "video"),
+                    "contentDetails": {"duration": f"PT{rng.randint(2, 70)}M{rng.randint(0, 59)}S"},
+                    "statistics": {"viewCount": str(rng.randint(100, 10 ** 6)),
+                                   "likeCount": str(rng.randint(0, 10 ** 4)),
+                                   "commentCount": str(rng.randint(0, 10 ** 3))},
+                })
+            self._send_json(200, {"kind": "youtube#videoListResponse", "items": items})
+        else:
+            super().handle_get(url)
+
+
+# ---------- OpenAI ----------
+class OpenAIHandler(_Handler):
+    service = "openai"
+
+    def handle_post(self, url):
+        if url.path.endswith("/audio/transcriptions"):
+            self._transcription()
+        elif url.path.endswith("/chat/completions"):
+            self._chat(json.loads(self._body() or b"{}"))
+        else:
+            self._body()
+            super().handle_post(url)
+
+    def _transcription(self):
+        size = len(self._body())  # multipart 본문 크기로 오디오 길이를 흉내 냄
+        words = " ".join(f"단어{i % 50}" for i in range(max(20, size // 200)))
+        self._send_json(200, {"text": f"대역 전사 결과 {size}바이트. {words}"})
+
+    def _completion_text(self, request):
+        prompt = "\n".join(str(m.get("content")) for m in request.get("messages", []))
+        match = _REGIONS_RE.search(prompt)
+        if not match:
+            return "대역 요약: " + prompt[:200].replace("\n", " ")
+        dates = _DATE_RE.search(prompt)
+        day = dates.group(1) if dates else datetime.now().strftime("%Y-%m-%d")
+        regions = []
+        # "Orange County, CA, Los Angeles, CA" → ["Orange County, CA", "Los Angeles, CA"]
+        for name in [r.strip(" ,") for r in _REGION_SPLIT_RE.findall(match.group(1))]:
+            events = [{
+                "title": f"{name} event {uuid.uuid4().hex[:8]}",
+                "start": f"{day} 10:00", "end": f"{day} 14:00",
+                "venue": f"Venue {uuid.uuid4().hex[:6]}", "address": "",
+                "category": random.choice(EVENT_CATEGORIES),
+                "url": "https://example.com/", "image": "",
+            } for _ in range(6)]
+            regions.append({"name": name, "events": events})
+        return json.dumps({"regions": regions, "disclaimer": "benchmark data"}, ensure_ascii=False)
+
+    def _chat(self, request):
+        text = self._completion_text(request)
+        usage = {"prompt_tokens": sum(len(str(m.get("content"))) // 4 for m in request.get("messages", [])),
+                 "completion_tokens": len(text) // 4}
+        usage["total_tokens"] = usage["prompt_tokens"] + usage["completion_tokens"]
+        base = {"id": f"chatcmpl-{uuid.uuid4().hex}", "created": int(time.time()), "model": request.get("model")}
+        if not request.get("stream"):
+            self._send_json(200, dict(base, object="chat.completion", usage=usage, choices=[{
+                "index": 0, "finish_reason": "stop",
+                "message": {"role": "assistant", "content": text}}]))
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+        def send(payload):
+            data = f"data: {payload}\n\n".encode("utf-8")
+            self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+
+        step = max(1, len(text) // 40)
+        for i in range(0, len(text), step):
+            send(json.dumps(dict(base, object="chat.completion.chunk", choices=[{
+                "index": 0, "finish_reason": None, "delta": {"content": text[i:i + step]}}]),
+                ensure_ascii=False))
+            time.sleep(self.owner.stream_delay)
+        if (request.get("stream_options") or {}).get("include_usage"):
+            send(json.dumps(dict(base, object="chat.completion.chunk", choices=[], usage=usage)))
+        send("[DONE]")
+        self.wfile.write(b"0\r\n\r\n")
+
+
+# ---------- Supabase PostgREST ----------
+def _parse_filter(value):
+    op, _, arg = value.partition(".")
+    if op == "in":
+        arg = [v.strip().strip('"') for v in re.findall(r'"(?:[^"\\]|\\.)*"|[^,()]+', arg.strip("()"))]
+    return op, arg
+
+
+class SupabaseHandler(_Handler):
+    service = "supabase"
+    _RESERVED = {"select", "order", "limit", "offset", "on_conflict", "columns"}
+
+    def _table(self, url):
+        return url.path.rstrip("/").split("/")[-1]
+
+    def handle_get(self, url):
+        if "/rest/v1/" not in url.path:
+            return super().handle_get(url)
+        query = parse_qs(url.query)
+        rows = self.owner.rows(self._table(url))
+        for column, values in query.items():
+            if column in self._RESERVED:
+                continue
+            for value in values:
+                op, arg = _parse_filter(value)
+                rows = [r for r in rows if _match(r.get(column), op, arg)]
+        if "order" in query:
+            column, _, direction = query["order"][0].partition(".")
+            rows.sort(key=lambda r: r.get(column) or "", reverse=direction.startswith("desc"))
+        if "limit" in query:
+            rows = rows[int(query.get("offset", ["0"])[0]):][:int(query["limit"][0])]
+        columns = [c for c in query.get("select", ["*"])[0].split(",") if c]
+        if columns != ["*"]:
+            rows = [{c: r.get(c) for c in columns} for r in rows]
+        self._send_json(200, rows)
+
+    def handle_post(self, url):
+        if "/rest/v1/" not in url.path:
+            return super().handle_post(url)
+        payload = json.loads(self._body() or b"[]")
+        rows = payload if isinstance(payload, list) else [payload]
+        conflict = parse_qs(url.query).get("on_conflict", [None])[0]
+        inserted = self.owner.insert(self._table(url), rows, conflict)
+        self._send_json(201, inserted)
+
+
+def _match(value, op, arg):
+    if op == "eq":
+        return str(value) == arg
+    if op == "neq":
+        return str(value) != arg
+    if op == "in":
+        return str(value) in arg
+    if op in ("gt", "gte", "lt", "lte"):
+        if value is None:
+            return False
+        value, arg = str(value), str(arg)
+        return {"gt": value > arg, "gte": value >= arg, "lt": value < arg, "lte": value <= arg}[op]
+    return True
+
+
+# ---------- 서버 묶음 ----------
+class _QuietServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # 클라이언트가 재시도/타임아웃으로 먼저 끊은 연결은 무시
+        if not isinstance(sys.exc_info()[1], (ConnectionResetError, BrokenPipeError)):
+            super().handle_error(request, client_address)
+
+
+class FakeServices:
+    def __init__(self, latency=None, error_rate=0.0, throttle_rate=0.0, stream_delay=0.01, host="127.0.0.1"):
+        self.latency = dict(DEFAULT_LATENCY, **(latency or {}))
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.stream_delay = stream_delay
+        self.host = host
+        self._servers = {}
+        self._tables = {}
+        self._counts = {}
+        self._lock = threading.Lock()
+
+    def start(self):
+        for name, handler in (("youtube", YouTubeHandler), ("openai", OpenAIHandler),
+                              ("supabase", SupabaseHandler)):
+            cls = type(handler.__name__, (handler,), {"owner": self})
+            server = _QuietServer((self.host, 0), cls)
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+            self._servers[name] = server
+        return self
+
+    def stop(self):
+        for server in self._servers.values():
+            server.shutdown()
+            server.server_close()
+
+    def url(self, name):
+        host, port = self._servers[name].server_address[:2]
+        return f"http://{host}:{port}"
+
+    def env(self):
+        """entry-point 스크립트를 대역 서버로 향하게 하는 환경변수"""
+        return {
+            "YOUTUBE_API_BASE": self.url("youtube") + "/youtube/v3",
+            "YOUTUBE_API_KEY": "fake-youtube-key",
+            "OPENAI_BASE_URL": self.url("openai") + "/v1",
+            "OPENAI_API_KEY": "sk-fake",
+            "SUPABASE_URL": self.url("supabase"),
+            # supabase-py가 JWT 형태만 허용
+            "SUPABASE_KEY": "eyJhbGciOiJIUzI1NiJ9.eyJyb2xlIjoiYW5vbiJ9.ZmFrZQ",
+        }
+
+    # ---- 집계/저장 ----
+    def record(self, service, path):
+        path = re.sub(r"/rest/v1/.*", "/rest/v1/<table>", path)
+        with self._lock:
+            key = f"{service} {path}"
+            self._counts[key] = self._counts.get(key, 0) + 1
+
+    def counts(self):
+        with self._lock:
+            return dict(self._counts)
+
+    def reset_counts(self):
+        with self._lock:
+            self._counts.clear()
+
+    def snippet(self, video_id, query):
+        published = datetime.now(timezone.utc) - timedelta(days=random.Random(video_id).randint(0, 30))
+        return {
+            "title": f"{query} 영상 {video_id}",
+            "description": "benchmark video",
+            "channelTitle": "Bench Channel",
+            "publishedAt": published.strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "thumbnails": {"high": {"url": f"https://i.ytimg.com/vi/{video_id}/hqdefault.jpg"}},
+        }
+
+    def rows(self, table):
+        with self._lock:
+            return [dict(r) for r in self._tables.get(table, [])]
+
+    def insert(self, table, rows, conflict=None):
+        with self._lock:
+            existing = self._tables.setdefault(table, [])
+            keys = {r.get(conflict) for r in existing} if conflict else set()
+            inserted = []
+            for row in rows:
+                if conflict and row.get(conflict) in keys:
+                    continue
+                row = dict(row, id=len(existing) + 1, created_at=datetime.now(timezone.utc).isoformat())
+                existing.append(row)
+                inserted.append(row)
+                if conflict:
+                    keys.add(row.get(conflict))
+            return inserted
@@ -0,0 +1,68 @@
+# benchmarks/import_budget.py
+"""모듈 import 시간 예산 확인.
+
+각 모듈을 자격 증명 없는 깨끗한 프로세스에서 import해 `-X importtime` 누적 시간을 재고,
+예산(--budget-ms)을 넘거나 openai/supabase 같은 무거운 패키지를 import 시점에 불러오면 실패한다.
+
+    python benchmarks/import_budget.py
+    python benchmarks/import_budget.py --budget-ms 200 youtube_search
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODULES = [
+    "youtube_search", "upload_youtube_recommend", "upload_la_oc_events",
+    "clients", "http_client", "metrics", "html_render", "topic_selector", "event_stream",
+]
+# 클라이언트를 처음 쓸 때만 불러와야 하는 패키지
+DEFERRED = ("openai", "supabase", "yt_dlp", "numpy")
+_IMPORTTIME_RE = re.compile(r"^import time:\s+\d+ \|\s+(\d+) \|\s*(\S+)$")
+
+
+def measure(module):
+    """(누적 import 시간 ms, import 시점에 불려온 DEFERRED 패키지 목록)"""
+    env = {"PATH": os.environ.get("PATH", ""), "HOME": os.environ.get("HOME", ""), "PYTHONIOENCODING": "utf-8"}
+    code = f"import sys, {module}; print(','.join(m for m in {DEFERRED!r} if m in sys.modules))"
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=ROOT, env=env,
+                          capture_output=True, text=True, encoding="utf-8")
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else "import failed")
+    cumulative_us = 0
+    for line in proc.stderr.splitlines():
+        match = _IMPORTTIME_RE.match(line.strip())
+        if match and match.group(2) == module:
+            cumulative_us = int(match.group(1))
+    loaded = [m for m in proc.stdout.strip().split(",") if m]
+    return cumulative_us / 1000, loaded
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="모듈 import 시간 예산 확인")
+    parser.add_argument("modules", nargs="*", default=MODULES)
+    parser.add_argument("--budget-ms", type=float, default=float(os.getenv("IMPORT_BUDGET_MS", "300")))
+    args = parser.parse_args(argv)
+
+    failed = False
+    for module in args.modules:
+        try:
+            ms, loaded = measure(module)
+        except RuntimeError as e:
+            print(f"❌ {module}: import 실패 ({e})")
+            failed = True
+            continue
+        problems = []
+        if ms > args.budget_ms:
+            problems.append(f"예산 {args.budget_ms:.0f}ms 초과")
+        if loaded:
+            problems.append(f"import 시점에 로드됨: {', '.join(loaded)}")
+        failed = failed or bool(problems)
+        print(f"{'❌' if problems else '✅'} {module}: {ms:.1f}ms" + (f" ({'; '.join(problems)})" if problems else ""))
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
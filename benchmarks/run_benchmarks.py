@@ -0,0 +1,193 @@
+# benchmarks/run_benchmarks.py
+"""세 entry-point 스크립트를 로컬 대역 서버에 붙여 실행하고 처리량/단계별 지연/요청 수를 비교.
+
+    python benchmarks/run_benchmarks.py --iterations 3
+    python benchmarks/run_benchmarks.py --scripts youtube_search --latency openai=0.8 --error-rate 0.05
+
+스크립트마다 새 CACHE_DIR(캐시가 빈 상태)에서 실행하며 (--warm이면 같은 캐시 재사용),
+각 실행이 남긴 metrics 리포트와 대역 서버의 요청 수를 모아 표와 JSON으로 출력한다.
+yt-dlp는 benchmarks/bin/yt-dlp 대역을 PATH 앞에 두어 대체한다.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+from fake_services import FakeServices
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BIN_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bin")
+SCRIPTS = {
+    "youtube_search": "youtube_search.py",
+    "upload_youtube_recommend": "upload_youtube_recommend.py",
+    "upload_la_oc_events": "upload_la_oc_events.py",
+}
+
+
+def _percentile(values, pct):
+    values = sorted(values)
+    if not values:
+        return 0.0
+    k = min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))
+    return values[k]
+
+
+def run_script(name, services, cache_dir, download_latency, extra_env=None, timeout=600):
+    """스크립트 한 번 실행. {"name", "returncode", "wall_s", "report", "requests", "output"}"""
+    report_dir = tempfile.mkdtemp(prefix="bench_report_")
+    env = dict(os.environ)
+    env.pop("GITHUB_ACTIONS", None)
+    env.update(services.env())
+    env.update({
+        "PATH": BIN_DIR + os.pathsep + env.get("PATH", ""),
+        "CACHE_DIR": cache_dir,
+        "RUN_REPORT_DIR": report_dir,
+        "AUDIO_DOWNLOADER": "cli",  # 대역 yt-dlp 실행 파일을 거치도록 (inprocess는 실제 YouTube에 접속)
+        "AUDIO_STREAMING": "0",     # 대역 yt-dlp 출력은 ffmpeg로 디코딩할 수 없음
+        "FAKE_YTDLP_LATENCY": str(download_latency),
+        "PYTHONIOENCODING": "utf-8",
+    })
+    env.update(extra_env or {})
+
+    before = services.counts()
+    started = time.perf_counter()
+    proc = subprocess.run([sys.executable, SCRIPTS[name]], cwd=ROOT, env=env,
+                          capture_output=True, text=True, encoding="utf-8", timeout=timeout)
+    wall = time.perf_counter() - started
+    after = services.counts()
+
+    report = None
+    reports = sorted(f for f in os.listdir(report_dir) if f.endswith(".json"))
+    if reports:
+        with open(os.path.join(report_dir, reports[-1]), encoding="utf-8") as f:
+            report = json.load(f)
+    return {
+        "name": name,
+        "returncode": proc.returncode,
+        "wall_s": wall,
+        "report": report,
+        "requests": {k: v - before.get(k, 0) for k, v in after.items() if v - before.get(k, 0)},
+        "output": proc.stdout[-4000:] + proc.stderr[-4000:],
+    }
+
+
+def summarize(runs):
+    """같은 스크립트의 여러 실행 → 처리량, 실행 시간 p50/p95, 단계별 p50/p95, 평균 요청 수"""
+    walls = [r["wall_s"] for r in runs]
+    posted = [((r["report"] or {}).get("counters") or {}).get("supabase.rows_sent", 0) for r in runs]
+    stages = {}
+    counters = {}
+    for r in runs:
+        report = r["report"] or {}
+        for stage, s in report.get("spans", {}).items():
+            st = stages.setdefault(stage, {"p50": [], "p95": [], "count": 0, "errors": 0})
+            st["p50"].append(s["p50_ms"])
+            st["p95"].append(s["p95_ms"])
+            st["count"] += s["count"]
+            st["errors"] += s["errors"]
+        for k, v in report.get("counters", {}).items():
+            counters[k] = counters.get(k, 0) + v
+    requests = {}
+    for r in runs:
+        for k, v in r["requests"].items():
+            requests[k] = requests.get(k, 0) + v
+    n = len(runs)
+    return {
+        "runs": n,
+        "failures": sum(1 for r in runs if r["returncode"] != 0),
+        "wall_p50_s": round(_percentile(walls, 50), 3),
+        "wall_p95_s": round(_percentile(walls, 95), 3),
+        "posts_per_min": round(sum(posted) / sum(walls) * 60, 2) if sum(walls) else 0.0,
+        "stages": {
+            stage: {
+                "count": s["count"],
+                "errors": s["errors"],
+                "p50_ms": round(statistics.median(s["p50"]), 1),
+                "p95_ms": round(max(s["p95"]), 1),
+            }
+            for stage, s in stages.items()
+        },
+        "counters_per_run": {k: round(v / n, 1) for k, v in sorted(counters.items())},
+        "requests_per_run": {k: round(v / n, 1) for k, v in sorted(requests.items())},
+    }
+
+
+def print_summary(name, s):
+    print(f"\n📊 {name}: {s['runs']}회 실행 (실패 {s['failures']}) "
+          f"wall p50 {s['wall_p50_s']:.2f}s / p95 {s['wall_p95_s']:.2f}s, 게시 {s['posts_per_min']}/min")
+    print(f"  {'stage':<22}{'count':>6}{'err':>5}{'p50_ms':>10}{'p95_ms':>10}")
+    for stage, st in sorted(s["stages"].items(), key=lambda kv: -kv[1]["p95_ms"]):
+        print(f"  {stage:<22}{st['count']:>6}{st['errors']:>5}{st['p50_ms']:>10.1f}{st['p95_ms']:>10.1f}")
+    for k, v in s["requests_per_run"].items():
+        print(f"  ↔ {k}: {v}/run")
+    for k, v in s["counters_per_run"].items():
+        print(f"  • {k}: {v:,}/run")
+
+
+def _parse_latency(values):
+    latency = {}
+    for value in values or []:
+        service, _, seconds = value.partition("=")
+        latency[service] = float(seconds)
+    return latency
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="로컬 대역 서버 기반 end-to-end 벤치마크")
+    parser.add_argument("--scripts", default=",".join(SCRIPTS),
+                        help=f"실행할 스크립트 (쉼표 구분, 기본: 전체 {','.join(SCRIPTS)})")
+    parser.add_argument("--iterations", type=int, default=3, help="스크립트별 반복 횟수")
+    parser.add_argument("--latency", action="append", metavar="SERVICE=SECONDS",
+                        help="서비스별 응답 지연 (youtube/openai/supabase). 여러 번 지정 가능")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="모든 대역 서버의 503 주입 확률")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="모든 대역 서버의 429 주입 확률")
+    parser.add_argument("--download-latency", type=float, default=0.5, help="대역 yt-dlp 지연(초)")
+    parser.add_argument("--warm", action="store_true", help="반복 간 CACHE_DIR을 유지 (캐시 적중 상태 측정)")
+    parser.add_argument("--env", action="append", metavar="KEY=VALUE", default=[],
+                        help="스크립트에 넘길 추가 환경변수 (예: PIPELINE_WORKERS=1)")
+    parser.add_argument("--output", help="결과 JSON 경로 (기본: reports/benchmark-<시각>.json)")
+    parser.add_argument("--verbose", action="store_true", help="실패한 실행의 출력 끝부분 표시")
+    args = parser.parse_args(argv)
+
+    names = [n.strip() for n in args.scripts.split(",") if n.strip()]
+    unknown = [n for n in names if n not in SCRIPTS]
+    if unknown:
+        parser.error(f"알 수 없는 스크립트: {', '.join(unknown)}")
+    extra_env = dict(kv.split("=", 1) for kv in args.env)
+
+    services = FakeServices(latency=_parse_latency(args.latency), error_rate=args.error_rate,
+                            throttle_rate=args.throttle_rate).start()
+    results = {}
+    try:
+        for name in names:
+            runs = []
+            cache_dir = tempfile.mkdtemp(prefix="bench_cache_")
+            for i in range(args.iterations):
+                if not args.warm and i:
+                    cache_dir = tempfile.mkdtemp(prefix="bench_cache_")
+                print(f"▶️ {name} ({i + 1}/{args.iterations})")
+                run = run_script(name, services, cache_dir, args.download_latency, extra_env)
+                if run["returncode"] != 0 and args.verbose:
+                    print(run["output"])
+                runs.append(run)
+            results[name] = summarize(runs)
+            print_summary(name, results[name])
+    finally:
+        services.stop()
+
+    output = args.output or os.path.join(
+        ROOT, "reports", f"benchmark-{datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')}.json")
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump({"args": vars(args), "results": results}, f, ensure_ascii=False, indent=2)
+    print(f"\n🧾 벤치마크 결과: {output}")
+    return 1 if any(s["failures"] for s in results.values()) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,40 @@
+# clients.py
+"""OpenAI / Supabase 클라이언트 지연 생성.
+
+처음 필요할 때 한 번만 만들고 프로세스 안에서 재사용한다. openai/supabase 패키지 import도
+이때 하므로, parse_duration_to_minutes 같은 헬퍼만 쓰는 도구는 자격 증명 없이 빠르게 import된다.
+"""
+import os
+import threading
+
+_lock = threading.Lock()
+_openai_client = None
+_supabase = None
+
+
+def get_openai_client():
+    global _openai_client
+    if _openai_client is None:
+        with _lock:
+            if _openai_client is None:
+                from openai import OpenAI
+                _openai_client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+    return _openai_client
+
+
+def get_supabase():
+    global _supabase
+    if _supabase is None:
+        with _lock:
+            if _supabase is None:
+                from supabase import create_client
+                _supabase = create_client(os.getenv("SUPABASE_URL"), os.getenv("SUPABASE_KEY"))
+    return _supabase
+
+
+def reset():
+    """다음 호출 때 새로 만들도록 캐시된 클라이언트를 버림 (자격 증명 교체 등)"""
+    global _openai_client, _supabase
+    with _lock:
+        _openai_client = None
+        _supabase = None
@@ -0,0 +1,190 @@
+# dedup_index.py
+"""이미 게시한 주제/영상 ID의 로컬 인덱스.
+
+posts 테이블을 매번 LIKE 스캔하는 대신, 마지막으로 본 created_at(watermark) 이후에
+추가된 게시글만 가져와 인덱스를 갱신하고 CACHE_DIR에 저장한다. 조회는 dict/set
+멤버십이라 O(1)이다.
+
+DEDUP_EXACT_DAYS보다 오래된 영상 ID는 정확한 목록에서 빼고 Bloom filter에만 남겨
+게시글 이력이 길어져도 인덱스 크기가 일정하게 유지된다 (DEDUP_BLOOM=0이면 버림).
+"""
+import base64
+import hashlib
+import json
+import math
+import os
+import re
+import threading
+from datetime import datetime, timedelta, timezone
+
+import rate_limit
+from disk_cache import CACHE_DIR
+
+RECOMMEND_TITLE_PREFIX = "유튜브 추천:"
+DEDUP_EXACT_DAYS = int(os.getenv("DEDUP_EXACT_DAYS", "90"))
+DEDUP_BLOOM = os.getenv("DEDUP_BLOOM", "1") == "1"
+DEDUP_BLOOM_CAPACITY = int(os.getenv("DEDUP_BLOOM_CAPACITY", "100000"))
+DEDUP_BLOOM_ERROR_RATE = float(os.getenv("DEDUP_BLOOM_ERROR_RATE", "0.001"))
+# 첫 동기화(watermark 없음) 때 가져올 기간
+DEDUP_BOOTSTRAP_DAYS = int(os.getenv("DEDUP_BOOTSTRAP_DAYS", "90"))
+SYNC_PAGE_SIZE = 500
+
+_VIDEO_ID_RE = re.compile(r"(?:v=|youtu\.be/|/vi/)([\w-]{11})")
+# youtube_search 게시글의 본 영상 링크 (본문 아래 "관련 영상 목록"은 게시한 영상이 아님)
+_MAIN_VIDEO_RE = re.compile(r"🔗 영상 링크:\s*\S*?(?:v=|youtu\.be/)([\w-]{11})")
+
+
+def posted_video_ids(content):
+    """게시글 본문에서 게시한 영상 ID들. youtube_search 글은 본 영상 하나, 추천 글은 카드의 모든 영상"""
+    main = _MAIN_VIDEO_RE.search(content or "")
+    if main:
+        return {main.group(1)}
+    return set(_VIDEO_ID_RE.findall(content or ""))
+
+
+class BloomFilter:
+    """고정 크기 비트 배열 Bloom filter (false positive는 있지만 false negative는 없음)"""
+
+    def __init__(self, capacity=DEDUP_BLOOM_CAPACITY, error_rate=DEDUP_BLOOM_ERROR_RATE,
+                 bits=None, hashes=None, size=None):
+        self.size = size or max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hashes = hashes or max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray(bits) if bits else bytearray((self.size + 7) // 8)
+
+    def _positions(self, item):
+        digest = hashlib.sha256(item.encode("utf-8")).digest()
+        h1 = int.from_bytes(digest[:8], "big")
+        h2 = int.from_bytes(digest[8:16], "big") | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hashes)]
+
+    def add(self, item):
+        for pos in self._positions(item):
+            self.bits[pos // 8] |= 1 << (pos % 8)
+
+    def __contains__(self, item):
+        return all(self.bits[pos // 8] & (1 << (pos % 8)) for pos in self._positions(item))
+
+    def to_dict(self):
+        return {"bits": base64.b64encode(bytes(self.bits)).decode("ascii"),
+                "hashes": self.hashes, "size": self.size}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(bits=base64.b64decode(data["bits"]), hashes=data["hashes"], size=data["size"])
+
+
+def _parse_ts(value):
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+class DedupIndex:
+    def __init__(self, path=None):
+        self.path = path or os.path.join(CACHE_DIR, "dedup_index.json")
+        self._lock = threading.Lock()
+        self.watermark = None           # 마지막으로 반영한 게시글의 created_at (ISO 문자열)
+        self.topics = {}                # 주제 → 마지막 게시 시각 (ISO)
+        self.videos = {}                # video_id → 마지막 게시 시각 (ISO)
+        self.bloom = BloomFilter() if DEDUP_BLOOM else None
+        self._load()
+
+    # ---------- persistence ----------
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠️ 중복 인덱스 로드 실패, 새로 만듭니다: {e}")
+            return
+        self.watermark = data.get("watermark")
+        self.topics = data.get("topics", {})
+        self.videos = data.get("videos", {})
+        if DEDUP_BLOOM and data.get("bloom"):
+            self.bloom = BloomFilter.from_dict(data["bloom"])
+
+    def save(self):
+        with self._lock:
+            self._prune()
+            data = {
+                "watermark": self.watermark,
+                "topics": self.topics,
+                "videos": self.videos,
+                "bloom": self.bloom.to_dict() if self.bloom else None,
+            }
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp, self.path)
+
+    def _prune(self):
+        cutoff = (datetime.now(timezone.utc) - timedelta(days=DEDUP_EXACT_DAYS)).isoformat()
+        for video_id, ts in list(self.videos.items()):
+            if ts < cutoff:
+                if self.bloom is not None:
+                    self.bloom.add(video_id)
+                del self.videos[video_id]
+        for topic, ts in list(self.topics.items()):
+            if ts < cutoff:
+                del self.topics[topic]
+
+    # ---------- updates ----------
+    def add_post(self, title, content="", created_at=None):
+        """게시글 하나를 인덱스에 반영 (동기화 결과 또는 방금 올린 글)"""
+        ts = _parse_ts(created_at).astimezone(timezone.utc).isoformat() if created_at \
+            else datetime.now(timezone.utc).isoformat()
+        with self._lock:
+            if title and title.startswith(RECOMMEND_TITLE_PREFIX):
+                topic = title.split(RECOMMEND_TITLE_PREFIX, 1)[-1].strip()
+                self.topics[topic] = max(ts, self.topics.get(topic, ""))
+            for video_id in posted_video_ids(content):
+                self.videos[video_id] = max(ts, self.videos.get(video_id, ""))
+            if created_at and (self.watermark is None or ts > self.watermark):
+                self.watermark = ts
+
+    def sync(self, supabase, source="youtube"):
+        """watermark 이후에 생긴 게시글만 가져와 반영 후 저장. 반영한 게시글 수 반환"""
+        since = self.watermark or (
+            datetime.now(timezone.utc) - timedelta(days=DEDUP_BOOTSTRAP_DAYS)
+        ).isoformat()
+        count = 0
+        while True:
+            with rate_limit.slot("supabase"):
+                response = supabase.table("posts") \
+                    .select("title,content,created_at") \
+                    .eq("source", source) \
+                    .gt("created_at", since) \
+                    .order("created_at") \
+                    .limit(SYNC_PAGE_SIZE) \
+                    .execute()
+            rows = response.data or []
+            for row in rows:
+                self.add_post(row.get("title"), row.get("content"), row.get("created_at"))
+            count += len(rows)
+            if len(rows) < SYNC_PAGE_SIZE:
+                break
+            since = rows[-1]["created_at"]
+        self.save()
+        return count
+
+    # ---------- queries ----------
+    def recent_topics(self, days=30):
+        cutoff = (datetime.now(timezone.utc) - timedelta(days=days)).isoformat()
+        with self._lock:
+            return {topic for topic, ts in self.topics.items() if ts >= cutoff}
+
+    def seen_video(self, video_id):
+        if video_id in self.videos:
+            return True
+        return self.bloom is not None and video_id in self.bloom
+
+
+_index = None
+
+
+def get_index():
+    global _index
+    if _index is None:
+        _index = DedupIndex()
+    return _index
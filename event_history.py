@@ -0,0 +1,105 @@
+# event_history.py
+"""지난 주간 추천의 압축 이력 (제목/장소 fingerprint).
+
+게시할 때 이벤트마다 정규화한 제목·장소의 짧은 해시와 사람이 읽을 짧은 라벨만 저장하고,
+다음 실행에서는 이 목록을 읽어 프롬프트에 "피할 항목"으로 넣는다. 지난 게시글 HTML
+전체를 DB에서 받아 프롬프트에 넣던 것보다 DB 전송량과 토큰이 훨씬 적다.
+"""
+import hashlib
+import html
+import json
+import os
+import re
+import unicodedata
+from datetime import datetime, timedelta, timezone
+
+import rate_limit
+from disk_cache import CACHE_DIR
+
+HISTORY_WEEKS = int(os.getenv("EVENT_HISTORY_WEEKS", "4"))
+HISTORY_PROMPT_LIMIT = int(os.getenv("EVENT_HISTORY_PROMPT_LIMIT", "30"))
+# 이런 장소명은 너무 일반적이라 장소만으로 중복 판단하지 않음
+GENERIC_VENUES = {"", "various", "various locations", "multiple locations", "tbd", "online", "downtown"}
+
+_CARD_TITLE_RE = re.compile(r"<strong>\d+\.\s*(.*?)</strong>")
+
+
+def normalize(text):
+    text = unicodedata.normalize("NFKC", text or "").lower()
+    text = re.sub(r"[^\w\s]", " ", text)
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def fingerprint(text):
+    norm = normalize(text)
+    return hashlib.sha1(norm.encode("utf-8")).hexdigest()[:12] if norm else ""
+
+
+class EventHistory:
+    def __init__(self, path=None):
+        self.path = path or os.path.join(CACHE_DIR, "event_history.json")
+        self.entries = []   # [{"t": 제목 fp, "v": 장소 fp, "label": "제목 @ 장소", "at": ISO}]
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, encoding="utf-8") as f:
+                    self.entries = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"⚠️ 추천 이력 로드 실패: {e}")
+
+    def _recent(self, weeks=HISTORY_WEEKS):
+        cutoff = (datetime.now(timezone.utc) - timedelta(weeks=weeks)).isoformat()
+        return [e for e in self.entries if e["at"] >= cutoff]
+
+    def record(self, events, posted_at=None):
+        """게시한 이벤트 목록을 이력에 추가하고 저장 (오래된 항목은 정리)"""
+        at = posted_at or datetime.now(timezone.utc).isoformat()
+        seen = {e["t"] for e in self.entries}
+        for ev in events:
+            t = fingerprint(ev.get("title"))
+            if not t or t in seen:
+                continue
+            seen.add(t)
+            venue = normalize(ev.get("venue"))
+            label = ev.get("title", "").strip()
+            if venue and venue not in GENERIC_VENUES:
+                label += f" @ {ev.get('venue', '').strip()}"
+            self.entries.append({"t": t, "v": fingerprint(venue) if venue not in GENERIC_VENUES else "",
+                                 "label": label[:80], "at": at})
+        self.entries = self._recent(HISTORY_WEEKS * 2)
+        self.save()
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.entries, f, ensure_ascii=False)
+        os.replace(tmp, self.path)
+
+    def avoid_hints(self, limit=HISTORY_PROMPT_LIMIT):
+        """프롬프트에 넣을 짧은 라벨 목록 (최근 것부터)"""
+        recent = sorted(self._recent(), key=lambda e: e["at"], reverse=True)
+        return [e["label"] for e in recent[:limit]]
+
+    def is_repeat(self, ev):
+        recent = self._recent()
+        t = fingerprint(ev.get("title"))
+        if t and any(e["t"] == t for e in recent):
+            return True
+        venue = normalize(ev.get("venue"))
+        if venue in GENERIC_VENUES:
+            return False
+        v = fingerprint(venue)
+        return any(e["v"] == v for e in recent)
+
+    def backfill_from_posts(self, supabase, board_type, limit=4):
+        """로컬 이력이 없을 때(새 환경) 한 번만 지난 게시글에서 카드 제목을 뽑아 채움"""
+        with rate_limit.slot("supabase"):
+            response = supabase.table("posts").select("content,created_at") \
+                .eq("board_type", board_type).order("created_at", desc=True).limit(limit).execute()
+        for row in response.data or []:
+            titles = [html.unescape(re.sub(r"<[^>]+>", "", t))
+                      for t in _CARD_TITLE_RE.findall(row.get("content") or "")]
+            created = row.get("created_at")
+            at = datetime.fromisoformat(created.replace("Z", "+00:00")).astimezone(timezone.utc).isoformat() \
+                if created else None
+            self.record([{"title": t} for t in titles], posted_at=at)
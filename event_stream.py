@@ -0,0 +1,249 @@
+# event_stream.py
+"""주간 이벤트 추천 JSON을 스트리밍으로 받아 이벤트 단위로 파싱/검증.
+
+응답 전체를 기다렸다가 json.loads 한 번에 처리하면 한 군데만 깨져도 전부 버려야 한다.
+여기서는 토큰이 도착하는 대로 regions[].events[] 안의 객체가 닫히는 즉시 꺼내서
+스키마를 검사하고, 깨졌거나 스키마에 맞지 않는 이벤트만 따로 수리 요청을 보낸다.
+"""
+import json
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import llm_cache
+import metrics
+import rate_limit
+
+EVENT_CATEGORIES = {"event", "outdoor", "museum", "market", "food", "family", "music", "sports", "seasonal"}
+REQUIRED_FIELDS = ("title", "start", "end", "venue", "category")
+_DATETIME_RE = re.compile(r"^\d{4}-\d{2}-\d{2} \d{2}:\d{2}$")
+
+REPAIR_PROMPT = """The following event object from a JSON list is invalid.
+Errors: {errors}
+
+Object:
+{raw}
+
+Return ONLY the corrected JSON object with keys: title, start, end, venue, address, category, url, image.
+start/end use "YYYY-MM-DD HH:MM". category is one of: {categories}.
+If a URL is unknown use "". No markdown fences, no extra text."""
+
+
+def validate_event(ev):
+    """스키마 위반 목록 반환 (빈 리스트면 유효)"""
+    if not isinstance(ev, dict):
+        return ["event is not an object"]
+    errors = []
+    for field in REQUIRED_FIELDS:
+        if not isinstance(ev.get(field), str) or not ev[field].strip():
+            errors.append(f"'{field}' must be a non-empty string")
+    for field in ("start", "end"):
+        value = ev.get(field)
+        if isinstance(value, str) and value.strip() and not _DATETIME_RE.match(value.strip()):
+            errors.append(f"'{field}' must match YYYY-MM-DD HH:MM")
+    if isinstance(ev.get("category"), str) and ev["category"] not in EVENT_CATEGORIES:
+        errors.append(f"'category' must be one of {sorted(EVENT_CATEGORIES)}")
+    for field in ("url", "image"):
+        value = ev.get(field)
+        if value not in (None, "") and not (isinstance(value, str) and value.startswith(("http://", "https://"))):
+            errors.append(f"'{field}' must be an http(s) URL or empty")
+    if "address" in ev and not isinstance(ev["address"], str):
+        errors.append("'address' must be a string")
+    return errors
+
+
+class IncrementalEventParser:
+    """feed()로 받은 텍스트 조각에서 regions[].events[] 객체가 닫히는 즉시 꺼내는 파서.
+
+    feed()는 이번 조각에서 완성된 (region_name, raw_text) 목록을 반환한다.
+    raw_text는 이벤트 객체의 원문이며 json.loads 가능 여부는 호출 측에서 판단한다.
+    region 객체에서 "events"가 "name"보다 먼저 나오면 이름을 알 때까지 그 region에 보관했다가
+    region 객체가 닫힐 때(또는 finish()에서) 이름과 함께 반환한다.
+    """
+
+    def __init__(self):
+        self.text = ""
+        self._pos = 0
+        self._stack = []          # [{"type": "obj"|"arr", "key": 부모에서의 key, "start": idx, ...}]
+        self._in_string = False
+        self._escape = False
+        self._string_start = 0
+        self.region_names = []    # 등장 순서대로의 region 이름 (이벤트가 없는 region 포함)
+        self.disclaimer = None
+
+    def _top(self):
+        return self._stack[-1] if self._stack else None
+
+    def _is_region(self, frame):
+        # root{ regions[ region{
+        return (len(self._stack) >= 3 and frame is self._stack[2] and frame["type"] == "obj"
+                and self._stack[1]["key"] == "regions")
+
+    def _current_region(self):
+        return self._stack[2] if len(self._stack) >= 3 and self._is_region(self._stack[2]) else None
+
+    def _release(self, region):
+        """이름이 정해지기 전에 닫힌 이벤트들을 (이름, 원문)으로"""
+        held, region["held"] = region["held"], []
+        return [(region.get("name"), raw) for raw in held]
+
+    def finish(self):
+        """스트림이 끝났는데 닫히지 않은 region에 보관 중인 이벤트 반환"""
+        region = self._current_region()
+        return self._release(region) if region else []
+
+    def feed(self, chunk):
+        self.text += chunk
+        completed = []
+        text = self.text
+        while self._pos < len(text):
+            ch = text[self._pos]
+            top = self._top()
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    self._on_string(text[self._string_start:self._pos + 1])
+            elif top is None:
+                if ch == "{":   # 첫 '{' 전의 ```json 같은 잡음은 무시
+                    self._stack.append({"type": "obj", "key": None, "start": self._pos,
+                                        "expect_key": True, "pending_key": None})
+            elif ch == '"':
+                self._in_string = True
+                self._string_start = self._pos
+            elif ch in "{[":
+                key = top["pending_key"] if top["type"] == "obj" else top["key"]
+                self._stack.append({"type": "obj" if ch == "{" else "arr", "key": key, "start": self._pos,
+                                    "expect_key": ch == "{", "pending_key": None, "held": []})
+            elif ch in "}]":
+                if self._is_region(top):
+                    completed.extend(self._release(top))
+                frame = self._stack.pop()
+                parent = self._top()
+                if (frame["type"] == "obj" and parent is not None and parent["type"] == "arr"
+                        and parent["key"] == "events"):
+                    raw = text[frame["start"]:self._pos + 1]
+                    region = self._current_region()
+                    if region is not None and "name" not in region:
+                        region["held"].append(raw)
+                    else:
+                        completed.append((region.get("name") if region else None, raw))
+            elif top["type"] == "obj":
+                if ch == ":":
+                    top["expect_key"] = False
+                elif ch == ",":
+                    top["expect_key"] = True
+                    top["pending_key"] = None
+            self._pos += 1
+        return completed
+
+    def _on_string(self, raw):
+        top = self._top()
+        if top is None or top["type"] != "obj":
+            return
+        try:
+            value = json.loads(raw)
+        except ValueError:
+            return
+        if top["expect_key"]:
+            top["pending_key"] = value
+            return
+        if top["pending_key"] == "name" and self._is_region(top):
+            top["name"] = value
+            self.region_names.append(value)
+        elif top["pending_key"] == "disclaimer" and len(self._stack) == 1:
+            self.disclaimer = value
+
+
+def repair_event(client, raw, errors, model="gpt-4o"):
+    """깨진/스키마 위반 이벤트 하나만 수리 요청. 실패하면 None"""
+    request = {
+        "model": model,
+        "temperature": 0,
+        "messages": [{"role": "user", "content": REPAIR_PROMPT.format(
+            errors="; ".join(errors), raw=raw, categories="|".join(sorted(EVENT_CATEGORIES)))}],
+    }
+    try:
+        text = llm_cache.cached_chat_completion(client, **request).strip()
+        text = re.sub(r"^```(?:json)?\s*|\s*```$", "", text)
+        ev = json.loads(text)
+    except Exception as e:
+        print(f"⚠️ 이벤트 수리 실패: {e}")
+        return None
+    if validate_event(ev):
+        llm_cache.invalidate(request)
+        return None
+    return ev
+
+
+def _iter_stream(client, request):
+    # 스트림을 다 읽을 때까지 openai 동시 실행 자리를 차지. 마지막 청크에 usage를 받아 토큰 수 집계
+    with rate_limit.slot("openai"):
+        for chunk in client.chat.completions.create(stream=True, stream_options={"include_usage": True}, **request):
+            metrics.record_usage(getattr(chunk, "usage", None))
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+
+
+def generate_events(client, request, use_cache=True, cache_ttl=None, region=None, repair_workers=4):
+    """request를 스트리밍으로 보내 {"regions": [{"name", "events"}], "disclaimer"}를 만든다.
+
+    region: 요청한 지역이 하나일 때 그 이름. 스트림이 끊겨 region 이름 없이 남은 이벤트는
+    이 이름으로 넣고, region이 없으면 (어느 지역인지 알 수 없으므로) 버린다.
+    """
+    started = time.perf_counter()
+    parser = IncrementalEventParser()
+    cached = llm_cache.lookup(request) if use_cache else None
+    chunks = [cached] if cached is not None else _iter_stream(client, request)
+
+    def completed():
+        for chunk in chunks:
+            metrics.count("openai.stream_bytes", len(chunk.encode("utf-8")))
+            yield from parser.feed(chunk)
+        yield from parser.finish()
+
+    events_by_region = {}
+    broken = []  # (region, raw, errors)
+    unnamed = 0
+    first_at = None
+    for name, raw in completed():
+        if name is None and region is None:
+            unnamed += 1
+            continue
+        name = name or region
+        try:
+            ev = json.loads(raw)
+            errors = validate_event(ev)
+        except ValueError as e:
+            errors = [f"invalid JSON: {e}"]
+        if errors:
+            broken.append((name, raw, errors))
+            continue
+        events_by_region.setdefault(name, []).append(ev)
+        if first_at is None:
+            first_at = time.perf_counter() - started
+            print(f"🃏 첫 이벤트 수신: {first_at:.1f}s")
+    if unnamed:
+        print(f"⚠️ 지역 이름 없이 끊긴 이벤트 {unnamed}개 제외")
+
+    if broken:
+        print(f"🛠️ 스키마 위반 이벤트 {len(broken)}개만 수리 요청")
+        with ThreadPoolExecutor(max_workers=max(1, repair_workers)) as executor:
+            repaired = list(executor.map(lambda b: repair_event(client, b[1], b[2], request["model"]), broken))
+        for (name, _, _), ev in zip(broken, repaired):
+            if ev is not None:
+                events_by_region.setdefault(name, []).append(ev)
+
+    names = parser.region_names + [r for r in events_by_region if r not in parser.region_names]
+    data = {"regions": [{"name": name, "events": events_by_region.get(name, [])} for name in names]}
+    if parser.disclaimer:
+        data["disclaimer"] = parser.disclaimer
+
+    total = sum(len(r["events"]) for r in data["regions"])
+    print(f"📝 이벤트 {total}개 수신 ({time.perf_counter() - started:.1f}s)")
+    if use_cache and cached is None and total and not broken:
+        llm_cache.store(request, parser.text, ttl=cache_ttl)
+    return data
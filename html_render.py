@@ -0,0 +1,178 @@
+# html_render.py
+"""게시글 HTML 카드 렌더러 (유튜브 추천 / 주간 이벤트 공용).
+
+- 카드 스타일은 인라인 style 대신 클래스로 지정하고, 게시글마다 <style> 한 번만 넣음
+- 템플릿은 모듈 상수로 한 번만 만들어 두고 str.format으로 채움
+- 텍스트/속성 값은 모두 escape, href/src는 http(s) URL만 허용
+
+`python html_render.py [카드 수]` 로 기존 인라인 마크업과의 크기/속도 비교를 출력한다.
+"""
+import html
+import sys
+import time
+
+STYLESHEET = (
+    "<style>"
+    ".ytg-card{margin-bottom:20px;border:1px solid #e5e7eb;border-radius:10px;overflow:hidden;max-width:100%}"
+    ".ytg-card>a{text-decoration:none;color:inherit;display:block}"
+    ".ytg-card img{width:100%;display:block;margin:0 auto}"
+    ".ytg-body{padding:8px}"
+    ".ytg-event .ytg-body{padding:10px}"
+    ".ytg-note{color:#6b7280;font-size:12px;margin-top:12px}"
+    "@media (min-width:768px){.ytg-thumb{max-width:320px}}"
+    "@media (max-width:767px){.ytg-thumb{height:auto}}"
+    "</style>"
+)
+
+_VIDEO_CARD = (
+    "<div class='ytg-card'><a href='{url}' target='_blank'>"
+    "<img src='{thumb}' alt='{title}' class='ytg-thumb'/>"
+    "<div class='ytg-body'><strong>{idx}. {title}</strong><br>"
+    "<span>• 채널: {channel}</span><br>"
+    "<span>• 업로드: {published_at}</span></div></a></div>"
+)
+
+_EVENT_CARD = (
+    "<div class='ytg-card ytg-event'><a href='{url}' target='_blank'>{img}"
+    "<div class='ytg-body'><strong>{idx}. {title}</strong><br>"
+    "<span>• 일정: {start} ~ {end}</span><br>"
+    "<span>• 유형: {category}</span><br>"
+    "<span>• 장소: {venue}</span><br>"
+    "<span>• 주소: {address}</span></div></a></div>"
+)
+
+_EVENT_IMG = "<img src='{src}' alt='{alt}'/>"
+
+
+def esc(value):
+    """텍스트/속성 값 escape. YouTube API 제목처럼 이미 엔티티가 들어간 값도 이중 escape되지 않게 처리"""
+    if value is None:
+        return ""
+    value = str(value)
+    if "&" in value:
+        value = html.unescape(value)
+    return html.escape(value, quote=True)
+
+
+def safe_url(url):
+    """http(s) URL만 허용 (javascript: 등은 '#')"""
+    url = (url or "").strip()
+    if url.lower().startswith(("http://", "https://")):
+        return esc(url)
+    return "#"
+
+
+def youtube_thumbnail(video):
+    video_id = video.get("video_id")
+    if not video_id:
+        url = video["url"]
+        video_id = url.split("v=")[-1] if "v=" in url else url.split("/")[-1]
+    return f"https://img.youtube.com/vi/{video_id}/hqdefault.jpg"
+
+
+def render_video_card(idx, video):
+    return _VIDEO_CARD.format(
+        url=safe_url(video.get("url")),
+        thumb=safe_url(youtube_thumbnail(video)),
+        title=esc(video.get("title")),
+        idx=idx,
+        channel=esc(video.get("channel")),
+        published_at=esc(video.get("published_at")),
+    )
+
+
+def render_event_card(idx, ev):
+    img = ""
+    src = safe_url(ev.get("image"))
+    if src != "#":
+        img = _EVENT_IMG.format(src=src, alt=esc(ev.get("title")))
+    return _EVENT_CARD.format(
+        url=safe_url(ev.get("url")),
+        img=img,
+        idx=idx,
+        title=esc(ev.get("title")),
+        start=esc(ev.get("start")),
+        end=esc(ev.get("end")),
+        category=esc(ev.get("category")),
+        venue=esc(ev.get("venue")),
+        address=esc(ev.get("address")) or "-",
+    )
+
+
+# ---------- BENCHMARK ----------
+def _legacy_video_card(i, v):
+    # 이전 upload_youtube_recommend.py 마크업 (카드마다 <style> + 인라인 style)
+    thumbnail_url = youtube_thumbnail(v)
+    return (
+        f"<style>"
+        f"  @media (min-width: 768px) {{ .yt-thumb-{i} {{ max-width: 320px; }} }}"
+        f"  @media (max-width: 767px) {{ .yt-thumb-{i} {{ width: 100%; height: auto; }} }}"
+        f"</style>"
+        f"<div style='margin-bottom:20px;border:1px solid #e5e7eb;border-radius:10px;overflow:hidden;max-width:100%;'>"
+        f"  <a href='{v['url']}' target='_blank' style='text-decoration:none;color:inherit;display:block;'>"
+        f"    <img src='{thumbnail_url}' alt='{v['title']}' class='yt-thumb-{i}' "
+        f"         style='width:100%;display:block;margin:0 auto;'/>"
+        f"    <div style='padding:8px;'>"
+        f"      <strong>{i}. {v['title']}</strong><br>"
+        f"      <span>• 채널: {v['channel']}</span><br>"
+        f"      <span>• 업로드: {v['published_at']}</span>"
+        f"    </div>"
+        f"  </a>"
+        f"</div>"
+    )
+
+
+def _legacy_event_card(idx, ev):
+    # 이전 upload_la_oc_events.render_event_card 마크업
+    img_html = f"<img src='{ev['image']}' alt='{ev['title']}' style='width:100%;display:block;margin:0 auto;'/>"
+    return (
+        "<div style='margin-bottom:20px;border:1px solid #e5e7eb;border-radius:10px;overflow:hidden;max-width:100%;'>"
+        f"  <a href='{ev['url']}' target='_blank' style='text-decoration:none;color:inherit;display:block;'>"
+        f"    {img_html}"
+        f"    <div style='padding:10px;'>"
+        f"      <strong>{idx}. {ev['title']}</strong><br>"
+        f"      <span>• 일정: {ev['start']} ~ {ev['end']}</span><br>"
+        f"      <span>• 유형: {ev['category']}</span><br>"
+        f"      <span>• 장소: {ev['venue']}</span><br>"
+        f"      <span>• 주소: {ev['address'] or '-'}</span>"
+        f"    </div>"
+        f"  </a>"
+        "</div>"
+    )
+
+
+def benchmark(n=50, repeat=20):
+    videos = [{
+        "video_id": f"vid{i:08d}",
+        "url": f"https://youtu.be/vid{i:08d}",
+        "title": f"미국 주식 투자 전략 #{i} — It&#39;s <live>",
+        "channel": "테스트 채널",
+        "published_at": "2025-08-14T12:00:00Z",
+    } for i in range(1, n + 1)]
+    events = [{
+        "title": f"Laguna Beach Heisler Park trail #{i}",
+        "start": "2025-08-16 09:00", "end": "2025-08-16 12:00",
+        "venue": "Heisler Park", "address": "", "category": "outdoor",
+        "url": "https://www.lagunabeachcity.net/", "image": "https://example.com/a.jpg",
+    } for i in range(1, n + 1)]
+
+    cases = [
+        ("video", videos, _legacy_video_card, render_video_card),
+        ("event", events, _legacy_event_card, render_event_card),
+    ]
+    print(f"📏 카드 {n}개 렌더링 비교 (반복 {repeat}회)")
+    for name, items, legacy, current in cases:
+        results = {}
+        for label, fn, prefix in (("legacy", legacy, ""), ("current", current, STYLESHEET)):
+            started = time.perf_counter()
+            for _ in range(repeat):
+                out = prefix + "".join(fn(i, item) for i, item in enumerate(items, start=1))
+            elapsed = (time.perf_counter() - started) / repeat
+            results[label] = (len(out.encode("utf-8")), elapsed)
+        (old_bytes, old_t), (new_bytes, new_t) = results["legacy"], results["current"]
+        print(f"  {name}: {old_bytes:,}B → {new_bytes:,}B ({new_bytes / old_bytes:.0%}), "
+              f"{old_t * 1000:.2f}ms → {new_t * 1000:.2f}ms")
+
+
+if __name__ == "__main__":
+    benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 50)
@@ -0,0 +1,203 @@
+# http_client.py
+"""외부 HTTP API(YouTube Data API 등) 호출용 공유 클라이언트.
+
+- keep-alive 커넥션 풀을 쓰는 requests.Session 하나를 프로세스 전체에서 재사용
+- gzip 응답 요청, 연결/읽기 타임아웃
+- 5xx / 429 / 403 rate limit 응답에 대해 지터가 섞인 지수 백오프 재시도
+- 서비스별 공유 rate limiter(rate_limit)로 호출 속도/동시성 제한, 일일 쿼터 초과 시 이후 호출 차단
+- YouTube 호출은 보내기 전에 쿼터 장부(quota_ledger)에 비용을 기록, 하루 한도를 넘으면 보내지 않음
+- 호출 이름별 지연시간 통계, 받은 바이트/YouTube 쿼터 단위는 metrics 카운터로 집계
+"""
+import os
+import random
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+import metrics
+import quota_ledger
+import rate_limit
+
+# ---------- CONFIG ----------
+HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "5"))
+HTTP_READ_TIMEOUT = float(os.getenv("HTTP_READ_TIMEOUT", "20"))
+HTTP_MAX_RETRIES = int(os.getenv("HTTP_MAX_RETRIES", "4"))
+HTTP_BACKOFF_BASE = float(os.getenv("HTTP_BACKOFF_BASE", "0.5"))
+HTTP_BACKOFF_MAX = float(os.getenv("HTTP_BACKOFF_MAX", "8"))
+HTTP_POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", "16"))
+# 벤치마크에서 로컬 대역 서버(benchmarks/fake_services.py)로 바꿔 실행할 때 사용
+YOUTUBE_API_BASE = os.getenv("YOUTUBE_API_BASE", "https://www.googleapis.com/youtube/v3").rstrip("/")
+
+RETRY_STATUS = {429, 500, 502, 503, 504}
+# 403 중 잠시 후 재시도하면 풀리는 사유들. quotaExceeded(일일 한도)는 재시도해도 소용없으므로 제외
+RETRY_403_REASONS = {"rateLimitExceeded", "userRateLimitExceeded"}
+
+_session = None
+_session_lock = threading.Lock()
+_stats = {}
+_stats_lock = threading.Lock()
+
+
+class HttpError(requests.HTTPError):
+    """재시도 후에도 실패한 요청. reason에 API 오류 사유(quotaExceeded 등)를 담음"""
+
+    def __init__(self, message, response=None, reason=None):
+        super().__init__(message, response=response)
+        self.reason = reason
+
+
+def get_session():
+    """프로세스 공용 Session (커넥션 풀 재사용)"""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                session.headers.update({
+                    "Accept-Encoding": "gzip, deflate",
+                    "User-Agent": "ytgpt-upload (gzip)",
+                })
+                _session = session
+    return _session
+
+
+def _error_reason(response):
+    """Google API 오류 응답에서 reason 값 추출 (없으면 None)"""
+    try:
+        errors = response.json().get("error", {}).get("errors", [])
+        return errors[0].get("reason") if errors else None
+    except ValueError:
+        return None
+
+
+def _should_retry(response):
+    if response.status_code in RETRY_STATUS:
+        return True
+    if response.status_code == 403:
+        return _error_reason(response) in RETRY_403_REASONS
+    return False
+
+
+def _backoff_delay(attempt, retry_after=None):
+    if retry_after:
+        try:
+            return min(float(retry_after), HTTP_BACKOFF_MAX)
+        except ValueError:
+            pass
+    # full jitter: 0 ~ base * 2^attempt 사이 임의 값
+    return random.uniform(0, min(HTTP_BACKOFF_MAX, HTTP_BACKOFF_BASE * (2 ** attempt)))
+
+
+def _record(name, elapsed, ok, retries):
+    with _stats_lock:
+        s = _stats.setdefault(name, {"calls": 0, "errors": 0, "retries": 0, "latencies": []})
+        s["calls"] += 1
+        s["retries"] += retries
+        s["latencies"].append(elapsed)
+        if not ok:
+            s["errors"] += 1
+
+
+def request(method, url, params=None, json=None, headers=None, timeout=None, name=None):
+    """재시도/백오프가 적용된 HTTP 요청. 최종 실패 시 HttpError 발생"""
+    session = get_session()
+    timeout = timeout or (HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT)
+    name = name or url
+    service = name.split(".")[0]  # "youtube.search" → youtube
+    retries = 0
+    started = time.perf_counter()
+
+    while True:
+        try:
+            # 실패한 요청도 쿼터는 소모되므로 시도마다 기록
+            if quota_ledger.call_cost(name):
+                quota_ledger.get_ledger().charge(name)
+            with rate_limit.slot(service) as slot:
+                response = session.request(method, url, params=params, json=json,
+                                           headers=headers, timeout=timeout)
+                if response.status_code == 429 or (
+                        response.status_code == 403 and _error_reason(response) in RETRY_403_REASONS):
+                    slot.throttled()
+                elif not response.ok:
+                    slot.error()
+        except rate_limit.QuotaExhausted as e:
+            _record(name, time.perf_counter() - started, False, retries)
+            raise HttpError(f"{method} {name} skipped ({e.reason})", reason=e.reason) from e
+        except (requests.ConnectionError, requests.Timeout) as e:
+            if retries >= HTTP_MAX_RETRIES:
+                _record(name, time.perf_counter() - started, False, retries)
+                raise HttpError(f"{method} {name} failed after {retries} retries: {e}") from e
+            time.sleep(_backoff_delay(retries))
+            retries += 1
+            continue
+
+        # 실패한 요청도 YouTube 쿼터는 소모됨
+        metrics.record_quota(name)
+        metrics.count("http.bytes_in", len(response.content))
+        if response.ok:
+            _record(name, time.perf_counter() - started, True, retries)
+            return response
+
+        if _should_retry(response) and retries < HTTP_MAX_RETRIES:
+            time.sleep(_backoff_delay(retries, response.headers.get("Retry-After")))
+            retries += 1
+            continue
+
+        _record(name, time.perf_counter() - started, False, retries)
+        reason = _error_reason(response)
+        if reason in ("quotaExceeded", "dailyLimitExceeded") and rate_limit.get_limiter(service):
+            # 일일 한도는 기다려도 풀리지 않으므로 쿼터가 초기화될 때까지 호출을 보내지 않음
+            rate_limit.get_limiter(service).exhaust(reason, until=quota_ledger.next_reset())
+            quota_ledger.get_ledger().mark_exhausted()
+        raise HttpError(
+            f"{response.status_code} {method} {name}" + (f" ({reason})" if reason else ""),
+            response=response,
+            reason=reason,
+        )
+
+
+def get_json(url, params=None, timeout=None, name=None):
+    """GET 요청 후 JSON 본문 반환"""
+    return request("GET", url, params=params, timeout=timeout, name=name).json()
+
+
+def _percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    k = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[k]
+
+
+def get_stats():
+    """호출 이름별 통계 {name: {calls, errors, retries, avg_ms, p50_ms, p95_ms, max_ms}}"""
+    with _stats_lock:
+        snapshot = {name: dict(s, latencies=sorted(s["latencies"])) for name, s in _stats.items()}
+    report = {}
+    for name, s in snapshot.items():
+        lat = s["latencies"]
+        report[name] = {
+            "calls": s["calls"],
+            "errors": s["errors"],
+            "retries": s["retries"],
+            "avg_ms": round(sum(lat) / len(lat) * 1000, 1) if lat else 0.0,
+            "p50_ms": round(_percentile(lat, 50) * 1000, 1),
+            "p95_ms": round(_percentile(lat, 95) * 1000, 1),
+            "max_ms": round(lat[-1] * 1000, 1) if lat else 0.0,
+        }
+    return report
+
+
+def reset_stats():
+    with _stats_lock:
+        _stats.clear()
+
+
+def print_stats():
+    for name, s in get_stats().items():
+        print(f"🌐 {name}: {s['calls']}회 (오류 {s['errors']}, 재시도 {s['retries']}) "
+              f"avg {s['avg_ms']}ms / p95 {s['p95_ms']}ms")
@@ -0,0 +1,87 @@
+# llm_cache.py
+"""GPT 호출 결과 메모이제이션.
+
+모델, temperature, 기타 생성 파라미터, 정규화한 messages의 해시를 키로 응답 텍스트를
+디스크에 저장한다. 같은 입력으로 다시 실행하면(업로드 실패 후 재실행, 다른 게시판의 같은
+자막 등) LLM을 호출하지 않는다. 매번 다른 결과가 필요한 호출은 cache=False 로 끈다.
+"""
+import hashlib
+import json
+import os
+import re
+
+import metrics
+import rate_limit
+from disk_cache import DiskCache
+
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE", "1") == "1"
+LLM_CACHE_TTL = int(os.getenv("LLM_CACHE_TTL", str(30 * 24 * 3600)))
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "1000"))
+
+_cache = None
+
+
+def get_cache():
+    global _cache
+    if _cache is None:
+        _cache = DiskCache("llm_responses", ttl=LLM_CACHE_TTL, max_entries=LLM_CACHE_MAX_ENTRIES)
+    return _cache
+
+
+def _normalize_content(content):
+    if isinstance(content, str):
+        # 줄 끝 공백/연속 빈 줄 차이는 같은 프롬프트로 취급
+        return re.sub(r"[ \t]+\n", "\n", content).strip()
+    return content
+
+
+def request_key(request):
+    """chat.completions.create 인자 → 캐시 키"""
+    messages = [
+        {"role": m.get("role"), "content": _normalize_content(m.get("content"))}
+        for m in request.get("messages", [])
+    ]
+    params = {k: v for k, v in request.items() if k not in ("messages", "stream")}
+    digest = hashlib.sha256(
+        json.dumps({"params": params, "messages": messages}, sort_keys=True, ensure_ascii=False).encode("utf-8")
+    ).hexdigest()
+    return f"{request.get('model')}:{request.get('temperature')}:{digest}"
+
+
+def lookup(request):
+    if not LLM_CACHE_ENABLED:
+        return None
+    return get_cache().get(request_key(request))
+
+
+def store(request, text, ttl=None):
+    if LLM_CACHE_ENABLED and text:
+        get_cache().set(request_key(request), text, ttl=ttl)
+
+
+def invalidate(request):
+    """잘못된 응답(파싱 실패 등)이 재사용되지 않도록 삭제"""
+    get_cache().delete(request_key(request))
+
+
+def cached_chat_completion(client, cache=True, ttl=None, **request):
+    """client.chat.completions.create(**request)의 응답 텍스트. cache=False면 항상 새로 호출"""
+    if cache:
+        text = lookup(request)
+        if text is not None:
+            return text
+
+    with metrics.span("openai.chat"), rate_limit.slot("openai"):
+        response = client.chat.completions.create(**request)
+    metrics.record_usage(getattr(response, "usage", None))
+    text = response.choices[0].message.content
+    if cache:
+        store(request, text, ttl=ttl)
+    return text
+
+
+def print_stats():
+    if _cache is None:
+        return
+    s = _cache.stats()
+    print(f"🗄️ LLM 캐시: hit {s['hits']} / miss {s['misses']} (저장 {s['entries']}개)")
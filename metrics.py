@@ -0,0 +1,168 @@
+# metrics.py
+"""실행 단위 계측: 단계별 소요 시간(span)과 비용 카운터.
+
+- span(name): with 블록의 소요 시간을 단계 이름별로 누적 (스레드 안전, 병렬 단계는 합산)
+- count(name, n): YouTube 쿼터 단위, OpenAI 토큰, 내려받은/보낸 바이트 등 누적 카운터
+- write_report(run): 실행이 끝나면 JSON 리포트를 RUN_REPORT_DIR에 저장 (실행 간 회귀 추적용)
+- print_summary(): 단계별 표와 카운터를 출력
+"""
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from functools import wraps
+
+import rate_limit
+
+# CACHE_DIR 밖에 둠 (CI가 CACHE_DIR을 actions/cache로 이어 쓰므로, 안에 두면 리포트가 계속 쌓임)
+RUN_REPORT_DIR = os.getenv("RUN_REPORT_DIR", "reports")
+# YouTube Data API 호출별 쿼터 비용 (http_client의 호출 이름 기준)
+YOUTUBE_QUOTA_COST = {"youtube.search": 100, "youtube.videos": 1}
+
+_spans = {}
+_counters = {}
+_lock = threading.Lock()
+_started_at = datetime.now(timezone.utc)
+_started = time.perf_counter()
+
+
+def _record_span(name, elapsed, ok):
+    with _lock:
+        s = _spans.setdefault(name, {"count": 0, "errors": 0, "durations": []})
+        s["count"] += 1
+        s["durations"].append(elapsed)
+        if not ok:
+            s["errors"] += 1
+
+
+@contextmanager
+def span(name):
+    """with metrics.span("transcribe"): ... 블록의 소요 시간 기록 (예외가 나면 errors로 집계)"""
+    started = time.perf_counter()
+    ok = False
+    try:
+        yield
+        ok = True
+    finally:
+        _record_span(name, time.perf_counter() - started, ok)
+
+
+def timed(name):
+    """함수 전체를 span으로 감싸는 데코레이터"""
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def count(name, value=1):
+    if not value:
+        return
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + value
+
+
+def record_usage(usage, prefix="openai"):
+    """OpenAI 응답의 usage(객체 또는 dict)에서 토큰 수 집계"""
+    if usage is None:
+        return
+    for field in ("prompt_tokens", "completion_tokens"):
+        value = usage.get(field) if isinstance(usage, dict) else getattr(usage, field, None)
+        count(f"{prefix}.{field}", value or 0)
+
+
+def record_quota(name):
+    cost = YOUTUBE_QUOTA_COST.get(name)
+    if cost:
+        count("youtube.quota_units", cost)
+
+
+def _percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    k = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[k]
+
+
+def report(run=None):
+    """{"run", "started_at", "wall_s", "spans": {name: {...}}, "counters", "http", "limits", "quota"}"""
+    # http_client/quota_ledger가 이 모듈을 쓰므로 순환 import를 피해 지연 import
+    import http_client
+    import quota_ledger
+
+    with _lock:
+        spans = {name: dict(s, durations=sorted(s["durations"])) for name, s in _spans.items()}
+        counters = dict(_counters)
+    stages = {}
+    for name, s in spans.items():
+        d = s["durations"]
+        stages[name] = {
+            "count": s["count"],
+            "errors": s["errors"],
+            "total_s": round(sum(d), 3),
+            "avg_ms": round(sum(d) / len(d) * 1000, 1) if d else 0.0,
+            "p50_ms": round(_percentile(d, 50) * 1000, 1),
+            "p95_ms": round(_percentile(d, 95) * 1000, 1),
+            "max_ms": round(d[-1] * 1000, 1) if d else 0.0,
+        }
+    return {
+        "run": run,
+        "started_at": _started_at.isoformat(),
+        "wall_s": round(time.perf_counter() - _started, 3),
+        "spans": stages,
+        "counters": counters,
+        "http": http_client.get_stats(),
+        "limits": rate_limit.get_stats(),
+        "quota": quota_ledger.get_stats(),
+    }
+
+
+def write_report(run, path=None):
+    """JSON 리포트 저장 후 경로 반환 (기본: RUN_REPORT_DIR/<run>-<UTC 시각>.json)"""
+    data = report(run)
+    if path is None:
+        stamp = _started_at.strftime("%Y%m%dT%H%M%SZ")
+        path = os.path.join(RUN_REPORT_DIR, f"{run}-{stamp}.json")
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    return path
+
+
+def print_summary(run=None):
+    import quota_ledger  # quota_ledger가 이 모듈을 쓰므로 지연 import
+
+    data = report(run)
+    print(f"\n⏱️ 단계별 소요 시간 (전체 {data['wall_s']:.1f}s)")
+    print(f"  {'stage':<22}{'count':>6}{'err':>5}{'total_s':>10}{'avg_ms':>10}{'p95_ms':>10}")
+    for name, s in sorted(data["spans"].items(), key=lambda kv: -kv[1]["total_s"]):
+        print(f"  {name:<22}{s['count']:>6}{s['errors']:>5}{s['total_s']:>10.2f}"
+              f"{s['avg_ms']:>10.1f}{s['p95_ms']:>10.1f}")
+    for name, value in sorted(data["counters"].items()):
+        print(f"  • {name}: {value:,}")
+    rate_limit.print_stats()
+    quota_ledger.print_stats()
+
+
+def reset():
+    """span/카운터와 시작 시각 초기화 (한 프로세스에서 여러 작업을 돌릴 때 작업마다 호출)"""
+    global _started_at, _started
+    with _lock:
+        _spans.clear()
+        _counters.clear()
+        _started_at = datetime.now(timezone.utc)
+        _started = time.perf_counter()
+
+
+def finish(run):
+    """실행 끝에 표 출력 + JSON 리포트 저장"""
+    print_summary(run)
+    try:
+        print(f"🧾 실행 리포트: {write_report(run)}")
+    except OSError as e:
+        print(f"⚠️ 실행 리포트 저장 실패: {e}")
@@ -0,0 +1,183 @@
+# quota_ledger.py
+"""YouTube Data API 일일 쿼터 장부 + 실행 계획.
+
+http_client가 YouTube 요청을 보내기 직전에 charge()로 비용(search 100, videos 1 unit)을
+기록하고, 하루 한도를 넘는 요청은 보내지 않고 바로 실패시킨다. 사용량은 SQLite에 쿼터일
+단위로 저장되므로 두 워크플로(유튜브 요약/추천)와 스케줄러 데몬이 같은 장부를 본다.
+
+쿼터일은 YouTube 쿼터가 초기화되는 태평양 시간 자정 기준 날짜다.
+스크립트는 실행 전에 plan()으로 남은 쿼터로 몇 번 검색할 수 있는지 정하고,
+모자라면 캐시된 검색 결과가 있는 주제만 처리한다.
+"""
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+import metrics
+import rate_limit
+from disk_cache import CACHE_DIR
+
+YOUTUBE_DAILY_QUOTA = int(os.getenv("YOUTUBE_DAILY_QUOTA", "10000"))
+# plan()이 남겨 둘 여유분 (수동 실행, 재시도 등). charge()는 YOUTUBE_DAILY_QUOTA까지 허용
+YOUTUBE_QUOTA_RESERVE = int(os.getenv("YOUTUBE_QUOTA_RESERVE", "300"))
+QUOTA_RESET_TZ_NAME = "America/Los_Angeles"
+# tz 데이터베이스가 없을 때(tzdata 패키지 없는 Windows 등) 쓰는 고정 오프셋 (서머타임 동안은 1시간 어긋남)
+_PST = timezone(timedelta(hours=-8), "PST")
+_reset_tz = None
+
+
+def quota_reset_tz():
+    """쿼터 초기화 기준 시간대. import 시점이 아니라 처음 쓸 때 찾음"""
+    global _reset_tz
+    if _reset_tz is None:
+        try:
+            _reset_tz = ZoneInfo(QUOTA_RESET_TZ_NAME)
+        except ZoneInfoNotFoundError:
+            print(f"⚠️ 시간대 {QUOTA_RESET_TZ_NAME}를 찾을 수 없어 UTC-8로 계산합니다 (pip install tzdata)")
+            _reset_tz = _PST
+    return _reset_tz
+
+
+def quota_day(now=None):
+    """쿼터일 (태평양 시간 날짜, YYYY-MM-DD)"""
+    return datetime.fromtimestamp(time.time() if now is None else now, quota_reset_tz()).date().isoformat()
+
+
+def next_reset():
+    """일일 쿼터가 초기화되는 다음 태평양 시간 자정 (epoch 초)"""
+    now = datetime.now(quota_reset_tz())
+    midnight = (now + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
+    return midnight.timestamp()
+
+
+def call_cost(name):
+    """호출 이름("youtube.search")의 쿼터 비용. YouTube 호출이 아니면 0"""
+    return metrics.YOUTUBE_QUOTA_COST.get(name, 0)
+
+
+class QuotaLedger:
+    def __init__(self, name="youtube_quota", directory=None,
+                 daily_quota=YOUTUBE_DAILY_QUOTA, reserve=YOUTUBE_QUOTA_RESERVE):
+        directory = directory or CACHE_DIR
+        os.makedirs(directory, exist_ok=True)
+        self.path = os.path.join(directory, f"{name}.sqlite3")
+        self.daily_quota = daily_quota
+        self.reserve = reserve
+        self.charged = 0   # 이 프로세스에서 기록한 단위
+        self._lock = threading.Lock()
+        # 다른 프로세스와 함께 쓰므로 트랜잭션은 직접 관리 (BEGIN IMMEDIATE로 확인+기록을 원자적으로)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30, isolation_level=None)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS usage ("
+            " day TEXT NOT NULL,"
+            " name TEXT NOT NULL,"
+            " calls INTEGER NOT NULL DEFAULT 0,"
+            " units INTEGER NOT NULL DEFAULT 0,"
+            " PRIMARY KEY (day, name))"
+        )
+
+    def _used(self, day):
+        row = self._conn.execute("SELECT COALESCE(SUM(units), 0) FROM usage WHERE day = ?", (day,)).fetchone()
+        return row[0]
+
+    def _add(self, day, name, units):
+        self._conn.execute(
+            "INSERT INTO usage (day, name, calls, units) VALUES (?, ?, 1, ?)"
+            " ON CONFLICT (day, name) DO UPDATE SET calls = calls + 1, units = units + excluded.units",
+            (day, name, units),
+        )
+
+    def used(self, day=None):
+        with self._lock:
+            return self._used(day or quota_day())
+
+    def remaining(self):
+        """plan()이 쓸 수 있는 남은 단위 (여유분 제외)"""
+        return max(0, self.daily_quota - self.reserve - self.used())
+
+    def charge(self, name):
+        """요청을 보내기 전에 비용 기록. 한도를 넘으면 기록하지 않고 QuotaExhausted 발생"""
+        cost = call_cost(name)
+        if not cost:
+            return 0
+        day = quota_day()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                if self._used(day) + cost > self.daily_quota:
+                    raise rate_limit.QuotaExhausted("youtube", "quotaBudgetExceeded")
+                self._add(day, name, cost)
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self.charged += cost
+        return cost
+
+    def mark_exhausted(self):
+        """API가 quotaExceeded를 반환함 → 장부가 실제보다 적게 잡혀 있으므로 오늘 사용량을 한도로 맞춤"""
+        day = quota_day()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                missing = self.daily_quota - self._used(day)
+                if missing > 0:
+                    self._add(day, "adjustment", missing)
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def plan(self, cost_each, wanted, fixed=0):
+        """비용 cost_each인 호출을 wanted번 원할 때, fixed 단위를 먼저 떼고 남은 쿼터로 할 수 있는 횟수"""
+        if cost_each <= 0:
+            return wanted
+        return max(0, min(wanted, (self.remaining() - fixed) // cost_each))
+
+    def usage(self, day=None):
+        """{name: {"calls", "units"}}"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT name, calls, units FROM usage WHERE day = ?", (day or quota_day(),)
+            ).fetchall()
+        return {name: {"calls": calls, "units": units} for name, calls, units in rows}
+
+    def stats(self):
+        day = quota_day()
+        used = self.used(day)
+        return {
+            "day": day,
+            "daily_quota": self.daily_quota,
+            "used": used,
+            "remaining": max(0, self.daily_quota - used),
+            "charged_this_process": self.charged,
+            "by_call": self.usage(day),
+        }
+
+
+_ledger = None
+_ledger_lock = threading.Lock()
+
+
+def get_ledger():
+    global _ledger
+    if _ledger is None:
+        with _ledger_lock:
+            if _ledger is None:
+                _ledger = QuotaLedger()
+    return _ledger
+
+
+def get_stats():
+    """장부를 쓴 적이 없으면 {} (YouTube를 쓰지 않는 작업에서 파일을 만들지 않도록)"""
+    return _ledger.stats() if _ledger is not None else {}
+
+
+def print_stats():
+    s = get_stats()
+    if s:
+        print(f"📉 YouTube 쿼터 ({s['day']} PT): {s['used']:,}/{s['daily_quota']:,} 사용, "
+              f"남은 {s['remaining']:,} (이 프로세스 {s['charged_this_process']:,})")
@@ -0,0 +1,199 @@
+# rate_limit.py
+"""외부 API(서비스)별 공유 rate limiter + 적응형 동시성 제어.
+
+- 토큰 버킷: 초당 RATE_PER_SEC개, 최대 BURST개까지 몰아서 허용
+- 동시 실행 수는 AIMD로 조절: 429/rate limit 응답이면 절반으로 줄이고,
+  성공할 때마다 조금씩(한 번에 1/limit) 늘려 MAX_CONCURRENCY까지 회복
+- YouTube quotaExceeded처럼 기다려도 풀리지 않는 한도는 exhaust()로 막아 이후 호출을 즉시 실패시킴
+
+서비스 설정은 환경변수 <SERVICE>_RATE_PER_SEC / <SERVICE>_BURST / <SERVICE>_MAX_CONCURRENCY 로 바꾼다.
+
+    with rate_limit.slot("openai"):
+        client.chat.completions.create(...)
+"""
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+
+# 서비스 → (초당 요청 수, 버스트, 최대 동시 실행 수)
+DEFAULT_LIMITS = {
+    "youtube": (10.0, 10, 8),
+    "openai": (5.0, 10, 8),
+    "supabase": (10.0, 20, 4),
+}
+MIN_CONCURRENCY = 1
+DECREASE_FACTOR = 0.5
+# 동시에 나간 요청들이 한꺼번에 429를 받아도 한 번만 줄이도록
+DECREASE_COOLDOWN = 1.0
+
+
+class QuotaExhausted(Exception):
+    """exhaust()된 서비스를 호출하려 할 때"""
+
+    def __init__(self, service, reason):
+        super().__init__(f"{service}: {reason}")
+        self.service = service
+        self.reason = reason
+
+
+def is_throttle_error(e):
+    """SDK 예외가 429/rate limit 응답인지 (openai.RateLimitError, postgrest APIError 등)"""
+    status = getattr(e, "status_code", None) or getattr(getattr(e, "response", None), "status_code", None)
+    if status == 429 or str(getattr(e, "code", "")) == "429":
+        return True
+    return "rate limit" in str(e).lower()
+
+
+class ServiceLimiter:
+    def __init__(self, service, rate, burst, max_concurrency):
+        self.service = service
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.max_concurrency = max(MIN_CONCURRENCY, max_concurrency)
+        self._limit = float(self.max_concurrency)
+        self._tokens = float(self.burst)
+        self._refilled_at = time.monotonic()
+        self._in_flight = 0
+        self._last_decrease = 0.0
+        self._exhausted = None
+        self._exhausted_until = None
+        self._cond = threading.Condition()
+        self._waits = []
+        self._counts = {"ok": 0, "throttled": 0, "error": 0}
+
+    @property
+    def concurrency_limit(self):
+        return int(self._limit)
+
+    def _refill(self, now):
+        if self.rate > 0:
+            self._tokens = min(self.burst, self._tokens + (now - self._refilled_at) * self.rate)
+        self._refilled_at = now
+
+    def acquire(self):
+        """동시 실행 자리와 토큰이 생길 때까지 대기. 기다린 시간(초) 반환"""
+        started = time.monotonic()
+        with self._cond:
+            while True:
+                if self._exhausted and self._exhausted_until and time.time() >= self._exhausted_until:
+                    self._exhausted = self._exhausted_until = None
+                if self._exhausted:
+                    raise QuotaExhausted(self.service, self._exhausted)
+                timeout = None
+                if self._in_flight < int(self._limit):
+                    now = time.monotonic()
+                    self._refill(now)
+                    if self.rate <= 0 or self._tokens >= 1:
+                        if self.rate > 0:
+                            self._tokens -= 1
+                        self._in_flight += 1
+                        break
+                    timeout = (1 - self._tokens) / self.rate
+                self._cond.wait(timeout)
+            waited = time.monotonic() - started
+            self._waits.append(waited)
+        return waited
+
+    def release(self, outcome="ok"):
+        """outcome: ok(성공 → 동시성 증가) | throttled(→ 절반으로) | error(변화 없음)"""
+        with self._cond:
+            self._in_flight -= 1
+            self._counts[outcome] += 1
+            if outcome == "ok":
+                self._limit = min(self.max_concurrency, self._limit + 1 / self._limit)
+            elif outcome == "throttled":
+                now = time.monotonic()
+                if now - self._last_decrease >= DECREASE_COOLDOWN:
+                    self._limit = max(MIN_CONCURRENCY, self._limit * DECREASE_FACTOR)
+                    self._tokens = 0.0  # 버킷을 비워 잠시 숨 고르기
+                    self._refilled_at = now
+                    self._last_decrease = now
+            self._cond.notify_all()
+
+    def exhaust(self, reason, until=None):
+        """until(epoch 초)까지 호출하지 않도록 막음 (일일 쿼터 초과 등). None이면 프로세스가 끝날 때까지"""
+        with self._cond:
+            self._exhausted = reason
+            self._exhausted_until = until
+            self._cond.notify_all()
+
+    @contextmanager
+    def slot(self):
+        """with limiter.slot() as s: ... 블록 동안 자리를 차지. 응답이 throttling이면 s.throttled() 호출"""
+        self.acquire()
+        outcome = _Outcome()
+        try:
+            yield outcome
+        except Exception as e:
+            outcome.value = "throttled" if is_throttle_error(e) else "error"
+            raise
+        finally:
+            self.release(outcome.value)
+
+    def stats(self):
+        with self._cond:
+            waits = sorted(self._waits)
+            stats = {
+                "rate_per_sec": self.rate,
+                "burst": self.burst,
+                "concurrency_limit": int(self._limit),
+                "max_concurrency": self.max_concurrency,
+                "in_flight": self._in_flight,
+                "exhausted": self._exhausted,
+                "waits": len(waits),
+                "wait_total_s": round(sum(waits), 3),
+                "wait_p95_ms": round(waits[min(len(waits) - 1, int(0.95 * len(waits)))] * 1000, 1) if waits else 0.0,
+            }
+            stats.update(self._counts)
+        return stats
+
+
+class _Outcome:
+    def __init__(self):
+        self.value = "ok"
+
+    def throttled(self):
+        self.value = "throttled"
+
+    def error(self):
+        self.value = "error"
+
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+
+def get_limiter(service):
+    """서비스별 공유 limiter. 설정에 없는 서비스는 None"""
+    limiter = _limiters.get(service)
+    if limiter is None and service in DEFAULT_LIMITS:
+        with _limiters_lock:
+            limiter = _limiters.get(service)
+            if limiter is None:
+                rate, burst, concurrency = DEFAULT_LIMITS[service]
+                prefix = service.upper()
+                limiter = ServiceLimiter(
+                    service,
+                    rate=float(os.getenv(f"{prefix}_RATE_PER_SEC", str(rate))),
+                    burst=int(os.getenv(f"{prefix}_BURST", str(burst))),
+                    max_concurrency=int(os.getenv(f"{prefix}_MAX_CONCURRENCY", str(concurrency))),
+                )
+                _limiters[service] = limiter
+    return limiter
+
+
+def slot(service):
+    limiter = get_limiter(service)
+    return limiter.slot() if limiter else nullcontext(_Outcome())
+
+
+def get_stats():
+    return {service: limiter.stats() for service, limiter in _limiters.items()}
+
+
+def print_stats():
+    for service, s in get_stats().items():
+        print(f"🚦 {service}: 동시성 {s['concurrency_limit']}/{s['max_concurrency']}, "
+              f"대기 {s['waits']}회 총 {s['wait_total_s']}s (p95 {s['wait_p95_ms']}ms), "
+              f"throttled {s['throttled']}" + (f", 차단: {s['exhausted']}" if s["exhausted"] else ""))
@@ -0,0 +1,80 @@
+# response_cache.py
+"""YouTube Data API 응답 캐시.
+
+같은 엔드포인트 + 같은 파라미터(API 키 제외, 정렬/정규화)로 다시 요청하면
+디스크에 저장된 응답을 돌려주므로 쿼터와 네트워크 시간이 들지 않는다.
+YT_CACHE_BYPASS=1 이면 캐시를 읽지 않고 항상 새로 요청한다 (응답은 갱신 저장).
+"""
+import hashlib
+import json
+import os
+
+import http_client
+from disk_cache import DiskCache
+
+# 엔드포인트별 TTL(초). search는 최신순 결과라 짧게, videos 상세는 잘 안 바뀌므로 길게
+YT_CACHE_TTL = {
+    "search": int(os.getenv("YT_CACHE_TTL_SEARCH", str(3 * 24 * 3600))),
+    "videos": int(os.getenv("YT_CACHE_TTL_VIDEOS", str(7 * 24 * 3600))),
+}
+YT_CACHE_DEFAULT_TTL = int(os.getenv("YT_CACHE_TTL", str(24 * 3600)))
+YT_CACHE_MAX_ENTRIES = int(os.getenv("YT_CACHE_MAX_ENTRIES", "2000"))
+YT_CACHE_BYPASS = os.getenv("YT_CACHE_BYPASS", "0") == "1"
+
+# 캐시 키에서 제외할 파라미터 (응답 내용과 무관)
+_IGNORED_PARAMS = {"key"}
+
+_cache = None
+
+
+def get_cache():
+    global _cache
+    if _cache is None:
+        _cache = DiskCache("youtube_responses", max_entries=YT_CACHE_MAX_ENTRIES)
+    return _cache
+
+
+def _normalize(value):
+    if isinstance(value, (list, tuple)):
+        return ",".join(str(v).strip() for v in value)
+    return str(value).strip()
+
+
+def cache_key(url, params):
+    """엔드포인트 + 정규화된 파라미터로 만든 캐시 키"""
+    endpoint = url.rstrip("/").rsplit("/", 1)[-1]
+    normalized = sorted(
+        (k, _normalize(v)) for k, v in (params or {}).items() if k not in _IGNORED_PARAMS
+    )
+    digest = hashlib.sha256(json.dumps(normalized, ensure_ascii=False).encode("utf-8")).hexdigest()
+    return f"{endpoint}:{digest}"
+
+
+def is_cached(url, params=None, bypass=None):
+    """cached_get_json이 요청 없이(쿼터 소모 없이) 캐시로 응답할 수 있는지"""
+    bypass = YT_CACHE_BYPASS if bypass is None else bypass
+    return not bypass and get_cache().contains(cache_key(url, params))
+
+
+def cached_get_json(url, params=None, name=None, ttl=None, bypass=None):
+    """캐시를 거쳐 GET JSON 응답 반환"""
+    bypass = YT_CACHE_BYPASS if bypass is None else bypass
+    cache = get_cache()
+    key = cache_key(url, params)
+    endpoint = key.split(":", 1)[0]
+
+    if not bypass:
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+
+    data = http_client.get_json(url, params=params, name=name)
+    cache.set(key, data, ttl=ttl or YT_CACHE_TTL.get(endpoint, YT_CACHE_DEFAULT_TTL))
+    return data
+
+
+def print_stats():
+    if _cache is None:
+        return
+    s = _cache.stats()
+    print(f"🗄️ YouTube 응답 캐시: hit {s['hits']} / miss {s['misses']} (저장 {s['entries']}개)")
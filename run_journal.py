@@ -0,0 +1,140 @@
+# run_journal.py
+"""youtube_search 실행 단위 단계 저널 (체크포인트/재개).
+
+실행마다 선택한 주제 목록을 저장하고, 주제별로 끝난 단계의 결과(search: 후보 영상,
+video: 선택한 영상, transcript, summary, post: 게시 상태)를 단계가 끝나는 즉시 SQLite에
+기록한다. --resume 으로 다시 실행하면 같은 주제로 이어서, 주제마다 처음 끝나지 않은
+단계부터 수행한다. Whisper/GPT가 잠깐 실패해도 다시 드는 비용은 실패한 단계뿐이다.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+
+from disk_cache import CACHE_DIR
+
+# 이 상태로 끝난 주제는 재개할 때 다시 처리하지 않음
+DONE_STATUSES = {"posted", "already_posted", "no_videos"}
+
+
+def topic_key(topic):
+    return f"{topic['board_type']}:{topic['keyword']}"
+
+
+class RunJournal:
+    def __init__(self, name="run_journal", directory=None):
+        directory = directory or CACHE_DIR
+        os.makedirs(directory, exist_ok=True)
+        self.path = os.path.join(directory, f"{name}.sqlite3")
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS runs ("
+            " run_id TEXT PRIMARY KEY,"
+            " topics TEXT NOT NULL,"
+            " status TEXT NOT NULL DEFAULT 'running',"
+            " started_at REAL NOT NULL,"
+            " finished_at REAL)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS stages ("
+            " run_id TEXT NOT NULL,"
+            " topic TEXT NOT NULL,"
+            " stage TEXT NOT NULL,"
+            " output TEXT NOT NULL,"
+            " updated_at REAL NOT NULL,"
+            " PRIMARY KEY (run_id, topic, stage))"
+        )
+        self._conn.commit()
+
+    def start(self, topics):
+        """새 실행을 만들고 Run 반환"""
+        run_id = time.strftime("%Y%m%dT%H%M%S") + "-" + uuid.uuid4().hex[:6]
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO runs (run_id, topics, started_at) VALUES (?, ?, ?)",
+                (run_id, json.dumps(topics, ensure_ascii=False), time.time()),
+            )
+            self._conn.commit()
+        return Run(self, run_id, topics)
+
+    def resume(self, run_id=None):
+        """run_id(없으면 가장 최근의 끝나지 않은 실행)의 Run. 없으면 None"""
+        with self._lock:
+            if run_id:
+                row = self._conn.execute("SELECT run_id, topics FROM runs WHERE run_id = ?", (run_id,)).fetchone()
+            else:
+                row = self._conn.execute(
+                    "SELECT run_id, topics FROM runs WHERE status != 'completed' ORDER BY started_at DESC LIMIT 1"
+                ).fetchone()
+        return Run(self, row[0], json.loads(row[1])) if row else None
+
+    def get(self, run_id, topic, stage):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT output FROM stages WHERE run_id = ? AND topic = ? AND stage = ?", (run_id, topic, stage)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def record(self, run_id, topic, stage, output):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO stages (run_id, topic, stage, output, updated_at) VALUES (?, ?, ?, ?, ?)",
+                (run_id, topic, stage, json.dumps(output, ensure_ascii=False), time.time()),
+            )
+            self._conn.commit()
+
+    def finish(self, run_id, status):
+        with self._lock:
+            self._conn.execute(
+                "UPDATE runs SET status = ?, finished_at = ? WHERE run_id = ?", (status, time.time(), run_id)
+            )
+            self._conn.commit()
+
+
+class Run:
+    """한 실행의 저널. run.get(topic, "transcript") / run.record(topic, "transcript", text)"""
+
+    def __init__(self, journal, run_id, topics):
+        self.journal = journal
+        self.run_id = run_id
+        self.topics = topics
+
+    def get(self, topic, stage):
+        return self.journal.get(self.run_id, topic_key(topic), stage)
+
+    def record(self, topic, stage, output):
+        self.journal.record(self.run_id, topic_key(topic), stage, output)
+
+    def finish(self, results):
+        """주제별 결과로 실행 상태 기록. 모든 주제가 끝났으면 completed, 아니면 incomplete"""
+        done = all(r["status"] in DONE_STATUSES for r in results)
+        self.journal.finish(self.run_id, "completed" if done else "incomplete")
+        return done
+
+
+class _NullRun:
+    """저널 없이 호출할 때 쓰는 대역 (아무것도 기록/복원하지 않음)"""
+    run_id = None
+
+    def get(self, topic, stage):
+        return None
+
+    def record(self, topic, stage, output):
+        pass
+
+
+NULL_RUN = _NullRun()
+
+
+_journal = None
+
+
+def get_journal():
+    global _journal
+    if _journal is None:
+        _journal = RunJournal()
+    return _journal
+
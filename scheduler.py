@@ -0,0 +1,138 @@
+# scheduler.py
+"""세 작업(유튜브 요약, 유튜브 추천, 주간 이벤트)을 한 프로세스에서 실행하는 스케줄러.
+
+    python scheduler.py                       # 데몬: 스케줄대로 계속 실행
+    python scheduler.py --once youtube_recommend   # 한 번만 실행 후 종료 (CI/cron)
+    python scheduler.py --once all
+    python scheduler.py --list
+
+데몬으로 띄우면 작업마다 Python을 새로 시작하지 않으므로 모듈 import, HTTP 커넥션 풀,
+OpenAI/Supabase 클라이언트, 디스크 캐시/중복 인덱스 같은 싱글톤이 작업 사이에 그대로 유지된다.
+스케줄은 UTC 기준이며 JOB_SCHEDULE_<작업 이름> 환경변수로 바꿀 수 있다.
+  예) JOB_SCHEDULE_YOUTUBE_SEARCH="daily 15:00", JOB_SCHEDULE_WEEKEND_EVENTS="thu 02:00", "off"
+"""
+import argparse
+import importlib
+import os
+import signal
+import sys
+import threading
+import time
+import traceback
+from datetime import datetime, timedelta, timezone
+
+import http_client
+import metrics
+
+WEEKDAYS = ["mon", "tue", "wed", "thu", "fri", "sat", "sun"]
+
+# 작업 이름 → (모듈, 기본 스케줄). 기본값은 GitHub Actions cron과 같음.
+# youtube_search는 cron으로 돌린 적이 없어 기본 off (켜면 하루 약 1,200 쿼터 unit + Whisper/GPT 비용)
+JOBS = {
+    "youtube_recommend": ("upload_youtube_recommend", "daily 14:00"),
+    "youtube_search": ("youtube_search", "off"),
+    "weekend_events": ("upload_la_oc_events", "thu 02:00"),
+}
+
+_stop = threading.Event()
+
+
+def parse_schedule(spec):
+    """"daily HH:MM" | "<요일> HH:MM" | "off" → (weekday 또는 None, hour, minute). off면 None"""
+    spec = (spec or "").strip().lower()
+    if spec in ("", "off", "none"):
+        return None
+    day, _, at = spec.partition(" ")
+    if day != "daily" and day not in WEEKDAYS:
+        raise ValueError(f"잘못된 스케줄: {spec!r}")
+    hour, minute = (int(x) for x in at.split(":"))
+    return (None if day == "daily" else WEEKDAYS.index(day)), hour, minute
+
+
+def job_schedule(name):
+    return parse_schedule(os.getenv(f"JOB_SCHEDULE_{name.upper()}", JOBS[name][1]))
+
+
+def next_run(schedule, after):
+    """after 이후 첫 실행 시각 (UTC)"""
+    weekday, hour, minute = schedule
+    candidate = after.replace(hour=hour, minute=minute, second=0, microsecond=0)
+    if candidate <= after:
+        candidate += timedelta(days=1)
+    if weekday is not None:
+        candidate += timedelta(days=(weekday - candidate.weekday()) % 7)
+    return candidate
+
+
+def run_job(name, argv=None):
+    """작업 하나 실행. 예외가 나도 스케줄러는 계속 돌도록 종료 코드로 반환"""
+    module_name = JOBS[name][0]
+    metrics.reset()
+    http_client.reset_stats()
+    print(f"\n🚀 [{name}] 시작 ({datetime.now(timezone.utc):%Y-%m-%d %H:%M} UTC)")
+    started = time.perf_counter()
+    try:
+        code = importlib.import_module(module_name).main(argv or []) or 0
+    except SystemExit as e:
+        code = e.code if isinstance(e.code, int) else 1
+    except Exception:
+        traceback.print_exc()
+        code = 1
+    print(f"🏁 [{name}] 종료 코드 {code} ({time.perf_counter() - started:.1f}s)")
+    return code
+
+
+def run_forever():
+    schedules = {name: job_schedule(name) for name in JOBS}
+    now = datetime.now(timezone.utc)
+    pending = {name: next_run(s, now) for name, s in schedules.items() if s is not None}
+    if not pending:
+        print("❗ 예약된 작업이 없습니다.")
+        return 0
+    for name, at in sorted(pending.items(), key=lambda kv: kv[1]):
+        print(f"🗓️ {name}: 다음 실행 {at:%Y-%m-%d %H:%M} UTC")
+
+    while not _stop.is_set():
+        name, at = min(pending.items(), key=lambda kv: kv[1])
+        wait = (at - datetime.now(timezone.utc)).total_seconds()
+        if wait > 0:
+            # 시계 변경/절전에 대비해 최대 1분씩 나눠 대기
+            _stop.wait(min(wait, 60))
+            continue
+        run_job(name)
+        pending[name] = next_run(schedules[name], datetime.now(timezone.utc))
+        print(f"🗓️ {name}: 다음 실행 {pending[name]:%Y-%m-%d %H:%M} UTC")
+    print("👋 스케줄러 종료")
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="작업 스케줄러 (데몬 / 1회 실행)")
+    parser.add_argument("--once", nargs="+", metavar="JOB",
+                        help=f"지정한 작업만 한 번 실행하고 종료 ({', '.join(JOBS)}, all)")
+    parser.add_argument("--list", action="store_true", help="작업과 다음 실행 시각 출력")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        now = datetime.now(timezone.utc)
+        for name, (module_name, _) in JOBS.items():
+            schedule = job_schedule(name)
+            at = f"{next_run(schedule, now):%Y-%m-%d %H:%M} UTC" if schedule else "off"
+            print(f"{name:<20}{module_name:<28}{at}")
+        return 0
+
+    if args.once:
+        names = list(JOBS) if "all" in args.once else args.once
+        unknown = [n for n in names if n not in JOBS]
+        if unknown:
+            parser.error(f"알 수 없는 작업: {', '.join(unknown)}")
+        codes = [run_job(name) for name in names]
+        return max(codes)
+
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(sig, lambda *_: _stop.set())
+    return run_forever()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
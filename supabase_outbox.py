@@ -0,0 +1,203 @@
+# supabase_outbox.py
+"""Supabase 게시글 쓰기용 로컬 outbox.
+
+게시글은 먼저 로컬 SQLite 저널에 idempotency key와 함께 쌓이고, flush() 때 컬럼 구성이
+같은 행끼리 bulk insert/upsert로 전송된다. 전송에 실패한 행은 pending 상태로 남아 다음
+실행의 flush()에서 다시 전송된다. 같은 key는 한 번만 저장되고, 보내기 전에 시도 횟수를
+먼저 올려 두므로 요청 도중 프로세스가 죽어도 다음 실행에서 재전송 행으로 취급된다.
+
+posts 테이블에 unique 컬럼이 있으면 SUPABASE_IDEMPOTENCY_COLUMN 으로 지정하면
+key를 함께 저장하고 on_conflict upsert로 원격에서도 중복을 막는다. 지정하지 않으면
+재전송하는 행에 한해, outbox에 들어간 이후 올라온 같은 (board_type, title)의 게시글 중
+본문까지 같은 것이 있는지 확인 후 전송한다.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+
+import clients
+import metrics
+import rate_limit
+from disk_cache import CACHE_DIR
+
+SUPABASE_IDEMPOTENCY_COLUMN = os.getenv("SUPABASE_IDEMPOTENCY_COLUMN", "")
+
+
+def idempotency_key(row):
+    """행 내용 기반 기본 key (board_type + title + content 해시)"""
+    raw = json.dumps(
+        [row.get("board_type"), row.get("title"), row.get("content")], ensure_ascii=False
+    ).encode("utf-8")
+    return "sha256:" + hashlib.sha256(raw).hexdigest()
+
+
+class Outbox:
+    def __init__(self, name="outbox", directory=None):
+        directory = directory or CACHE_DIR
+        os.makedirs(directory, exist_ok=True)
+        self.path = os.path.join(directory, f"{name}.sqlite3")
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS outbox ("
+            " key TEXT PRIMARY KEY,"
+            " tbl TEXT NOT NULL,"
+            " payload TEXT NOT NULL,"
+            " status TEXT NOT NULL DEFAULT 'pending',"
+            " attempts INTEGER NOT NULL DEFAULT 0,"
+            " last_error TEXT,"
+            " created_at REAL NOT NULL,"
+            " sent_at REAL)"
+        )
+        self._conn.commit()
+
+    def enqueue(self, row, key=None, table="posts"):
+        """행을 outbox에 추가하고 key 반환. 이미 있는 key(전송 완료 포함)는 무시"""
+        key = key or idempotency_key(row)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR IGNORE INTO outbox (key, tbl, payload, created_at) VALUES (?, ?, ?, ?)",
+                (key, table, json.dumps(row, ensure_ascii=False), time.time()),
+            )
+            self._conn.commit()
+        return key
+
+    def status(self, key):
+        with self._lock:
+            row = self._conn.execute("SELECT status FROM outbox WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def pending(self, table="posts"):
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT key, payload, attempts, created_at FROM outbox"
+                " WHERE status = 'pending' AND tbl = ? ORDER BY created_at",
+                (table,),
+            ).fetchall()
+        return [(key, json.loads(payload), attempts, created_at) for key, payload, attempts, created_at in rows]
+
+    def _begin(self, keys):
+        """전송 직전에 시도 횟수를 올려 둠 (요청 중 크래시해도 다음 flush에서 중복 확인 대상이 되도록)"""
+        with self._lock:
+            self._conn.executemany("UPDATE outbox SET attempts = attempts + 1 WHERE key = ?", [(k,) for k in keys])
+            self._conn.commit()
+
+    def _mark(self, keys, status, error=None):
+        with self._lock:
+            self._conn.executemany(
+                "UPDATE outbox SET status = ?, last_error = ?, sent_at = ? WHERE key = ?",
+                [(status, error, time.time() if status == "sent" else None, key) for key in keys],
+            )
+            self._conn.commit()
+
+    def _already_posted(self, supabase, table, rows):
+        """재전송 행 중 이미 원격에 있는 것의 key 집합.
+        outbox에 들어간 이후 생성된 게시글 중 board_type/title/content가 모두 같은 것만 인정"""
+        titles = list({row["title"] for _, row, _, _ in rows})
+        if not titles:
+            return set()
+        since = datetime.fromtimestamp(min(created for _, _, _, created in rows), timezone.utc).isoformat()
+        with rate_limit.slot("supabase"):
+            response = supabase.table(table).select("title,board_type,content") \
+                .in_("title", titles).gte("created_at", since).execute()
+        existing = {idempotency_key(r) for r in response.data}
+        return {key for key, row, _, _ in rows if idempotency_key(row) in existing}
+
+    def _send(self, supabase, table, keys, rows):
+        """컬럼 구성이 같은 행들을 한 번의 요청으로 전송 (실패 시 예외)"""
+        query = supabase.table(table)
+        if SUPABASE_IDEMPOTENCY_COLUMN:
+            query = query.upsert(rows, on_conflict=SUPABASE_IDEMPOTENCY_COLUMN, ignore_duplicates=True)
+        else:
+            query = query.insert(rows)
+        with metrics.span("supabase.insert"), rate_limit.slot("supabase"):
+            query.execute()
+        metrics.count("supabase.rows_sent", len(rows))
+        metrics.count("supabase.bytes_sent", len(json.dumps(rows, ensure_ascii=False).encode("utf-8")))
+        self._mark(keys, "sent")
+
+    def flush(self, supabase, table="posts"):
+        """pending 행을 컬럼 구성별 bulk 요청으로 전송. {key: 성공 여부} 반환
+
+        스크립트마다 행의 컬럼이 다르므로(format 유무 등) 섞어 보내면 PostgREST가 빠진 컬럼을
+        NULL로 채운다. 그래서 컬럼 구성이 같은 행끼리 묶고, 묶음이 실패하면 행 단위로 다시
+        보내 문제 있는 행만 pending으로 남긴다."""
+        pending = self.pending(table)
+        if not pending:
+            return {}
+
+        results = {}
+        if not SUPABASE_IDEMPOTENCY_COLUMN:
+            retried = [p for p in pending if p[2] > 0]  # 이전에 보내려고 시도한 행 (크래시 포함)
+            try:
+                done = self._already_posted(supabase, table, retried)
+            except Exception as e:
+                print("⚠️ 재전송 중복 확인 실패:", e)
+                done = set()
+            if done:
+                self._mark(done, "sent")
+                results.update({key: True for key in done})
+                pending = [p for p in pending if p[0] not in done]
+        if not pending:
+            return results
+
+        groups = {}
+        for key, row, _, _ in pending:
+            if SUPABASE_IDEMPOTENCY_COLUMN:
+                row = dict(row, **{SUPABASE_IDEMPOTENCY_COLUMN: key})
+            groups.setdefault(tuple(sorted(row)), []).append((key, row))
+
+        self._begin([key for key, _, _, _ in pending])
+        for group in groups.values():
+            keys = [key for key, _ in group]
+            try:
+                self._send(supabase, table, keys, [row for _, row in group])
+                results.update({key: True for key in keys})
+                continue
+            except Exception as e:
+                error = e
+                if len(group) == 1:
+                    self._mark(keys, "pending", str(e))
+                    results[keys[0]] = False
+                    continue
+                print(f"⚠️ 일괄 업로드 실패 ({len(keys)}건), 한 건씩 재시도:", e)
+            for key, row in group:
+                try:
+                    self._send(supabase, table, [key], [row])
+                    results[key] = True
+                except Exception as e:
+                    error = e
+                    self._mark([key], "pending", str(e))
+                    results[key] = False
+
+        sent = sum(1 for ok in results.values() if ok)
+        if sent:
+            print(f"✅ 게시글 업로드 성공! ({sent}건)")
+        if sent < len(results):
+            print(f"❌ 업로드 실패 ({len(results) - sent}건, 다음 실행 때 재전송):", error)
+        return results
+
+
+_outbox = None
+
+
+def get_outbox():
+    global _outbox
+    if _outbox is None:
+        _outbox = Outbox()
+    return _outbox
+
+
+def post_now(row, table="posts"):
+    """outbox에 넣은 뒤 바로 전송 (이전 실행에서 실패한 게시글도 함께 재전송). 성공하면 key, 실패하면 None"""
+    outbox = get_outbox()
+    key = outbox.enqueue(row, table=table)
+    if outbox.status(key) == "sent":
+        print("⏭️ 이미 업로드된 게시글입니다.")
+        return key
+    sent = outbox.flush(clients.get_supabase(), table=table)
+    return key if sent.get(key) else None
@@ -1,217 +1,89 @@
 # topic_selector.py
+import os
+import json
+import math
 import random
 import datetime
 from collections import defaultdict
 
-TOPIC_MAP = {
-    0: [  # 월요일
-{"board_type": "business", "keyword": "실리콘밸리 스타트업 성공사례"},
-{"board_type": "business", "keyword": "미국 온라인 마켓플레이스 진출 전략"},
-{"board_type": "education", "keyword": "미국 대학원 장학금 받는 방법"},
-{"board_type": "education", "keyword": "SAT vs ACT 시험 특징 비교"},
-{"board_type": "freetalk", "keyword": "미국에서 인기있는 반려동물 문화"},
-{"board_type": "freetalk", "keyword": "미국의 독특한 휴일 문화"},
-{"board_type": "immigrantlife", "keyword": "시민권 시험 합격 노하우"},
-{"board_type": "immigrantlife", "keyword": "미국 교외 거주의 장단점"},
-{"board_type": "investment", "keyword": "배당주 투자 전략 가이드"},
-{"board_type": "investment", "keyword": "미국 부동산 투자 트렌드"},
-{"board_type": "jobs", "keyword": "테크 기업 취업 성공 사례"},
-{"board_type": "jobs", "keyword": "미국 스타트업 취업 전략"},
-{"board_type": "legalhelp", "keyword": "영주권 신청 과정 설명"},
-{"board_type": "legalhelp", "keyword": "미국 교통법규 위반시 대처방법"},
-{"board_type": "lifeinfo", "keyword": "미국 신용점수 관리 방법"},
-{"board_type": "lifeinfo", "keyword": "미국 의료보험 선택 가이드"},
-{"board_type": "lifestyle", "keyword": "미국의 인기 브런치 문화"},
-{"board_type": "lifestyle", "keyword": "미국 국립공원 여행 팁"},
-{"board_type": "seoul", "keyword": "서울의 힙한 동네 투어"},
-{"board_type": "seoul", "keyword": "서울 야경 명소 추천"},
-{"board_type": "stock_study", "keyword": "S&P 500 분석 방법"},
-{"board_type": "stock_study", "keyword": "테크주 투자 전략"},
-{"board_type": "korea_realestate", "keyword": "신도시 개발 계획 분석"},
-{"board_type": "korea_realestate", "keyword": "부동산 청약 성공 전략"}         
-    ],
-    1: [  # 화요일
-{"board_type": "business", "keyword": "미국 소상공인 성공 스토리"},
-{"board_type": "business", "keyword": "아마존 FBA vs 이베이 비즈니스"},
-{"board_type": "education", "keyword": "미국 대학 장학금 종류와 신청방법"},
-{"board_type": "education", "keyword": "미국 고등학교 AP 과목 선택 전략"},
-{"board_type": "freetalk", "keyword": "미국에서 인기있는 주말 액티비티"},
-{"board_type": "freetalk", "keyword": "미국의 특이한 식문화 경험담"},
-{"board_type": "immigrantlife", "keyword": "시민권 취득 과정 체험기"},
-{"board_type": "immigrantlife", "keyword": "미국 중소도시 정착 이야기"},
-{"board_type": "investment", "keyword": "미국 채권 투자 전략"},
-{"board_type": "investment", "keyword": "인플레이션에 강한 투자 포트폴리오"},
-{"board_type": "jobs", "keyword": "미국 IT 업계 이직 성공담"},
-{"board_type": "jobs", "keyword": "미국 프리랜서 일자리 찾기"},
-{"board_type": "legalhelp", "keyword": "그린카드 신청 과정 설명"},
-{"board_type": "legalhelp", "keyword": "미국 세금 신고 가이드"},
-{"board_type": "lifeinfo", "keyword": "미국 자동차 구매 팁"},
-{"board_type": "lifeinfo", "keyword": "미국 신용카드 현명하게 쓰기"},
-{"board_type": "lifestyle", "keyword": "미국식 파티 문화 이해하기"},
-{"board_type": "lifestyle", "keyword": "미국 로드트립 계획 세우기"},
-{"board_type": "seoul", "keyword": "서울 루프탑 바 추천"},
-{"board_type": "seoul", "keyword": "서울 한강 피크닉 명소"},
-{"board_type": "stock_study", "keyword": "나스닥 투자 전략"},
-{"board_type": "stock_study", "keyword": "배당주 분석 방법론"},
-{"board_type": "korea_realestate", "keyword": "재건축 아파트 투자 전략"},
-{"board_type": "korea_realestate", "keyword": "상가건물 투자 노하우"}
-    ],
-    2: [  # 수요일
-{"board_type": "business", "keyword": "미국 창업자 인터뷰 모음"},
-{"board_type": "business", "keyword": "글로벌 셀링을 위한 플랫폼 비교"},
-{"board_type": "education", "keyword": "커뮤니티 칼리지와 4년제 대학 비교"},
-{"board_type": "education", "keyword": "미국 교육제도 이해하기"},
-{"board_type": "freetalk", "keyword": "요즘 빠진 취미 활동"},
-{"board_type": "freetalk", "keyword": "미국 생활 중 느낀 사소한 차이들"},
-{"board_type": "immigrantlife", "keyword": "영주권 인터뷰 후기"},
-{"board_type": "immigrantlife", "keyword": "한인타운 장단점"},
-{"board_type": "investment", "keyword": "장기 투자에 적합한 미국 ETF"},
-{"board_type": "investment", "keyword": "글로벌 경제지표 해석 방법"},
-{"board_type": "jobs", "keyword": "미국 내 경력 전환 스토리"},
-{"board_type": "jobs", "keyword": "원격근무 가능한 미국 직업들"},
-{"board_type": "legalhelp", "keyword": "H1B 비자 전환 시 주의사항"},
-{"board_type": "legalhelp", "keyword": "이민 서류 준비 팁"},
-{"board_type": "lifeinfo", "keyword": "미국 생활비 절약 노하우"},
-{"board_type": "lifeinfo", "keyword": "처음 가입할 미국 은행 추천"},
-{"board_type": "lifestyle", "keyword": "미국 홈데코 트렌드 소개"},
-{"board_type": "lifestyle", "keyword": "자연과 함께하는 미국 캠핑 여행"},
-{"board_type": "seoul", "keyword": "서울의 디저트 카페 추천"},
-{"board_type": "seoul", "keyword": "서울 지하철 타고 떠나는 하루 여행"},
-{"board_type": "stock_study", "keyword": "미국 주식 용어 기초 정리"},
-{"board_type": "stock_study", "keyword": "초보 투자자를 위한 리스크 관리 팁"},
-{"board_type": "korea_realestate", "keyword": "서울과 수도권 집값 비교"},
-{"board_type": "korea_realestate", "keyword": "전세 vs 월세, 어떤 게 유리할까?"}
-    ],
-    3: [  # 목요일
-{"board_type": "business", "keyword": "미국 창업자 인터뷰 모음"},
-{"board_type": "business", "keyword": "글로벌 셀링을 위한 플랫폼 비교"},
-{"board_type": "education", "keyword": "커뮤니티 칼리지와 4년제 대학 비교"},
-{"board_type": "education", "keyword": "미국 교육제도 이해하기"},
-{"board_type": "freetalk", "keyword": "요즘 빠진 취미 활동"},
-{"board_type": "freetalk", "keyword": "미국 생활 중 느낀 사소한 차이들"},
-{"board_type": "immigrantlife", "keyword": "영주권 인터뷰 후기"},
-{"board_type": "immigrantlife", "keyword": "한인타운 장단점"},
-{"board_type": "investment", "keyword": "장기 투자에 적합한 미국 ETF"},
-{"board_type": "investment", "keyword": "글로벌 경제지표 해석 방법"},
-{"board_type": "jobs", "keyword": "미국 내 경력 전환 스토리"},
-{"board_type": "jobs", "keyword": "원격근무 가능한 미국 직업들"},
-{"board_type": "legalhelp", "keyword": "H1B 비자 전환 시 주의사항"},
-{"board_type": "legalhelp", "keyword": "이민 서류 준비 팁"},
-{"board_type": "lifeinfo", "keyword": "미국 생활비 절약 노하우"},
-{"board_type": "lifeinfo", "keyword": "처음 가입할 미국 은행 추천"},
-{"board_type": "lifestyle", "keyword": "미국 홈데코 트렌드 소개"},
-{"board_type": "lifestyle", "keyword": "자연과 함께하는 미국 캠핑 여행"},
-{"board_type": "seoul", "keyword": "서울의 디저트 카페 추천"},
-{"board_type": "seoul", "keyword": "서울 지하철 타고 떠나는 하루 여행"},
-{"board_type": "stock_study", "keyword": "미국 주식 용어 기초 정리"},
-{"board_type": "stock_study", "keyword": "초보 투자자를 위한 리스크 관리 팁"},
-{"board_type": "korea_realestate", "keyword": "서울과 수도권 집값 비교"},
-{"board_type": "korea_realestate", "keyword": "전세 vs 월세, 어떤 게 유리할까?"}
-    ],
-    4: [  # 금요일
-{"board_type": "business", "keyword": "미국 스타트업 창업자 인터뷰"},
-{"board_type": "business", "keyword": "글로벌 셀링 플랫폼 추천 및 비교"},
-{"board_type": "education", "keyword": "커뮤니티 칼리지 vs 4년제 대학 장단점"},
-{"board_type": "education", "keyword": "미국 교육제도 쉽게 설명해주는 영상"},
-{"board_type": "freetalk", "keyword": "요즘 빠져있는 취미 브이로그"},
-{"board_type": "freetalk", "keyword": "미국 생활 문화 차이 브이로그"},
-{"board_type": "immigrantlife", "keyword": "영주권 인터뷰 실제 후기"},
-{"board_type": "immigrantlife", "keyword": "한인타운 거주 후기 및 장단점"},
-{"board_type": "investment", "keyword": "미국 ETF 추천 및 분석"},
-{"board_type": "investment", "keyword": "글로벌 경제지표 해석 강의"},
-{"board_type": "jobs", "keyword": "미국 직장인 커리어 전환 스토리"},
-{"board_type": "jobs", "keyword": "원격근무 가능한 미국 직업 TOP 10"},
-{"board_type": "legalhelp", "keyword": "H1B 비자 전환 시 유의사항"},
-{"board_type": "legalhelp", "keyword": "미국 이민 서류 준비 방법"},
-{"board_type": "lifeinfo", "keyword": "미국 생활비 아끼는 꿀팁 모음"},
-{"board_type": "lifeinfo", "keyword": "미국 은행 계좌 처음 만들기 가이드"},
-{"board_type": "lifestyle", "keyword": "미국 홈데코 인테리어 트렌드"},
-{"board_type": "lifestyle", "keyword": "미국 캠핑 명소 및 준비물 소개"},
-{"board_type": "seoul", "keyword": "서울 디저트 카페 추천 영상"},
-{"board_type": "seoul", "keyword": "서울 지하철 여행 브이로그"},
-{"board_type": "stock_study", "keyword": "미국 주식 투자 용어 쉽게 설명"},
-{"board_type": "stock_study", "keyword": "초보 투자자를 위한 리스크 관리법"},
-{"board_type": "korea_realestate", "keyword": "서울 vs 수도권 집값 비교 분석"},
-{"board_type": "korea_realestate", "keyword": "전세와 월세 비교 및 추천 영상"}
-    ],
-    5: [  # 토요일
-{"board_type": "business", "keyword": "미국 스타트업 투자 트렌드"},
-{"board_type": "business", "keyword": "실리콘밸리 대표 기업 성장 전략"},
-{"board_type": "education", "keyword": "미국 명문대 입학 준비 가이드"},
-{"board_type": "education", "keyword": "온라인 강의 활용법과 추천 사이트"},
-{"board_type": "freetalk", "keyword": "최애 미국 드라마 추천"},
-{"board_type": "freetalk", "keyword": "미국에서 겪은 황당했던 일화"},
-{"board_type": "immigrantlife", "keyword": "미국 운전면허 취득 경험담"},
-{"board_type": "immigrantlife", "keyword": "현지에서 만난 다양한 국적의 친구들"},
-{"board_type": "investment", "keyword": "배당주 투자로 얻은 수익 사례"},
-{"board_type": "investment", "keyword": "미국 부동산 투자 시 유의사항"},
-{"board_type": "jobs", "keyword": "미국 취업 인터뷰 합격 꿀팁"},
-{"board_type": "jobs", "keyword": "이직 후 연봉 협상 경험 공유"},
-{"board_type": "legalhelp", "keyword": "미국 운전 중 경찰 대처 방법"},
-{"board_type": "legalhelp", "keyword": "영주권 신청 시 필요한 추가 서류"},
-{"board_type": "lifeinfo", "keyword": "미국에서 저렴하게 자동차 구입하기"},
-{"board_type": "lifeinfo", "keyword": "미국 마트별 장보기 꿀팁"},
-{"board_type": "lifestyle", "keyword": "미국 미니멀 라이프 실천기"},
-{"board_type": "lifestyle", "keyword": "미국에서 직접 키운 허브 이야기"},
-{"board_type": "seoul", "keyword": "서울의 야경 명소 베스트"},
-{"board_type": "seoul", "keyword": "서울 도심 속 힐링 산책로"},
-{"board_type": "stock_study", "keyword": "미국 주식 배당락일 이해하기"},
-{"board_type": "stock_study", "keyword": "테크주 실적 발표 분석 포인트"},
-{"board_type": "korea_realestate", "keyword": "신축 아파트 청약 전략"},
-{"board_type": "korea_realestate", "keyword": "부동산 세금 절세 방법"}
-    ],
-    6: [  # 일요일
-{"board_type": "business", "keyword": "미국 창업자 인터뷰 모음"},
-{"board_type": "business", "keyword": "글로벌 셀링을 위한 플랫폼 비교"},
-{"board_type": "education", "keyword": "커뮤니티 칼리지와 4년제 대학 비교"},
-{"board_type": "education", "keyword": "미국 교육제도 이해하기"},
-{"board_type": "freetalk", "keyword": "요즘 빠진 취미 활동"},
-{"board_type": "freetalk", "keyword": "미국 생활 중 느낀 사소한 차이들"},
-{"board_type": "immigrantlife", "keyword": "영주권 인터뷰 후기"},
-{"board_type": "immigrantlife", "keyword": "한인타운 장단점"},
-{"board_type": "investment", "keyword": "장기 투자에 적합한 미국 ETF"},
-{"board_type": "investment", "keyword": "글로벌 경제지표 해석 방법"},
-{"board_type": "jobs", "keyword": "미국 내 경력 전환 스토리"},
-{"board_type": "jobs", "keyword": "원격근무 가능한 미국 직업들"},
-{"board_type": "legalhelp", "keyword": "H1B 비자 전환 시 주의사항"},
-{"board_type": "legalhelp", "keyword": "이민 서류 준비 팁"},
-{"board_type": "lifeinfo", "keyword": "미국 생활비 절약 노하우"},
-{"board_type": "lifeinfo", "keyword": "처음 가입할 미국 은행 추천"},
-{"board_type": "lifestyle", "keyword": "미국 홈데코 트렌드 소개"},
-{"board_type": "lifestyle", "keyword": "자연과 함께하는 미국 캠핑 여행"},
-{"board_type": "seoul", "keyword": "서울의 디저트 카페 추천"},
-{"board_type": "seoul", "keyword": "서울 지하철 타고 떠나는 하루 여행"},
-{"board_type": "stock_study", "keyword": "미국 주식 용어 기초 정리"},
-{"board_type": "stock_study", "keyword": "초보 투자자를 위한 리스크 관리 팁"},
-{"board_type": "korea_realestate", "keyword": "서울과 수도권 집값 비교"},
-{"board_type": "korea_realestate", "keyword": "전세 vs 월세, 어떤 게 유리할까?"}
-    ],
-}
-
-def get_random_topics():
-    today = datetime.datetime.today().weekday()
-    today_topics = TOPIC_MAP.get(today, [])
-
-    if not today_topics:
-        return []
-
-    # 게시판(board_type)별로 묶기
-    grouped = defaultdict(list)
-    for topic in today_topics:
-        grouped[topic['board_type']].append(topic)
-
-    # 각 게시판에서 하나씩 랜덤 선택
-    selected = [random.choice(topics) for topics in grouped.values()]
+# 요일(0=월 ~ 6=일)별 주제 목록. 코드 수정 없이 바꿀 수 있도록 JSON 파일에서 읽음
+TOPICS_FILE = os.getenv("TOPICS_FILE", os.path.join(os.path.dirname(os.path.abspath(__file__)), "topics.json"))
+# 최근에 쓴 주제일수록 덜 뽑히도록: 마지막 사용 후 이 기간(일)이 지나면 가중치가 절반 회복
+RECENCY_HALF_LIFE_DAYS = float(os.getenv("RECENCY_HALF_LIFE_DAYS", "14"))
+
+
+def load_topic_map(path=TOPICS_FILE):
+    with open(path, encoding="utf-8") as f:
+        raw = json.load(f)
+    return {int(weekday): topics for weekday, topics in raw.items()}
+
+
+TOPIC_MAP = load_topic_map()
+
+# 요일별 / 요일+게시판별 인덱스 (import 시 한 번만 구성)
+_BY_WEEKDAY = {weekday: tuple(topics) for weekday, topics in TOPIC_MAP.items()}
+_BY_BOARD = {}
+for _weekday, _topics in TOPIC_MAP.items():
+    _grouped = defaultdict(list)
+    for _topic in _topics:
+        _grouped[_topic["board_type"]].append(_topic)
+    _BY_BOARD[_weekday] = {board: tuple(items) for board, items in _grouped.items()}
+
+
+def _today():
+    return datetime.datetime.today().weekday()
+
+
+def _recency_weight(last_used, now):
+    """마지막 사용 시각 → 가중치 (0~1). 한 번도 안 쓴 주제는 1"""
+    if last_used is None:
+        return 1.0
+    if isinstance(last_used, str):
+        last_used = datetime.datetime.fromisoformat(last_used.replace("Z", "+00:00"))
+    if last_used.tzinfo is None:
+        last_used = last_used.replace(tzinfo=datetime.timezone.utc)
+    age_days = max(0.0, (now - last_used).total_seconds() / 86400)
+    return 1.0 - math.pow(0.5, age_days / RECENCY_HALF_LIFE_DAYS)
+
+
+def sample_topic(weekday=None, board_type=None, exclude=(), recency=None, rng=random):
+    """오늘(또는 weekday) 주제 중 하나를 한 번에 뽑음.
+
+    exclude: 제외할 keyword 집합 (최근 게시 주제 등)
+    recency: {keyword: 마지막 사용 시각(datetime 또는 ISO 문자열)} — 최근에 쓴 주제일수록 덜 뽑힘
+    후보가 하나도 남지 않으면 None
+    """
+    weekday = _today() if weekday is None else weekday
+    if board_type is None:
+        candidates = _BY_WEEKDAY.get(weekday, ())
+    else:
+        candidates = _BY_BOARD.get(weekday, {}).get(board_type, ())
+    candidates = [t for t in candidates if t["keyword"] not in exclude]
+    if not candidates:
+        return None
+    if not recency:
+        return rng.choice(candidates)
+
+    now = datetime.datetime.now(datetime.timezone.utc)
+    weights = [_recency_weight(recency.get(t["keyword"]), now) for t in candidates]
+    if not any(weights):
+        return rng.choice(candidates)
+    return rng.choices(candidates, weights=weights, k=1)[0]
+
+
+def get_random_topics(exclude=(), recency=None):
+    """게시판(board_type)마다 하나씩 랜덤 선택"""
+    weekday = _today()
+    selected = []
+    for board_type in _BY_BOARD.get(weekday, {}):
+        topic = sample_topic(weekday, board_type, exclude=exclude, recency=recency)
+        if topic is not None:
+            selected.append(topic)
     return selected
 
-def get_random_topic():
-    today = datetime.datetime.today().weekday()
-    today_topics = TOPIC_MAP.get(today, [])
 
-    if not today_topics:
+def get_random_topic(exclude=(), recency=None):
+    topic = sample_topic(exclude=exclude, recency=recency)  # 오늘 주제 중 하나만 선택
+    if topic is None:
         return None  # 없으면 None 반환
-
-    topic = random.choice(today_topics)  # 오늘 주제 중 하나만 선택
-    if isinstance(topic, dict) and "keyword" in topic:
-        return topic["keyword"]  # keyword만 반환
-    return topic  # dict가 아니면 그대로 반환
\ No newline at end of file
+    return topic["keyword"]  # keyword만 반환
@@ -0,0 +1,84 @@
+# transcript_cache.py
+"""Whisper 전사 결과 캐시.
+
+1차 키: video_id + 구간(초) → 다운로드와 Whisper 호출을 모두 건너뜀
+2차 키: 오디오 내용의 SHA-256 → 다운로드는 했지만 같은 오디오면 Whisper 호출만 건너뜀
+"""
+import hashlib
+import os
+import threading
+
+from disk_cache import DiskCache
+
+TRANSCRIPT_CACHE_TTL = int(os.getenv("TRANSCRIPT_CACHE_TTL", str(30 * 24 * 3600)))
+TRANSCRIPT_CACHE_MAX_ENTRIES = int(os.getenv("TRANSCRIPT_CACHE_MAX_ENTRIES", "500"))
+
+
+def audio_hash(audio):
+    """파일 경로 또는 bytes → SHA-256 hex"""
+    digest = hashlib.sha256()
+    if isinstance(audio, (bytes, bytearray, memoryview)):
+        digest.update(audio)
+    else:
+        with open(audio, "rb") as f:
+            for block in iter(lambda: f.read(1 << 16), b""):
+                digest.update(block)
+    return digest.hexdigest()
+
+
+class TranscriptCache:
+    def __init__(self, ttl=TRANSCRIPT_CACHE_TTL, max_entries=TRANSCRIPT_CACHE_MAX_ENTRIES, directory=None):
+        self._store = DiskCache("transcripts", ttl=ttl, max_entries=max_entries, directory=directory)
+        self._lock = threading.Lock()
+        self.counters = {"video_hits": 0, "audio_hits": 0, "misses": 0}
+
+    def _count(self, name):
+        with self._lock:
+            self.counters[name] += 1
+
+    @staticmethod
+    def _video_key(video_id, clip_range):
+        start, end = clip_range
+        return f"video:{video_id}:{start}-{end}"
+
+    def lookup(self, video_id, clip_range):
+        """video_id + 구간으로 조회 (다운로드 전에 호출)"""
+        text = self._store.get(self._video_key(video_id, clip_range))
+        if text is not None:
+            self._count("video_hits")
+        return text
+
+    def lookup_audio(self, audio):
+        """오디오 내용 해시로 조회 (다운로드 후 Whisper 호출 전에 호출)"""
+        text = self._store.get(f"audio:{audio_hash(audio)}")
+        self._count("audio_hits" if text is not None else "misses")
+        return text
+
+    def store(self, video_id, clip_range, text, audio=None):
+        self._store.set(self._video_key(video_id, clip_range), text)
+        if audio is not None:
+            self._store.set(f"audio:{audio_hash(audio)}", text)
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self.counters)
+        stats["entries"] = len(self._store)
+        return stats
+
+
+_cache = None
+
+
+def get_transcript_cache():
+    global _cache
+    if _cache is None:
+        _cache = TranscriptCache()
+    return _cache
+
+
+def print_stats():
+    if _cache is None:
+        return
+    s = _cache.stats()
+    print(f"🗄️ 전사 캐시: video hit {s['video_hits']} / audio hit {s['audio_hits']} / "
+          f"miss {s['misses']} (저장 {s['entries']}개)")
@@ -1,20 +1,22 @@
 import os
 import json
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from dotenv import load_dotenv
-from supabase import create_client
-import openai
+import clients
+import supabase_outbox
+import llm_cache
+import metrics
+from event_stream import generate_events
+from event_history import EventHistory, fingerprint
+from html_render import STYLESHEET, esc, render_event_card
 
 sys.stdout.reconfigure(encoding='utf-8')
 
 # ---------- ENV ----------
 load_dotenv()
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
-SUPABASE_URL = os.getenv("SUPABASE_URL")
-SUPABASE_KEY = os.getenv("SUPABASE_KEY")
-supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
-openai.api_key = OPENAI_API_KEY
 
 # ---------- CONFIG ----------
 BOARD_TYPE = "ocla_weekend"     # 원하는 게시판 타입
@@ -22,6 +24,20 @@ AUTHOR = "🤖AI Bot"
 SOURCE = "chatgpt"
 REGIONS = ["Orange County, CA", "Los Angeles, CA"]
 MAX_EVENTS_PER_REGION = 6
+# 추천 결과는 날짜에 따라 달라져야 하므로 캐시는 같은 날 재실행에만 쓰이도록 짧게
+EVENTS_CACHE_TTL = int(os.getenv("EVENTS_CACHE_TTL", str(12 * 3600)))
+# 응답을 스트리밍으로 받아 이벤트 단위로 검증 (0이면 전체 응답을 한 번에 json.loads)
+EVENTS_STREAM = os.getenv("EVENTS_STREAM", "1") == "1"
+# 지역마다 별도 요청을 동시에 보냄 (0이면 모든 지역을 한 번의 요청으로)
+EVENTS_FAN_OUT = os.getenv("EVENTS_FAN_OUT", "1") == "1"
+
+_event_history = None
+
+def get_event_history():
+    global _event_history
+    if _event_history is None:
+        _event_history = EventHistory()
+    return _event_history
 
 # ---------- DATE ----------
 def get_upcoming_week_range(now: datetime):
@@ -38,7 +54,7 @@ def get_upcoming_week_range(now: datetime):
 
 # ---------- CHATGPT ----------
 SYSTEM_PROMPT = """You are a local activities recommender for Southern California.
-Return concise, family-friendly week recommendations for Orange County and Los Angeles.
+Return concise, family-friendly week recommendations for the requested REGIONS (Orange County, Los Angeles and nearby areas).
 If specific timed public events are uncertain, include evergreen/week/weekend-suitable activities (markets, hikes, beaches, museums, seasonal shows).
 ALWAYS return strict JSON following the provided schema. Do not include markdown fences or extra text.
 Times should be local PT. Avoid hallucinating precise addresses; if unsure set address to "" and keep venue generic.
@@ -50,6 +66,7 @@ TASK: Create week and weekend recommendations for {date_label}.
 QUESTION: {question}
 REGIONS: {regions}
 MAX_ITEMS: {max_items}
+AVOID (recommended in previous weeks, do not repeat): {avoid_previous}
 
 Schema:
 {{
@@ -93,99 +110,150 @@ def get_rotating_categories():
     return CATEGORIES[week_number % len(CATEGORIES)]
 
 def get_previous_recommendations():
-    # 최근 몇 주간의 추천 내역을 가져와서 중복 방지
-    response = supabase.table("posts").select("content").eq("board_type", BOARD_TYPE).order("created_at", desc=True).limit(4).execute()
-    return response.data
-
-def ask_chatgpt_for_events(regions, sat, sun_end, max_items=MAX_EVENTS_PER_REGION, question=None):
-    date_label = f"{sat.strftime('%Y-%m-%d')} ~ {sun_end.strftime('%Y-%m-%d')}"
-    rotating_categories = get_rotating_categories()
-    previous_recommendations = get_previous_recommendations()
-    user_prompt = USER_PROMPT_TEMPLATE.format(
-        date_label=date_label,
-        question=question,
-        regions=", ".join(regions),
-        max_items=max_items,
-        preferred_categories=", ".join(rotating_categories),
-        avoid_previous=previous_recommendations
-    )
-
-    from openai import OpenAI
-    client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-
-    print("💬 Asking ChatGPT for event recommendations...")
-    print(user_prompt)  # 디버깅용 전체 프롬프트 출력
+    # 최근 몇 주간 추천한 항목의 짧은 라벨 (게시할 때 저장한 fingerprint 이력)
+    history = get_event_history()
+    if not history.entries:
+        try:
+            history.backfill_from_posts(clients.get_supabase(), BOARD_TYPE)
+        except Exception as e:
+            print("⚠️ 지난 추천 이력 채우기 실패:", e)
+    return history.avoid_hints()
+
+def drop_repeats(gpt_json):
+    # 프롬프트로 피하라고 했는데도 나온 지난 추천 항목 제거 (지역이 비게 되면 그대로 둠)
+    history = get_event_history()
+    for region in gpt_json.get("regions", []):
+        events = region.get("events", [])
+        fresh = [ev for ev in events if not history.is_repeat(ev)]
+        if fresh and len(fresh) < len(events):
+            print(f"♻️ {region.get('name')}: 지난 추천과 겹치는 {len(events) - len(fresh)}개 제외")
+            region["events"] = fresh
+    return gpt_json
+
+@metrics.timed("generate.request")
+def request_events(client, request, use_cache=True, stream=EVENTS_STREAM, region=None):
+    """completion 한 번으로 {"regions": [...], "disclaimer"} 생성. 실패하면 {}
+
+    region: 한 지역만 요청했을 때 그 이름 (스트림이 끊겨 이름 없이 남은 이벤트에 사용)
+    """
+    if stream:
+        # 토큰이 오는 대로 이벤트 단위로 파싱/검증하고, 잘못된 이벤트만 수리 요청
+        try:
+            data = generate_events(client, request, use_cache=use_cache, cache_ttl=EVENTS_CACHE_TTL, region=region)
+        except Exception as e:
+            print("❌ ChatGPT 요청/파싱 실패:", e)
+            return {}
+        if not any(region["events"] for region in data.get("regions", [])):
+            print("❌ regions 데이터가 없습니다")
+            return {}
+        return data
 
     try:
-        resp = client.chat.completions.create(
-            model="gpt-4o",  # 가성비 모델 권장
-            temperature=0.8,
-            messages=[
-                {"role": "system", "content": SYSTEM_PROMPT.replace("MAX_ITEMS", str(max_items))},
-                {"role": "user", "content": user_prompt}
-            ]
-        )
-        text = resp.choices[0].message.content
+        # 같은 날 같은 질문으로 재실행(업로드 실패 등)하면 캐시된 응답을 재사용
+        text = llm_cache.cached_chat_completion(client, cache=use_cache, ttl=EVENTS_CACHE_TTL, **request)
         print("📝 ChatGPT 응답:", text[:300] + "...") # 응답 내용 일부 출력
 
         try:
             data = json.loads(text)
             if not data.get("regions"):
                 print("❌ regions 데이터가 없습니다")
+                llm_cache.invalidate(request)
                 return {}
             return data
         except json.JSONDecodeError as e:
             print("❌ JSON 파싱 실패:", e)
             print("받은 텍스트:", text)
+            llm_cache.invalidate(request)
             return {}
         
     except Exception as e:
         print("❌ ChatGPT 요청/파싱 실패:", e)
         return {}
 
-# ---------- RENDER ----------
-def render_event_card(idx: int, ev: dict):
-    img_html = ""
-    if ev.get("image"):
-        img_html = f"<img src='{ev['image']}' alt='{ev['title']}' style='width:100%;display:block;margin:0 auto;'/>"
-
-    def fmt(s):
-        return s or ""
-
-    return (
-        "<div style='margin-bottom:20px;border:1px solid #e5e7eb;border-radius:10px;overflow:hidden;max-width:100%;'>"
-        f"  <a href='{fmt(ev.get('url'))}' target='_blank' style='text-decoration:none;color:inherit;display:block;'>"
-        f"    {img_html}"
-        f"    <div style='padding:10px;'>"
-        f"      <strong>{idx}. {fmt(ev.get('title'))}</strong><br>"
-        f"      <span>• 일정: {fmt(ev.get('start'))} ~ {fmt(ev.get('end'))}</span><br>"
-        f"      <span>• 유형: {fmt(ev.get('category'))}</span><br>"
-        f"      <span>• 장소: {fmt(ev.get('venue'))}</span><br>"
-        f"      <span>• 주소: {fmt(ev.get('address')) or '-'}</span>"
-        f"    </div>"
-        f"  </a>"
-        "</div>"
-    )
+def merge_region_results(results, regions):
+    """지역별로 따로 받은 결과를 요청한 지역 순서대로 합치고, 지역 간 중복 이벤트는 처음 것만 남김"""
+    merged = {"regions": []}
+    seen = set()
+    for name, data in zip(regions, results):
+        events = []
+        for region in data.get("regions", []):
+            for ev in region.get("events", []):
+                fp = fingerprint(ev.get("title"))
+                if fp and fp in seen:
+                    continue
+                seen.add(fp)
+                events.append(ev)
+        merged["regions"].append({"name": name, "events": events})
+        if data.get("disclaimer") and "disclaimer" not in merged:
+            merged["disclaimer"] = data["disclaimer"]
+    if not any(region["events"] for region in merged["regions"]):
+        return {}
+    return merged
+
+def ask_chatgpt_for_events(regions, sat, sun_end, max_items=MAX_EVENTS_PER_REGION, question=None, use_cache=True,
+                           stream=EVENTS_STREAM, fan_out=EVENTS_FAN_OUT):
+    date_label = f"{sat.strftime('%Y-%m-%d')} ~ {sun_end.strftime('%Y-%m-%d')}"
+    rotating_categories = get_rotating_categories()
+    previous_recommendations = get_previous_recommendations()
+
+    # fan-out: 지역마다 작은 요청을 따로 보내 동시에 생성 (지역이 늘어도 소요 시간이 거의 일정)
+    groups = [[region] for region in regions] if fan_out and len(regions) > 1 else [regions]
+    requests = []
+    for group in groups:
+        user_prompt = USER_PROMPT_TEMPLATE.format(
+            date_label=date_label,
+            question=question,
+            regions=", ".join(group),
+            max_items=max_items,
+            preferred_categories=", ".join(rotating_categories),
+            avoid_previous="; ".join(previous_recommendations) or "none"
+        )
+        requests.append({
+            "model": "gpt-4o",  # 가성비 모델 권장
+            "temperature": 0.8,
+            "messages": [
+                {"role": "system", "content": SYSTEM_PROMPT.replace("MAX_ITEMS", str(max_items))},
+                {"role": "user", "content": user_prompt}
+            ],
+        })
 
+    client = clients.get_openai_client()
+
+    print(f"💬 Asking ChatGPT for event recommendations... ({len(requests)}개 요청)")
+    print(requests[0]["messages"][1]["content"])  # 디버깅용 전체 프롬프트 출력 (fan-out이면 첫 지역만)
+
+    def run(request, group):
+        region = group[0] if len(group) == 1 else None
+        return request_events(client, request, use_cache=use_cache, stream=stream, region=region)
+
+    if len(requests) == 1:
+        return run(requests[0], groups[0])
+
+    with ThreadPoolExecutor(max_workers=len(requests)) as executor:
+        results = list(executor.map(run, requests, groups))
+    return merge_region_results(results, regions)
+
+# ---------- RENDER ----------
 def build_content(gpt_json, weekend_label):
     sections = []
     for region in gpt_json.get("regions", []):
-        name = region.get("name", "Region")
+        name = region.get("name") or "Region"
         events = region.get("events", [])
         if not events:
-            sections.append(f"<h3>📍 {name}</h3><p>추천 항목이 없습니다.</p>")
+            sections.append(f"<h3>📍 {esc(name)}</h3><p>추천 항목이 없습니다.</p>")
             continue
         cards = [render_event_card(i+1, ev) for i, ev in enumerate(events)]
-        sections.append(f"<h3>📍 {name}</h3>" + "".join(cards))
+        sections.append(f"<h3>📍 {esc(name)}</h3>" + "".join(cards))
 
     today_str = datetime.now().strftime("%Y년 %m월 %d일")
     disclaimer = gpt_json.get("disclaimer", "정확한 일정은 공식 홈페이지에서 확인하세요.")
     content = (
+        f"{STYLESHEET}"
         f"<h2>{today_str} OC·LA 주간 액티비티 추천 ({weekend_label})</h2>"
         f"<p>이번 주 가족·커플·친구와 즐길 거리 모음입니다. 즐거운 시간을 보내세요! ☀️</p>"
         f"<!-- more -->"
         + "".join(sections) +
-        f"<p style='color:#6b7280;font-size:12px;margin-top:12px;'>※ {disclaimer}</p>"
+        f"<p class='ytg-note'>※ {esc(disclaimer)}</p>"
     )
     return content
 
@@ -199,13 +267,7 @@ def post_to_supabase(title, content, board_type, source, author):
         "format": "html",
         "author": author,
     }
-    try:
-        response = supabase.table("posts").insert(data).execute()
-        print("✅ 게시글 업로드 성공!")
-        return response
-    except Exception as e:
-        print("❌ 업로드 실패:", e)
-        return None
+    return supabase_outbox.post_now(data)
 
 import random
 
@@ -229,14 +291,16 @@ WEEKEND_QUESTIONS = [
      "title_format": "문화의 주말! OC·LA 예술/전시 추천"}
 ]
 
-def get_random_question():
-    return random.choice(WEEKEND_QUESTIONS)
+def get_random_question(seed=None):
+    # seed(예: 날짜)가 같으면 같은 질문 → 같은 날 재실행 시 프롬프트가 같아 LLM 캐시를 재사용
+    rng = random.Random(seed) if seed is not None else random
+    return rng.choice(WEEKEND_QUESTIONS)
 
 # ---------- MAIN ----------
-if __name__ == "__main__":
+def main(argv=None):
     if not OPENAI_API_KEY:
         print("❗ OPENAI_API_KEY 가 없습니다. .env를 확인하세요.")
-        raise SystemExit(1)
+        return 1
 
     now = datetime.now()
     start, end = get_upcoming_week_range(now)
@@ -244,32 +308,48 @@ if __name__ == "__main__":
     print(f"📅 대상 기간: {week_label}")
 
     # 랜덤 질문 선택
-    selected_question = get_random_question()
+    selected_question = get_random_question(seed=start.strftime('%Y-%m-%d'))
 
     print(f"❓ 선택된 질문: {selected_question['question']}")
 
     # ChatGPT 요청 시 질문 포함
-    gpt_data = ask_chatgpt_for_events(
-        regions=REGIONS,
-        sat=start,
-        sun_end=end,
-        max_items=MAX_EVENTS_PER_REGION,
-        question=selected_question["question"]
-    )
+    with metrics.span("generate"):
+        gpt_data = ask_chatgpt_for_events(
+            regions=REGIONS,
+            sat=start,
+            sun_end=end,
+            max_items=MAX_EVENTS_PER_REGION,
+            question=selected_question["question"]
+        )
 
     if not gpt_data or not gpt_data.get("regions"):
         print("❗ 유효한 이벤트 데이터를 받지 못했습니다. 종료합니다.")
-        raise SystemExit(1)
+        return 1
 
     # 선택된 질문에 맞는 제목 포맷 사용
     title = selected_question["title_format"]
-    content = build_content(gpt_data, week_label)
+    gpt_data = drop_repeats(gpt_data)
+    with metrics.span("render"):
+        content = build_content(gpt_data, week_label)
 
     print("📤 게시글 업로드 중...")
-    post_to_supabase(
-        title=title,
-        content=content,
-        board_type=BOARD_TYPE,
-        source=SOURCE,
-        author=AUTHOR,
-    )
+    with metrics.span("post"):
+        posted = post_to_supabase(
+            title=title,
+            content=content,
+            board_type=BOARD_TYPE,
+            source=SOURCE,
+            author=AUTHOR,
+        )
+    if posted:
+        # 다음 주 프롬프트에 넣을 수 있도록 이번 추천의 fingerprint 기록
+        get_event_history().record(
+            [ev for region in gpt_data.get("regions", []) for ev in region.get("events", [])]
+        )
+    llm_cache.print_stats()
+    metrics.finish("upload_la_oc_events")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,8 +1,17 @@
 import os
-import requests
+import isodate
 from dotenv import load_dotenv
-from supabase import create_client
+import clients
+import supabase_outbox
+import dedup_index
 from topic_selector import get_random_topic
+import http_client
+import response_cache
+import metrics
+import video_ranker
+import quota_ledger
+from video_batcher import fetch_video_details
+from html_render import STYLESHEET, esc, render_video_card
 import sys
 from datetime import datetime
 sys.stdout.reconfigure(encoding='utf-8')
@@ -11,16 +20,12 @@ sys.stdout.reconfigure(encoding='utf-8')
 load_dotenv()
 API_KEY = os.getenv("YOUTUBE_API_KEY")
 MAX_RESULTS = 5
+# 검색은 개수와 상관없이 100 unit이므로 후보를 넉넉히 받아 점수순으로 MAX_RESULTS개 선택
+SEARCH_POOL = int(os.getenv("RECOMMEND_SEARCH_POOL", "25"))
 
-SUPABASE_URL = os.getenv("SUPABASE_URL")
-SUPABASE_KEY = os.getenv("SUPABASE_KEY")
-supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
-
-def search_youtube(query, max_results=MAX_RESULTS):
-    """
-    유튜브 검색 → 상위 max_results개를 [ {title, url, channel, published_at, video_id}, ... ]로 반환
-    """
-    url = "https://www.googleapis.com/youtube/v3/search"
+def search_request(query, max_results=MAX_RESULTS):
+    """검색 요청의 (url, params). 캐시 확인/쿼터 계획에도 같은 값을 씀"""
+    url = f"{http_client.YOUTUBE_API_BASE}/search"
     params = {
         "part": "snippet",
         "q": query,
@@ -30,10 +35,14 @@ def search_youtube(query, max_results=MAX_RESULTS):
         "maxResults": max_results,
         "key": API_KEY,
     }
+    return url, params
 
-    resp = requests.get(url, params=params)
-    resp.raise_for_status()
-    data = resp.json()
+def search_youtube(query, max_results=MAX_RESULTS):
+    """
+    유튜브 검색 → 상위 max_results개를 [ {title, url, channel, published_at, video_id}, ... ]로 반환
+    """
+    url, params = search_request(query, max_results)
+    data = response_cache.cached_get_json(url, params=params, name="youtube.search")
 
     items = data.get("items", [])
     if not items:
@@ -54,26 +63,34 @@ def search_youtube(query, max_results=MAX_RESULTS):
     print(f"🔍 Found {len(results)} videos for query '{query}'")
     return results
 
+def rank_candidates(videos, limit=MAX_RESULTS):
+    """videos.list(statistics/contentDetails) 한 번으로 후보 점수화 → 상위 limit개.
+    조회에 실패하면 검색 순서 그대로"""
+    try:
+        with metrics.span("video_details"):
+            details = fetch_video_details([v["video_id"] for v in videos])
+    except Exception as e:
+        print(f"⚠️ 영상 상세 조회 실패 (검색 순서 사용): {e}")
+        return videos[:limit]
+    for v in videos:
+        item = details.get(v["video_id"], {})
+        stats = item.get("statistics", {})
+        if item.get("contentDetails"):
+            v["duration"] = isodate.parse_duration(item["contentDetails"]["duration"]).total_seconds() / 60
+        v["views"] = int(stats.get("viewCount", 0))
+        v["likes"] = int(stats.get("likeCount", 0))
+    return video_ranker.rank_videos(videos)[:limit]
+
 def get_recent_topics(days=30):
-    """최근 게시된 유튜브 주제들을 가져옴"""
+    """최근 게시된 유튜브 주제들 (로컬 인덱스를 마지막 동기화 이후 게시글로만 갱신)"""
+    index = dedup_index.get_index()
     try:
-        # 최근 30일 이내의 게시물 제목 조회
-        response = supabase.table("posts") \
-            .select("title") \
-            .like("title", "유튜브 추천:%") \
-            .gte("created_at", f"now() - interval '{days} days'") \
-            .execute()
-        
-        # "유튜브 추천: " 이후의 실제 주제만 추출
-        topics = []
-        for post in response.data:
-            topic = post['title'].split("유튜브 추천: ")[-1].strip()
-            topics.append(topic)
-        
-        return topics
+        with metrics.span("dedup_sync"):
+            synced = index.sync(clients.get_supabase())
+        print(f"🔄 중복 인덱스 동기화: 새 게시글 {synced}개")
     except Exception as e:
         print(f"❌ 최근 주제 조회 실패: {e}")
-        return []
+    return index.recent_topics(days)
 
 def post_to_supabase(title, content, board_type, source, author):
     data = {
@@ -84,16 +101,10 @@ def post_to_supabase(title, content, board_type, source, author):
         "format": "html",
         "author": author,
     }
-    try:
-        response = supabase.table("posts").insert(data).execute()
-        print("✅ 게시글 업로드 성공!")
-        return response
-    except Exception as e:
-        print("❌ 업로드 실패:", e)
-        return None
+    return supabase_outbox.post_now(data)
 
 # Run test
-if __name__ == "__main__":
+def main(argv=None):
     max_attempts = 5
     attempt = 0
     videos = []
@@ -101,13 +112,23 @@ if __name__ == "__main__":
     # 최근 게시된 주제들 가져오기
     recent_topics = get_recent_topics()
     print(f"🔍 최근 {len(recent_topics)}개의 주제 확인됨")
+    # 최근 주제는 제외하고, 오래전에 쓴 주제일수록 다시 뽑힐 확률이 높아지도록
+    exclude = set(recent_topics)
+    recency = dedup_index.get_index().topics
+
+    # 새 검색은 100 unit, 점수용 상세 조회는 1 unit. 쿼터가 모자라면 캐시된 검색 결과가 있는 주제만 시도
+    ledger = quota_ledger.get_ledger()
+    searches_left = ledger.plan(quota_ledger.call_cost("youtube.search"), max_attempts,
+                                fixed=quota_ledger.call_cost("youtube.videos"))
+    if searches_left < max_attempts:
+        print(f"⚠️ 남은 YouTube 쿼터 {ledger.remaining():,} unit: 새 검색은 최대 {searches_left}회")
 
     while attempt < max_attempts:
-        # 1) 랜덤 주제 새로 선택
-        selected_topic = get_random_topic()
+        # 1) 최근에 다루지 않은 주제를 한 번에 선택
+        selected_topic = get_random_topic(exclude=exclude, recency=recency)
         if not selected_topic:
             print("❗ No topics found.")
-            raise SystemExit(0)
+            return 0
 
         if isinstance(selected_topic, dict):
             SEARCH_QUERY = selected_topic.get("title") or selected_topic.get("query") or str(selected_topic)
@@ -116,84 +137,48 @@ if __name__ == "__main__":
             SEARCH_QUERY = str(selected_topic)
             BOARD_TYPE = "today_youtube"
 
-        # 중복 주제 체크
-        if SEARCH_QUERY in recent_topics:
-            print(f"⚠️ '{SEARCH_QUERY}'는 최근에 다룬 주제입니다. 다른 주제 선택...")
-            attempt += 1
-            continue
+        if not response_cache.is_cached(*search_request(SEARCH_QUERY, SEARCH_POOL)):
+            if searches_left <= 0:
+                attempt += 1
+                exclude.add(SEARCH_QUERY)
+                print(f"⏭️ 쿼터 부족: 캐시된 검색 결과가 없는 주제는 건너뜁니다 ('{SEARCH_QUERY}')")
+                continue
+            searches_left -= 1
 
         print(f"\n🔎 '{SEARCH_QUERY}' 유튜브 검색 중... (시도 {attempt+1}/{max_attempts})")
 
-        # 2) 유튜브 상위 10개 추출
-        videos = search_youtube(SEARCH_QUERY, max_results=MAX_RESULTS)
+        # 2) 유튜브 검색 후 점수순 상위 MAX_RESULTS개
+        with metrics.span("search"):
+            videos = search_youtube(SEARCH_QUERY, max_results=SEARCH_POOL)
         if videos:
+            videos = rank_candidates(videos)
             break  # 성공 시 종료
 
         attempt += 1
+        exclude.add(SEARCH_QUERY)  # 결과 없는 주제는 다시 뽑지 않음
         print("❗ No videos found. 새로운 주제로 재시도합니다...")
 
     if not videos:
         print("❗ 최대 시도 횟수 초과. 종료합니다.")
-        raise SystemExit(0)
+        return 0
 
     # 3) 추천 리스트 본문 구성 (HTML, 미리보기=첫 카드 + more, 전체=나머지)
-    lines = []
-
     if not videos:
         content = "<p>추천할 영상이 없습니다.</p>"
     else:
         # 첫 번째 카드 (미리보기에도 노출)
-        v0 = videos[0]
-        v0_id = v0['url'].split("v=")[-1] if "v=" in v0['url'] else v0['url'].split("/")[-1]
-        v0_thumb = f"https://img.youtube.com/vi/{v0_id}/hqdefault.jpg"
-
-        first_card = (
-            f"<style>"
-            f"  @media (min-width: 768px) {{ .yt-thumb-first {{ max-width: 320px; }} }}"
-            f"  @media (max-width: 767px) {{ .yt-thumb-first {{ width: 100%; height: auto; }} }}"
-            f"</style>"
-            f"<div style='margin-bottom:20px;border:1px solid #e5e7eb;border-radius:10px;overflow:hidden;max-width:100%;'>"
-            f"  <a href='{v0['url']}' target='_blank' style='text-decoration:none;color:inherit;display:block;'>"
-            f"    <img src='{v0_thumb}' alt='{v0['title']}' class='yt-thumb-first' "
-            f"         style='width:100%;display:block;margin:0 auto;'/>"
-            f"    <div style='padding:8px;'>"
-            f"      <strong>1. {v0['title']}</strong><br>"
-            f"      <span>• 채널: {v0['channel']}</span><br>"
-            f"      <span>• 업로드: {v0['published_at']}</span>"
-            f"    </div>"
-            f"  </a>"
-            f"</div>"
-        )
+        first_card = render_video_card(1, videos[0])
 
         # 나머지 카드 (전체 보기에서만 보이게 more 뒤에 배치)
-        other_cards = []
-        for i, v in enumerate(videos[1:], start=2):
-            video_id = v['url'].split("v=")[-1] if "v=" in v['url'] else v['url'].split("/")[-1]
-            thumbnail_url = f"https://img.youtube.com/vi/{video_id}/hqdefault.jpg"
-
-            other_cards.append(
-                f"<style>"
-                f"  @media (min-width: 768px) {{ .yt-thumb-{i} {{ max-width: 320px; }} }}"
-                f"  @media (max-width: 767px) {{ .yt-thumb-{i} {{ width: 100%; height: auto; }} }}"
-                f"</style>"
-                f"<div style='margin-bottom:20px;border:1px solid #e5e7eb;border-radius:10px;overflow:hidden;max-width:100%;'>"
-                f"  <a href='{v['url']}' target='_blank' style='text-decoration:none;color:inherit;display:block;'>"
-                f"    <img src='{thumbnail_url}' alt='{v['title']}' class='yt-thumb-{i}' "
-                f"         style='width:100%;display:block;margin:0 auto;'/>"
-                f"    <div style='padding:8px;'>"
-                f"      <strong>{i}. {v['title']}</strong><br>"
-                f"      <span>• 채널: {v['channel']}</span><br>"
-                f"      <span>• 업로드: {v['published_at']}</span>"
-                f"    </div>"
-                f"  </a>"
-                f"</div>"
-            )
+        other_cards = [render_video_card(i, v) for i, v in enumerate(videos[1:], start=2)]
 
         today_str = datetime.now().strftime("%Y년 %m월 %d일")  # 예: 2025년 08월 14일
 
         # 최종 content (more 앞: 미리보기 노출, more 뒤: 전체 보기에서만 노출)
+        # 카드 스타일은 게시글 맨 앞에 한 번만 (미리보기에서도 적용되도록)
         content = (
-            f"<h2>{today_str} 유튜브 추천: {SEARCH_QUERY}</h2>"
+            f"{STYLESHEET}"
+            f"<h2>{today_str} 유튜브 추천: {esc(SEARCH_QUERY)}</h2>"
             f"{first_card}"
             f"<!-- more -->"
             + "".join(other_cards)
@@ -203,11 +188,24 @@ if __name__ == "__main__":
 
     # 4) Supabase 업로드
     print("📤 게시글 업로드 중...")
-    post_to_supabase(
-        title,
-        content,
-        board_type=BOARD_TYPE,
-        source="youtube",
-        author="🤖AI Bot",
-    )
+    with metrics.span("post"):
+        posted = post_to_supabase(
+            title,
+            content,
+            board_type=BOARD_TYPE,
+            source="youtube",
+            author="🤖AI Bot",
+        )
+    if posted:
+        index = dedup_index.get_index()
+        index.add_post(title, content)
+        index.save()
+
+    http_client.print_stats()
+    response_cache.print_stats()
+    metrics.finish("upload_youtube_recommend")
+    return 0
 
+
+if __name__ == "__main__":
+    sys.exit(main())
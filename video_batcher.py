@@ -0,0 +1,76 @@
+# video_batcher.py
+"""videos.list 조회 배치 처리.
+
+주제마다 videos.list를 따로 부르는 대신, 한 번의 실행에서 모인 모든 후보 영상 ID를
+50개 단위(API 최대치)로 묶어 조회하고 결과를 ID별로 돌려준다.
+영상 상세는 ID 단위로 디스크 캐시에 저장되므로 조합이 달라도 재사용된다.
+"""
+import os
+
+import http_client
+import response_cache
+
+VIDEOS_URL = f"{http_client.YOUTUBE_API_BASE}/videos"
+MAX_IDS_PER_CALL = 50
+DEFAULT_PART = "contentDetails,snippet,statistics"  # statistics: video_ranker 점수용
+
+
+def _item_key(part, video_id):
+    return f"video:{part}:{video_id}"
+
+
+def fetch_video_details(video_ids, part=DEFAULT_PART, bypass=None):
+    """영상 ID 목록 → {video_id: videos.list item}. 캐시에 없는 ID만 50개씩 묶어 조회"""
+    bypass = response_cache.YT_CACHE_BYPASS if bypass is None else bypass
+    cache = response_cache.get_cache()
+    ttl = response_cache.YT_CACHE_TTL["videos"]
+
+    unique_ids = list(dict.fromkeys(v for v in video_ids if v))
+    details = {}
+    missing = []
+    for video_id in unique_ids:
+        item = None if bypass else cache.get(_item_key(part, video_id))
+        if item is not None:
+            details[video_id] = item
+        else:
+            missing.append(video_id)
+
+    for i in range(0, len(missing), MAX_IDS_PER_CALL):
+        chunk = missing[i:i + MAX_IDS_PER_CALL]
+        params = {"part": part, "id": ",".join(chunk), "key": os.getenv("YOUTUBE_API_KEY")}  # .env는 스크립트 import 후에 로드되므로 호출 시점에 읽음
+        data = http_client.get_json(VIDEOS_URL, params=params, name="youtube.videos")
+        for item in data.get("items", []):
+            details[item["id"]] = item
+            cache.set(_item_key(part, item["id"]), item, ttl=ttl)
+
+    return details
+
+
+class VideoLookupBatcher:
+    """여러 주제의 후보 ID를 모았다가 한 번에 조회하고, 주제별로 결과를 나눠준다
+
+    batcher = VideoLookupBatcher()
+    batcher.add("business", ids_a)
+    batcher.add("seoul", ids_b)
+    batcher.resolve()
+    details = batcher.details_for("business")  # {video_id: item} (ids_a 중 조회된 것만)
+    """
+
+    def __init__(self, part=DEFAULT_PART):
+        self.part = part
+        self._requests = {}
+        self._details = None
+
+    def add(self, owner, video_ids):
+        self._requests[owner] = list(video_ids)
+        self._details = None
+
+    def resolve(self):
+        all_ids = [vid for ids in self._requests.values() for vid in ids]
+        self._details = fetch_video_details(all_ids, part=self.part)
+        return self._details
+
+    def details_for(self, owner):
+        if self._details is None:
+            self.resolve()
+        return {vid: self._details[vid] for vid in self._requests.get(owner, []) if vid in self._details}
@@ -0,0 +1,96 @@
+# video_ranker.py
+"""후보 영상 점수 계산/정렬 (NumPy 벡터 연산).
+
+videos.list 배치 조회에 statistics를 함께 요청해 두면 추가 API 호출 없이 후보 전체를 한 번에
+점수화한다. 후보 수가 수백~수천 개로 늘어도 배열 연산 몇 번으로 끝난다.
+
+- 인기도: 하루 평균 조회수/좋아요 수 (log 스케일, 후보 안에서 0~1로 정규화)
+- 최신성: 업로드 후 RANK_HALF_LIFE_DAYS마다 절반으로 감소
+- 길이 적합도: RANK_TARGET_MINUTES에 가까울수록 1 (가우시안)
+- 채널 다양성: 같은 채널의 n번째 영상은 점수에 RANK_CHANNEL_PENALTY**n을 곱함
+
+영상 dict에는 channel, published_at(ISO 8601)이 필요하고 duration(분), views, likes는 있으면 사용한다.
+"""
+import os
+import time
+from datetime import datetime
+
+RANK_HALF_LIFE_DAYS = float(os.getenv("RANK_HALF_LIFE_DAYS", "14"))
+RANK_TARGET_MINUTES = float(os.getenv("RANK_TARGET_MINUTES", "12"))
+RANK_DURATION_WIDTH = float(os.getenv("RANK_DURATION_WIDTH", "10"))   # 길이 적합도 가우시안 폭(분)
+RANK_CHANNEL_PENALTY = float(os.getenv("RANK_CHANNEL_PENALTY", "0.6"))
+# (인기도, 최신성, 길이 적합도) 가중치
+RANK_WEIGHTS = (0.5, 0.3, 0.2)
+
+
+def _epoch(value):
+    try:
+        return datetime.fromisoformat(str(value).replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        return float("nan")
+
+
+def _number(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _normalize(np, values):
+    spread = values.max() - values.min() if values.size else 0.0
+    return (values - values.min()) / spread if spread > 0 else np.zeros_like(values)
+
+
+def _channel_occurrence(np, channels, order):
+    """order(점수 높은 순)에서 각 영상이 자기 채널의 몇 번째(0부터) 영상인지"""
+    _, codes = np.unique(channels, return_inverse=True)
+    ranked = codes[order]
+    perm = np.argsort(ranked, kind="stable")
+    grouped = ranked[perm]
+    starts = np.flatnonzero(np.r_[True, grouped[1:] != grouped[:-1]])
+    sizes = np.diff(np.r_[starts, grouped.size])
+    occurrence_sorted = np.empty(grouped.size, dtype=np.int64)
+    occurrence_sorted[perm] = np.arange(grouped.size) - np.repeat(starts, sizes)
+    occurrence = np.empty_like(occurrence_sorted)
+    occurrence[order] = occurrence_sorted
+    return occurrence
+
+
+def score_videos(videos, now=None, target_minutes=RANK_TARGET_MINUTES):
+    """영상별 최종 점수 배열 (채널 다양성 감점 포함)"""
+    import numpy as np
+
+    n = len(videos)
+    if not n:
+        return np.zeros(0)
+    now = time.time() if now is None else now
+    views = np.fromiter((_number(v.get("views")) for v in videos), dtype=float, count=n)
+    likes = np.fromiter((_number(v.get("likes")) for v in videos), dtype=float, count=n)
+    published = np.fromiter((_epoch(v.get("published_at")) for v in videos), dtype=float, count=n)
+    minutes = np.fromiter((_number(v.get("duration")) or np.nan for v in videos), dtype=float, count=n)
+    channels = np.array([str(v.get("channel") or "") for v in videos])
+
+    # 업로드 시각을 모르면 가장 오래된 것으로 간주, 1시간 미만은 1시간으로 (하루 평균이 튀지 않도록)
+    age_days = np.where(np.isnan(published), np.inf, (now - published) / 86400)
+    age_days = np.clip(age_days, 1 / 24, None)
+    per_day = np.where(np.isinf(age_days), 0.0, 1 / age_days)
+    popularity = _normalize(np, 0.7 * np.log1p(views * per_day) + 0.3 * np.log1p(likes * per_day))
+    recency = np.power(0.5, age_days / RANK_HALF_LIFE_DAYS)
+    fit = np.exp(-0.5 * ((minutes - target_minutes) / RANK_DURATION_WIDTH) ** 2)
+    fit = np.where(np.isnan(fit), 0.5, fit)  # 길이를 모르면 중간값
+
+    w_pop, w_rec, w_fit = RANK_WEIGHTS
+    score = w_pop * popularity + w_rec * recency + w_fit * fit
+    order = np.argsort(-score, kind="stable")
+    return score * np.power(RANK_CHANNEL_PENALTY, _channel_occurrence(np, channels, order))
+
+
+def rank_videos(videos, now=None, target_minutes=RANK_TARGET_MINUTES):
+    """점수 높은 순으로 정렬한 새 목록 (동점이면 원래 순서 유지)"""
+    if len(videos) < 2:
+        return list(videos)
+    import numpy as np
+
+    scores = score_videos(videos, now=now, target_minutes=target_minutes)
+    return [videos[i] for i in np.argsort(-scores, kind="stable")]
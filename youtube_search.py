@@ -1,41 +1,76 @@
-import openai
-import requests
 import os
 import isodate
+import re
 import subprocess
+import shutil
+import tempfile
+import argparse
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dotenv import load_dotenv
-from supabase import create_client, Client
-from topic_selector import get_random_topic
+from topic_selector import get_random_topics
+import http_client
+import response_cache
+import transcript_cache
+import llm_cache
+import supabase_outbox
+import dedup_index
+import clients
+import run_journal
+import metrics
+import rate_limit
+import audio_downloader
+import video_ranker
+import quota_ledger
+from batch_summarizer import BatchResult, ChatBackend, OpenAIBatchBackend, run_batch
+from audio_chunks import chunk_ranges, stitch_transcripts
+from video_batcher import MAX_IDS_PER_CALL, VideoLookupBatcher, fetch_video_details
 
 # Load API key from .env file
 load_dotenv()
 API_KEY = os.getenv("YOUTUBE_API_KEY")
 MAX_RESULTS = 10
-
-client = openai.OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-
-SUPABASE_URL = os.getenv("SUPABASE_URL")
-SUPABASE_KEY = os.getenv("SUPABASE_KEY")
-
-supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
+MAX_VIDEO_MINUTES = 50
+CLIP_SECONDS = int(os.getenv("CLIP_SECONDS", "180"))  # 영상 앞부분부터 전사할 길이(초)
+CLIP_RANGE = (0, CLIP_SECONDS)
+# 긴 구간은 겹치는 조각으로 나눠 병렬 전사 후 이어붙임
+CHUNK_SECONDS = int(os.getenv("CHUNK_SECONDS", "180"))
+CHUNK_OVERLAP_SECONDS = int(os.getenv("CHUNK_OVERLAP_SECONDS", "5"))
+CHUNK_WORKERS = int(os.getenv("CHUNK_WORKERS", "4"))
+# 요약 방식: sync(주제마다 바로 호출) | batch(실행 단위로 모아 Batch API 제출)
+SUMMARY_MODES = ("sync", "batch")
+SUMMARY_MODE = os.getenv("SUMMARY_MODE", "sync")
+# inprocess: yt_dlp Python API(인스턴스 재사용)로 스트림 URL만 추출해 ffmpeg로 구간 변환 | cli: yt-dlp 실행
+# (inprocess를 쓸 수 없으면 cli로 대체)
+AUDIO_DOWNLOADER = os.getenv("AUDIO_DOWNLOADER", "inprocess")
+# cli: yt-dlp → ffmpeg 파이프로 오디오를 메모리에서 바로 전사 (0이거나 ffmpeg가 없으면 임시 파일 사용)
+AUDIO_STREAMING = os.getenv("AUDIO_STREAMING", "1") == "1"
+
+# ---------- CONCURRENCY ----------
+# 동시에 처리할 주제 수와 단계별 동시 실행 한도 (환경변수로 조정 가능)
+PIPELINE_WORKERS = int(os.getenv("PIPELINE_WORKERS", "4"))
+STAGE_LIMITS = {
+    "search": threading.BoundedSemaphore(int(os.getenv("SEARCH_CONCURRENCY", "4"))),
+    "download": threading.BoundedSemaphore(int(os.getenv("DOWNLOAD_CONCURRENCY", "3"))),
+    "transcribe": threading.BoundedSemaphore(int(os.getenv("TRANSCRIBE_CONCURRENCY", "3"))),
+    "summarize": threading.BoundedSemaphore(int(os.getenv("SUMMARIZE_CONCURRENCY", "4"))),
+}
 
 def parse_duration_to_minutes(duration_str):
     duration = isodate.parse_duration(duration_str)
     return duration.total_seconds() / 60
 
-def filter_by_duration(video_ids, max_minutes=10):
-    url = "https://www.googleapis.com/youtube/v3/videos"
-    params = {
-        "part": "contentDetails,snippet",
-        "id": ",".join(video_ids),
-        "key": API_KEY
-    }
-    response = requests.get(url, params=params)
-    response.raise_for_status()
-    data = response.json()
+def filter_by_duration(video_ids, max_minutes=10, details=None):
+    """details: 미리 배치 조회한 {video_id: videos.list item}. 없으면 여기서 조회"""
+    if details is None:
+        details = fetch_video_details(video_ids)
 
     filtered = []
-    for item in data["items"]:
+    for video_id in video_ids:
+        item = details.get(video_id)
+        if item is None:
+            continue
         minutes = parse_duration_to_minutes(item["contentDetails"]["duration"])
         if minutes <= max_minutes:
             filtered.append({
@@ -46,12 +81,15 @@ def filter_by_duration(video_ids, max_minutes=10):
                 "published_at": item["snippet"]["publishedAt"],
                 "description": item["snippet"]["description"],
                 "duration": minutes,
+                "views": int(item.get("statistics", {}).get("viewCount", 0)),
+                "likes": int(item.get("statistics", {}).get("likeCount", 0)),
                 "url": f"https://www.youtube.com/watch?v={item['id']}"
             })
     return filtered
 
-def search_youtube(query):
-    url = "https://www.googleapis.com/youtube/v3/search"
+def search_request(query):
+    """검색 요청의 (url, params). 캐시 확인/쿼터 계획에도 같은 값을 씀"""
+    url = f"{http_client.YOUTUBE_API_BASE}/search"
     params = {
         "part": "snippet",
         "q": query,
@@ -61,33 +99,44 @@ def search_youtube(query):
         "maxResults": MAX_RESULTS,
         "key": API_KEY
     }
+    return url, params
 
-    response = requests.get(url, params=params)
-    response.raise_for_status()
-    data = response.json()
+def search_video_ids(query):
+    url, params = search_request(query)
+    data = response_cache.cached_get_json(url, params=params, name="youtube.search")
 
     if not data.get("items"):
         print("❗ No videos found for the query.")
         return []
 
-    video_ids = [item["id"]["videoId"] for item in data.get("items", [])]
-    return filter_by_duration(video_ids, max_minutes=50)
+    return [item["id"]["videoId"] for item in data.get("items", [])]
+
+def search_youtube(query):
+    """검색 → 길이 필터 → 점수순 정렬 (statistics는 같은 videos.list 호출로 받음)"""
+    return video_ranker.rank_videos(filter_by_duration(search_video_ids(query), max_minutes=MAX_VIDEO_MINUTES))
+
+def _clip_timestamp(seconds):
+    seconds = int(seconds)
+    return f"{seconds // 3600:02d}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
+
+def _cookies_args():
+    # ✅ 로컬에서만 cookies.txt 사용
+    if not os.getenv("GITHUB_ACTIONS"):  # GitHub에서는 True, 로컬은 None
+        if os.path.exists("cookies.txt"):
+            return ["--cookies", "cookies.txt"]
+    return []
 
-def download_3min_audio(video_url, output_filename):
+def download_3min_audio(video_url, output_filename, clip_range=CLIP_RANGE):
+    start, end = clip_range
     command = [
         "yt-dlp",
-        "--download-sections", "*00:00:00-00:03:00",
+        "--download-sections", f"*{_clip_timestamp(start)}-{_clip_timestamp(end)}",
         "-f", "bestaudio",
         "--extract-audio",
         "--audio-format", "mp3",
         "-o", output_filename,
     ]
-
-    # ✅ 로컬에서만 cookies.txt 사용
-    if not os.getenv("GITHUB_ACTIONS"):  # GitHub에서는 True, 로컬은 None
-        if os.path.exists("cookies.txt"):
-            command += ["--cookies", "cookies.txt"]
-
+    command += _cookies_args()
     command.append(video_url)
 
     try:
@@ -96,18 +145,75 @@ def download_3min_audio(video_url, output_filename):
     except subprocess.CalledProcessError as e:
         print("❌ Failed to download audio:", e)
 
-def transcribe_audio(audio_path: str) -> str:
-    with open(audio_path, "rb") as audio_file:
-        transcript = client.audio.transcriptions.create(
+def stream_audio_clip(video_url, clip_range=CLIP_RANGE) -> bytes:
+    """yt-dlp 출력을 파이프로 ffmpeg에 넘겨 구간 mp3를 메모리로 받음 (임시 파일 없음).
+    ffmpeg가 구간 끝에서 종료하면 yt-dlp도 중단되므로 필요한 만큼만 내려받는다"""
+    start, end = clip_range
+    ytdlp_cmd = ["yt-dlp", "-f", "bestaudio", "--quiet", "--no-warnings", "-o", "-"]
+    ytdlp_cmd += _cookies_args()
+    ytdlp_cmd.append(video_url)
+    ffmpeg_cmd = [
+        "ffmpeg", "-loglevel", "error",
+        "-ss", str(start), "-t", str(end - start),
+        "-i", "pipe:0",
+        "-vn", "-ac", "1", "-b:a", "64k", "-f", "mp3", "pipe:1",
+    ]
+
+    ytdlp = subprocess.Popen(ytdlp_cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    try:
+        ffmpeg = subprocess.Popen(ffmpeg_cmd, stdin=ytdlp.stdout,
+                                  stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        ytdlp.stdout.close()  # ffmpeg가 종료되면 yt-dlp가 SIGPIPE를 받도록
+        audio, err = ffmpeg.communicate()
+    finally:
+        if ytdlp.poll() is None:
+            ytdlp.kill()
+        ytdlp.wait()
+
+    if ffmpeg.returncode != 0 or not audio:
+        raise subprocess.CalledProcessError(ffmpeg.returncode or 1, ffmpeg_cmd, stderr=err)
+    return audio
+
+def fetch_audio_clip(video_url, clip_range=CLIP_RANGE) -> bytes:
+    """구간 오디오를 bytes로 반환. 스트리밍이 불가능하면 작업별 임시 디렉터리에 받아서 읽음"""
+    if AUDIO_DOWNLOADER == "inprocess" and audio_downloader.available():
+        try:
+            return audio_downloader.get_downloader().fetch(video_url, clip_range)
+        except Exception as e:
+            print(f"⚠️ in-process 다운로드 실패, yt-dlp로 재시도: {e}")
+
+    if AUDIO_STREAMING and shutil.which("ffmpeg"):
+        try:
+            return stream_audio_clip(video_url, clip_range)
+        except (subprocess.CalledProcessError, OSError) as e:
+            print(f"⚠️ 스트리밍 다운로드 실패, 파일 다운로드로 재시도: {e}")
+
+    with tempfile.TemporaryDirectory(prefix="ytaudio_") as scratch:
+        path = os.path.join(scratch, "audio.mp3")
+        download_3min_audio(video_url, output_filename=path, clip_range=clip_range)
+        if not os.path.exists(path):
+            raise FileNotFoundError("❗ 오디오 파일이 생성되지 않았습니다.")
+        with open(path, "rb") as f:
+            return f.read()
+
+def transcribe_audio(audio) -> str:
+    """audio: 파일 경로 또는 mp3 bytes (bytes면 디스크를 거치지 않고 바로 업로드)"""
+    if isinstance(audio, (bytes, bytearray)):
+        return _whisper(("audio.mp3", bytes(audio)))
+    with open(audio, "rb") as audio_file:
+        return _whisper(audio_file)
+
+def _whisper(audio_file) -> str:
+    with rate_limit.slot("openai"):
+        transcript = clients.get_openai_client().audio.transcriptions.create(
             model="whisper-1",
             file=audio_file,
             language="ko"  # 한국어 인식
         )
     return transcript.text
 
-def summarize_text_korean(text: str, max_tokens: int = 400) -> str:
-    import re
-
+def build_summary_request(text: str, max_tokens: int = 400) -> dict:
+    """요약용 chat.completions.create 인자 (단건 호출과 배치 제출이 같은 요청을 사용)"""
     def clean(text):
         text = re.sub(r"\[.*?\]", "", text)  # [문구] 제거
         text = re.sub(r"\s+", " ", text)
@@ -118,18 +224,44 @@ def summarize_text_korean(text: str, max_tokens: int = 400) -> str:
     prompt = f"""
 다음은 유튜브 영상의 자막입니다. 핵심 내용을 한국어로 400자 이내로 요약해 주세요.\n{short_text}
 """
-
-    response = client.chat.completions.create(
-        model="gpt-4o",  # 또는 gpt-3.5-turbo
-        messages=[
+    return {
+        "model": "gpt-4o",  # 또는 gpt-3.5-turbo
+        "messages": [
             {"role": "user", "content": prompt}
         ],
-        temperature=0.5,
-        max_tokens=max_tokens
-    )
-    return response.choices[0].message.content.strip()
+        "temperature": 0.5,
+        "max_tokens": max_tokens,
+    }
 
-def post_to_supabase(title, content, board_type, source, author):
+def summarize_text_korean(text: str, max_tokens: int = 400) -> str:
+    return llm_cache.cached_chat_completion(clients.get_openai_client(), **build_summary_request(text, max_tokens)).strip()
+
+def summarize_batch(transcripts: dict, backend=None) -> dict:
+    """{key: 자막} → {key: BatchResult}. OpenAI Batch API로 제출하고 실패한 항목만 일반 호출로 재시도
+    캐시에 있는 요약은 제출하지 않고, 새로 받은 요약은 캐시에 저장
+    backend: 테스트용 대역(batch_summarizer.LocalBackend 등). 대역의 결과는 캐시에 저장하지 않음"""
+    requests = {key: build_summary_request(text) for key, text in transcripts.items()}
+    results = {}
+    for key, req in list(requests.items()):
+        cached = llm_cache.lookup(req)
+        if cached is not None:
+            results[key] = BatchResult(text=cached.strip())
+            del requests[key]
+
+    with metrics.span("summarize_batch"):
+        if backend is not None:
+            fresh = run_batch(requests, backend)
+        else:
+            client = clients.get_openai_client()
+            fresh = run_batch(requests, OpenAIBatchBackend(client), fallback=ChatBackend(client, max_workers=PIPELINE_WORKERS))
+    for key, r in fresh.items():
+        if r.ok and backend is None:
+            llm_cache.store(requests[key], r.text)
+    results.update(fresh)
+    return results
+
+def post_to_supabase(title, content, board_type, source, author, key=None):
+    """게시글을 outbox에 넣고 idempotency key 반환. 실제 전송은 flush_posts()에서 한 번에"""
     data = {
         "title": title,
         "content": content,
@@ -137,53 +269,32 @@ def post_to_supabase(title, content, board_type, source, author):
         "source": source,
         "author": author,
     }
-
-    try:
-        response = supabase.table("posts").insert(data).execute()
-        print("✅ 게시글 업로드 성공!")
-        return response
-    except Exception as e:
-        print("❌ 업로드 실패:", e)
-        return None
-
-# Run test
-if __name__ == "__main__":
-    selected_topics = get_random_topic()
-    if not selected_topics:
-        print("❗ No topics found.")    
-    else:
-        print(f"🔍 {len(selected_topics)} topics selected for processing.")
-
-    audio_filename = "audio.mp3"
-
-    for topic in selected_topics:
-        SEARCH_QUERY = [topic["keyword"]]
-        print(f"\n🔍 [{topic['board_type']}] '{topic['keyword']}' 유튜브 검색 중...")
-
-        videos = search_youtube(SEARCH_QUERY)
-        if not videos:
-            print("❗ No videos found.")
-            continue
-
-        video = videos[0]  # 첫 번째 영상만 선택
-        print(f"🎥 Top video: {video['title']}")
-
-        try:
-            
-            download_3min_audio(video["url"], output_filename=audio_filename)
-
-            if not os.path.exists(audio_filename):
-                raise FileNotFoundError("❗ audio.mp3 파일이 생성되지 않았습니다.")
-
-            result = transcribe_audio(audio_filename)
-            summary = summarize_text_korean(result)
-
-            print("🎧 오디오 다운로드 완료")
-            related_videos = "\n".join(
-                [f"🔸 {v['title']} 👉 {v['url']}" for v in videos]
-            )
-            title = f"🎥 {video['title']}"
-            content = f"""🎥 영상 제목: {video['title']}
+    return supabase_outbox.get_outbox().enqueue(data, key=key)
+
+def post_key(topic, video):
+    # 같은 게시판에 같은 영상은 한 번만 게시
+    return f"youtube:{topic['board_type']}:{video['video_id']}"
+
+def flush_posts(results, run=None):
+    """outbox에 쌓인 게시글(이전 실행에서 못 보낸 것 포함)을 한 번에 전송하고 주제별 상태 갱신"""
+    run = run or run_journal.NULL_RUN
+    with metrics.span("post"):
+        sent = supabase_outbox.get_outbox().flush(clients.get_supabase())
+    index = dedup_index.get_index()
+    for r in results:
+        if r["status"] == "queued":
+            r["status"] = "posted" if sent.get(r["post_key"]) else "post_failed"
+            run.record(r["topic"], "post", {"post_key": r["post_key"], "status": r["status"]})
+            if r["status"] == "posted":
+                index.add_post("", r["video"]["url"])
+    index.save()
+    return results
+
+def build_post_content(video, videos, summary, transcript):
+    related_videos = "\n".join(
+        [f"🔸 {v['title']} 👉 {v['url']}" for v in videos]
+    )
+    return f"""🎥 영상 제목: {video['title']}
 
 📅 업로드 날짜: {video['published_at']}
 📺 채널: {video['channel']}
@@ -193,23 +304,371 @@ if __name__ == "__main__":
 {summary}
 
 🎧 자막 내용:
-{result}
+{transcript}
 
 📺 관련 영상 목록:
 {related_videos}
 """
-            print("📤 게시글 업로드 중...")
-            post_to_supabase(
-                title=title,
-                content=content,
-                board_type=topic["board_type"],
-                source="youtube",
-                author="🤖AI Bot",
-            )
+
+def download_clip(video, clip_range):
+    """영상의 구간 오디오(bytes). AudioPrefetcher가 미리 받을 때도 이 함수를 씀"""
+    with STAGE_LIMITS["download"], metrics.span("download"):
+        audio = fetch_audio_clip(video["url"], clip_range)
+    metrics.count("audio.bytes_downloaded", len(audio))
+    return audio
+
+def transcribe_range(video, clip_range, prefetch=None):
+    """한 구간의 전사문. 캐시(video_id+구간 → 오디오 해시) 확인 후 필요할 때만 다운로드/STT
+    prefetch: AudioPrefetcher. 미리 받아 둔 오디오가 있으면 다운로드를 생략"""
+    transcripts = transcript_cache.get_transcript_cache()
+    transcript = transcripts.lookup(video["video_id"], clip_range)
+    if transcript is not None:
+        return transcript
+
+    audio = prefetch.take(video, clip_range) if prefetch else None
+    if audio is None:
+        audio = download_clip(video, clip_range)
+
+    transcript = transcripts.lookup_audio(audio)
+    if transcript is None:
+        with STAGE_LIMITS["transcribe"], metrics.span("transcribe"):
+            transcript = transcribe_audio(audio)
+        metrics.count("openai.whisper_seconds", clip_range[1] - clip_range[0])
+    transcripts.store(video["video_id"], clip_range, transcript, audio=audio)
+    return transcript
+
+def transcribe_video(video, clip_range=CLIP_RANGE, prefetch=None):
+    """clip_range 구간 전사. CHUNK_SECONDS보다 길면 겹치는 조각으로 나눠 병렬 전사 후 이어붙임"""
+    transcripts = transcript_cache.get_transcript_cache()
+    transcript = transcripts.lookup(video["video_id"], clip_range)
+    if transcript is not None:
+        print(f"♻️ 캐시된 자막 사용 (다운로드/STT 생략): {video['title']}")
+        return transcript
+
+    ranges = chunk_ranges(clip_range, CHUNK_SECONDS, CHUNK_OVERLAP_SECONDS)
+    if len(ranges) == 1:
+        return transcribe_range(video, clip_range, prefetch)
+
+    print(f"✂️ {len(ranges)}개 조각으로 나눠 전사: {video['title']}")
+    with ThreadPoolExecutor(max_workers=max(1, min(CHUNK_WORKERS, len(ranges)))) as executor:
+        parts = list(executor.map(lambda r: transcribe_range(video, r, prefetch), ranges))
+    transcript = stitch_transcripts(parts)
+    transcripts.store(video["video_id"], clip_range, transcript)
+    return transcript
+
+def choose_video(topic, videos, run):
+    """이미 게시한 적 없는 가장 점수 높은 영상 (모두 게시했으면 첫 번째). 저널에 선택이 있으면 그대로"""
+    video = run.get(topic, "video")
+    if video is None:
+        index = dedup_index.get_index()
+        video = next((v for v in videos if not index.seen_video(v["video_id"])), videos[0])
+    return video
+
+def clamp_clip(video, clip_range):
+    """영상 길이를 넘는 조각은 만들지 않도록 구간을 영상 길이로 제한"""
+    start, end = clip_range
+    return start, min(end, max(start + 1, int(video["duration"] * 60)))
+
+def prepare_topic(topic, videos=None, clip_range=CLIP_RANGE, run=None, prefetch=None):
+    """검색 → 오디오 → STT 까지 수행. 결과 dict에 video/videos/transcript를 채움
+    run: 실행 저널. 이미 끝난 단계는 저널의 결과를 쓰고, 새로 끝낸 단계는 바로 기록
+    prefetch: 미리 받아 둔 오디오 큐 (끝나면 이 영상의 남은 항목을 버려 자리를 비움)"""
+    run = run or run_journal.NULL_RUN
+    result = {"topic": topic, "status": "failed", "video": None, "error": None}
+    label = f"[{topic['board_type']}]"
+    posted = run.get(topic, "post")
+    if posted and posted["status"] in run_journal.DONE_STATUSES:
+        print(f"⏭️ {label} 이전 실행에서 완료된 주제입니다.")
+        result["status"] = posted["status"]
+        return result
+    try:
+        if videos is None:
+            videos = run.get(topic, "search")
+        if videos is None:
+            print(f"\n🔍 {label} '{topic['keyword']}' 유튜브 검색 중...")
+            with STAGE_LIMITS["search"], metrics.span("search"):
+                videos = search_youtube(topic["keyword"])
+            run.record(topic, "search", videos)
+        if not videos:
+            print(f"❗ {label} No videos found.")
+            result["status"] = "no_videos"
+            return result
+
+        video = choose_video(topic, videos, run)
+        run.record(topic, "video", video)
+        result["video"] = video
+        result["videos"] = videos
+        print(f"🎥 {label} Top video: {video['title']}")
+
+        transcript = run.get(topic, "transcript")
+        if transcript is None:
+            transcript = transcribe_video(video, clamp_clip(video, clip_range), prefetch)
+            run.record(topic, "transcript", transcript)
+        result["transcript"] = transcript
+        result["status"] = "transcribed"
+        print(f"🎧 {label} 전사 완료 ({len(result['transcript'])}자)")
+    except Exception as e:
+        print(f"❌ {label} 오류 발생: {e}")
+        result["error"] = str(e)
+    finally:
+        if prefetch and result["video"]:
+            prefetch.discard(result["video"])
+    return result
+
+def publish_topic(result, summary=None, run=None):
+    """요약(없으면 여기서 생성) 후 게시글 업로드. result의 status를 갱신해 반환"""
+    run = run or run_journal.NULL_RUN
+    topic, video = result["topic"], result["video"]
+    label = f"[{topic['board_type']}]"
+    key = post_key(topic, video)
+    if supabase_outbox.get_outbox().status(key) == "sent":
+        print(f"⏭️ {label} 이미 게시한 영상입니다: {video['title']}")
+        result["status"] = "already_posted"
+        return result
+    try:
+        if summary is None:
+            summary = run.get(topic, "summary")
+        if summary is None:
+            with STAGE_LIMITS["summarize"], metrics.span("summarize"):
+                summary = summarize_text_korean(result["transcript"])
+        run.record(topic, "summary", summary)
+
+        title = f"🎥 {video['title']}"
+        content = build_post_content(video, result["videos"], summary, result["transcript"])
+        result["post_key"] = post_to_supabase(
+            title=title,
+            content=content,
+            board_type=topic["board_type"],
+            source="youtube",
+            author="🤖AI Bot",
+            key=key,
+        )
+        result["status"] = "queued"
+        run.record(topic, "post", {"post_key": key, "status": "queued"})
+        print(f"📥 {label} 게시글 업로드 대기열에 추가")
+    except Exception as e:
+        print(f"❌ {label} 오류 발생: {e}")
+        result["status"] = "failed"
+        result["error"] = str(e)
+    return result
+
+def process_topic(topic, videos=None, clip_range=CLIP_RANGE, run=None, prefetch=None):
+    """한 주제에 대해 검색 → 오디오 → STT → 요약 → 업로드를 수행하고 결과 dict를 반환
+    videos: 미리 검색/배치 조회해 둔 후보 영상 목록 (None이면 여기서 검색)"""
+    result = prepare_topic(topic, videos, clip_range, run, prefetch)
+    if result["status"] != "transcribed":
+        return result
+    return publish_topic(result, run=run)
+
+def plan_topics(topics):
+    """남은 YouTube 쿼터로 처리할 수 있는 주제만 남김.
+    검색 응답이 캐시에 있는 주제는 쿼터가 들지 않으므로 항상 포함하고, 나머지는 선택 순서대로
+    후보 영상 상세 조회 비용을 먼저 뗀 예산이 허락하는 만큼만 검색"""
+    ledger = quota_ledger.get_ledger()
+    cached = [response_cache.is_cached(*search_request(topic["keyword"])) for topic in topics]
+    uncached = cached.count(False)
+    details_calls = -(-len(topics) * MAX_RESULTS // MAX_IDS_PER_CALL)
+    allowed = ledger.plan(quota_ledger.call_cost("youtube.search"), uncached,
+                          fixed=details_calls * quota_ledger.call_cost("youtube.videos"))
+    if allowed < uncached:
+        print(f"⚠️ 남은 YouTube 쿼터 {ledger.remaining():,} unit: 새 검색 {uncached}건 중 {allowed}건만 수행 "
+              f"(캐시된 검색 {len(topics) - uncached}건은 그대로 사용)")
+    planned = []
+    for topic, hit in zip(topics, cached):
+        if hit or allowed > 0:
+            planned.append(topic)
+            allowed -= 0 if hit else 1
+    return planned
+
+def search_candidates(topics, workers=PIPELINE_WORKERS, run=None):
+    """모든 주제를 먼저 검색한 뒤 후보 영상 상세를 50개 단위로 한 번에 조회.
+    주제별 후보 영상 목록을 반환하며, 검색/조회에 실패한 주제는 None (process_topic에서 재시도)
+    저널에 검색 결과가 있는 주제는 다시 검색하지 않음"""
+    run = run or run_journal.NULL_RUN
+    def search(topic):
+        print(f"\n🔍 [{topic['board_type']}] '{topic['keyword']}' 유튜브 검색 중...")
+        try:
+            with STAGE_LIMITS["search"], metrics.span("search"):
+                return search_video_ids(topic["keyword"])
         except Exception as e:
-            print(f"❌ 오류 발생: {e}")
-        finally:
-            # 🎧 mp3 파일 정리
-            if os.path.exists(audio_filename):
-                os.remove(audio_filename)
-                print("🧹 audio.mp3 삭제 완료")
+            print(f"❌ [{topic['board_type']}] 검색 실패: {e}")
+            return None
+
+    candidates = [run.get(topic, "search") for topic in topics]
+    pending = [i for i, videos in enumerate(candidates) if videos is None]
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        ids_per_topic = dict(zip(pending, executor.map(search, [topics[i] for i in pending])))
+
+    batcher = VideoLookupBatcher()
+    for i, ids in ids_per_topic.items():
+        if ids:
+            batcher.add(i, ids)
+    try:
+        with metrics.span("video_details"):
+            batcher.resolve()
+    except Exception as e:
+        print(f"❌ 영상 상세 일괄 조회 실패: {e}")
+        return candidates
+
+    for i, ids in ids_per_topic.items():
+        if ids is not None:
+            candidates[i] = video_ranker.rank_videos(
+                filter_by_duration(ids, MAX_VIDEO_MINUTES, details=batcher.details_for(i)))
+            run.record(topics[i], "search", candidates[i])
+    return candidates
+
+def plan_downloads(topics, candidates, clip_range=CLIP_RANGE, run=None):
+    """처리 순서대로 받아야 할 (영상, 구간) 목록. 끝난 주제와 전사문이 캐시/저널에 있는 구간은 제외"""
+    run = run or run_journal.NULL_RUN
+    transcripts = transcript_cache.get_transcript_cache()
+    items = []
+    for topic, videos in zip(topics, candidates):
+        posted = run.get(topic, "post")
+        if not videos or (posted and posted["status"] in run_journal.DONE_STATUSES):
+            continue
+        if run.get(topic, "transcript") is not None:
+            continue
+        video = choose_video(topic, videos, run)
+        video_range = clamp_clip(video, clip_range)
+        if transcripts.lookup(video["video_id"], video_range) is not None:
+            continue
+        for r in chunk_ranges(video_range, CHUNK_SECONDS, CHUNK_OVERLAP_SECONDS):
+            if transcripts.lookup(video["video_id"], r) is None:
+                items.append((video, r))
+    return items
+
+def _run_isolated(fn, jobs, workers):
+    """jobs의 각 인자 튜플로 fn을 실행. 한 작업의 예외가 다른 작업에 영향을 주지 않음"""
+    if workers <= 1:
+        return [fn(*job) for job in jobs]
+
+    results = [None] * len(jobs)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(fn, *job): i for i, job in enumerate(jobs)}
+        for future in as_completed(futures):
+            i = futures[future]
+            try:
+                results[i] = future.result()
+            except Exception as e:  # fn은 예외를 삼키지만 방어적으로 처리
+                results[i] = {"topic": jobs[i][0], "status": "failed", "video": None, "error": str(e)}
+    return results
+
+def run_pipeline(topics, workers=PIPELINE_WORKERS, clip_range=CLIP_RANGE, summary_mode=SUMMARY_MODE, run=None):
+    """주제별 파이프라인을 병렬로 실행. 한 주제의 실패는 다른 주제에 영향을 주지 않음
+    run: 실행 저널 (재개 시 주제마다 처음 끝나지 않은 단계부터 수행)"""
+    if summary_mode not in SUMMARY_MODES:
+        raise ValueError(f"알 수 없는 요약 방식: {summary_mode!r} ({', '.join(SUMMARY_MODES)})")
+    candidates = search_candidates(topics, workers, run)
+    # 앞 주제를 전사/요약하는 동안 다음 주제들의 오디오를 PREFETCH_DEPTH개까지 미리 받음
+    prefetch = audio_downloader.AudioPrefetcher(download_clip)
+    prefetch.start(plan_downloads(topics, candidates, clip_range, run))
+    jobs = [(topic, videos, clip_range, run, prefetch) for topic, videos in zip(topics, candidates)]
+    try:
+        if summary_mode == "sync":
+            results = _run_isolated(process_topic, jobs, workers)
+        else:
+            # 배치 요약: 전사까지 끝낸 뒤 요약을 한 번에 제출하고, 결과를 주제별로 나눠 업로드
+            results = _run_isolated(prepare_topic, jobs, workers)
+    finally:
+        prefetch.close()
+    if prefetch.hits:
+        print(f"⏩ 미리 받은 오디오 사용: {prefetch.hits}개 구간")
+    if summary_mode == "sync":
+        print("📤 게시글 업로드 중...")
+        return flush_posts(results, run)
+
+    ready = {i: r for i, r in enumerate(results) if r["status"] == "transcribed"}
+    journaled = {i: (run or run_journal.NULL_RUN).get(r["topic"], "summary") for i, r in ready.items()}
+    summaries = summarize_batch(
+        {str(i): r["transcript"] for i, r in ready.items() if journaled[i] is None})
+    summaries.update({str(i): BatchResult(text=text) for i, text in journaled.items() if text is not None})
+
+    publish_jobs = []
+    for i, r in ready.items():
+        summary = summaries.get(str(i))
+        if summary is None or not summary.ok:
+            r["status"] = "summary_failed"
+            r["error"] = f"요약 실패: {summary.error if summary else 'no result'}"
+            print(f"❌ [{r['topic']['board_type']}] {r['error']}")
+            continue
+        publish_jobs.append((r, summary.text, run))
+    _run_isolated(publish_topic, publish_jobs, workers)
+    print("📤 게시글 업로드 중...")
+    return flush_posts(results, run)
+
+def print_run_summary(results):
+    posted = sum(1 for r in results if r["status"] == "posted")
+    print(f"\n📊 완료: {posted}/{len(results)} 주제 업로드 성공")
+    for r in results:
+        topic = r["topic"]
+        detail = f" ({r['error']})" if r["error"] else ""
+        print(f"  - [{topic['board_type']}] {topic['keyword']}: {r['status']}{detail}")
+
+# Run test
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="YouTube 요약 자동 업로드")
+    parser.add_argument("--workers", type=int, default=PIPELINE_WORKERS,
+                        help="동시에 처리할 주제 수 (1이면 순차 실행)")
+    parser.add_argument("--sequential", action="store_true", help="주제를 하나씩 순차 처리")
+    parser.add_argument("--clip-seconds", type=int, default=CLIP_SECONDS,
+                        help="영상 앞부분부터 전사할 길이(초). CHUNK_SECONDS보다 길면 나눠서 병렬 전사")
+    parser.add_argument("--summary-mode", choices=SUMMARY_MODES, default=SUMMARY_MODE,
+                        help="sync: 주제별 즉시 요약, batch: 실행 단위로 모아 Batch API 제출")
+    parser.add_argument("--no-cache", action="store_true", help="YouTube 응답 캐시를 무시하고 새로 요청")
+    parser.add_argument("--resume", nargs="?", const="latest", metavar="RUN_ID",
+                        help="끝나지 않은 실행(기본: 가장 최근)을 같은 주제로 이어서, 끝난 단계는 건너뜀")
+    args = parser.parse_args(argv)
+    if args.summary_mode not in SUMMARY_MODES:  # SUMMARY_MODE 환경변수 오타 등 (기본값은 choices 검사를 거치지 않음)
+        parser.error(f"알 수 없는 요약 방식: {args.summary_mode!r} ({', '.join(SUMMARY_MODES)})")
+    if args.no_cache:
+        response_cache.YT_CACHE_BYPASS = True
+
+    journal = run_journal.get_journal()
+    run = None
+    if args.resume:
+        run = journal.resume(None if args.resume == "latest" else args.resume)
+        if run is None:
+            print("❗ 재개할 실행이 없습니다. 새로 시작합니다.")
+        else:
+            print(f"⏯️ 실행 {run.run_id} 재개 ({len(run.topics)}개 주제)")
+
+    if run is None:
+        selected_topics = get_random_topics()
+        if not selected_topics:
+            print("❗ No topics found.")
+            return 0
+        selected_topics = plan_topics(selected_topics)
+        if not selected_topics:
+            print("❗ YouTube 쿼터가 부족하고 캐시된 검색 결과도 없어 이번 실행을 건너뜁니다.")
+            return 0
+        run = journal.start(selected_topics)
+        print(f"🔍 {len(selected_topics)} topics selected for processing. (실행 {run.run_id})")
+    selected_topics = run.topics
+
+    try:
+        with metrics.span("dedup_sync"):
+            synced = dedup_index.get_index().sync(clients.get_supabase())
+        print(f"🔄 중복 인덱스 동기화: 새 게시글 {synced}개")
+    except Exception as e:
+        print(f"⚠️ 중복 인덱스 동기화 실패 (로컬 인덱스로 진행): {e}")
+
+    results = run_pipeline(
+        selected_topics,
+        workers=1 if args.sequential else args.workers,
+        clip_range=(0, args.clip_seconds),
+        summary_mode=args.summary_mode,
+        run=run,
+    )
+    if not run.finish(results):
+        print(f"⏯️ 끝나지 않은 주제가 있습니다. 'python youtube_search.py --resume {run.run_id}' 로 이어서 실행")
+    print_run_summary(results)
+    http_client.print_stats()
+    response_cache.print_stats()
+    transcript_cache.print_stats()
+    llm_cache.print_stats()
+    metrics.finish("youtube_search")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())